@@ -0,0 +1,67 @@
+"""
+Compare the size and the speed of pycommons.collections.codec with pickle.
+
+    python -m benchmarks.codec
+"""
+import pickle
+import timeit
+
+from pycommons.collections import codec
+from pycommons.collections.maps import MultiValuedMap, OrderedMap
+
+
+def _records(count):
+    return [
+        {"id": i, "name": f"user-{i % 100}", "tags": ["active", "admin"], "score": i / 7}
+        for i in range(count)
+    ]
+
+
+def _ordered(count):
+    _map = OrderedMap()
+    _map.update((f"key-{i}", i) for i in range(count))
+    return _map
+
+
+def _multi_valued(count):
+    _map = MultiValuedMap()
+    for i in range(count):
+        _map[f"key-{i % 500}"] = i
+    return _map
+
+
+CASES = {
+    "records": _records(10_000),
+    "ordered map": _ordered(10_000),
+    "multi valued map": _multi_valued(10_000),
+    "blobs": {i: bytes(1024) for i in range(1_000)},
+}
+
+
+def _measure(function, number=5):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1000
+
+
+def _compare(name, value, dump, load):
+    data = dump(value)
+    print(
+        f"{name:<8}{len(data):>10}"
+        f"{_measure(lambda: dump(value)):>10.2f}{_measure(lambda: load(data)):>10.2f}"
+    )
+
+
+def main():
+    print(f"{'format':<8}{'bytes':>10}{'dump ms':>10}{'load ms':>10}")
+    for name, value in CASES.items():
+        print(name)
+        _compare("codec", value, codec.encode, codec.decode)
+        _compare(
+            "pickle",
+            value,
+            lambda v: pickle.dumps(v, pickle.HIGHEST_PROTOCOL),
+            pickle.loads,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Import time of the packages, measured with `python -X importtime` in a new interpreter for every
+run, so that nothing is imported already. The results are written as JSON, and can be checked
+against a limit or against the results of a previous run to fail on regressions:
+
+    python -m benchmarks.import_time --output results.json
+    python -m benchmarks.import_time --max-ms 50
+    python -m benchmarks.import_time --baseline results.json --max-regression 0.5
+
+Every result is the best of `--repeat` runs: `milliseconds` is the cumulative import time of the
+modules imported by the statement, leaving out the modules imported by the interpreter on
+startup, and `modules` lists these modules. A case also regresses when it imports a
+module it did not import in the baseline.
+"""
+import argparse
+import datetime
+import json
+import platform
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+CASES: Dict[str, str] = {
+    "package": "import pycommons.collections",
+    "version": "from pycommons.collections import __version__",
+    "maps": "import pycommons.collections.maps",
+    "sets": "import pycommons.collections.sets",
+    "ordered_set": "from pycommons.collections.sets import OrderedSet",
+    "sorted_set": "from pycommons.collections.sets import SortedSet",
+    "ordered_map": "from pycommons.collections.maps import OrderedMap",
+    "lazy_map": "from pycommons.collections.maps import LazyMap",
+    "codec": "from pycommons.collections import codec",
+    "instrumentation": "from pycommons.collections import instrumentation",
+}
+
+# import time:      self [us] |  cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse(output: str) -> List[Tuple[str, int, int]]:
+    """
+    Returns:
+        The name, the nesting level and the cumulative time in microseconds of every import in
+        the output of `-X importtime`
+    """
+    imports = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            _, cumulative, indent, name = match.groups()
+            imports.append((name, (len(indent) - 1) // 2, int(cumulative)))
+    return imports
+
+
+def measure(statement: str) -> List[Tuple[str, int, int]]:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return parse(process.stderr)
+
+
+def run(statement: str, startup: Sequence[str], repeat: int) -> Dict[str, Any]:
+    results = []
+    for _ in range(repeat):
+        imports = [entry for entry in measure(statement) if entry[0] not in startup]
+        results.append(
+            {
+                "milliseconds": sum(time for _, level, time in imports if not level) / 1e3,
+                "modules": sorted(name for name, _, _ in imports),
+            }
+        )
+    return min(results, key=lambda result: result["milliseconds"])
+
+
+def regressions(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    max_regression: float,
+) -> List[str]:
+    """
+    Compare the results with a previous run. A case regresses when it takes longer by more than
+    `max_regression`, or when it imports modules it did not import before.
+    """
+    failures = []
+    for case, result in results.items():
+        before = baseline.get(case)
+        if before is None:
+            continue
+        if result["milliseconds"] > before["milliseconds"] * (1 + max_regression):
+            failures.append(
+                f"{case}: {before['milliseconds']:.2f}ms -> {result['milliseconds']:.2f}ms"
+            )
+        added = sorted(set(result["modules"]) - set(before["modules"]))
+        if added:
+            failures.append(f"{case}: imports {', '.join(added)}")
+    return failures
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--filter", help="Only run the cases whose name contains this text")
+    parser.add_argument("--output", help="File to write the JSON results to, stdout if not set")
+    parser.add_argument("--max-ms", type=float, help="Maximum import time of every case")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    startup = {name for name, _, _ in measure("pass")}
+    results = {
+        case: run(statement, startup, args.repeat)
+        for case, statement in CASES.items()
+        if not args.filter or args.filter in case
+    }
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    failures = []
+    if args.max_ms is not None:
+        failures.extend(
+            f"{case}: {result['milliseconds']:.2f}ms > {args.max_ms:.2f}ms"
+            for case, result in results.items()
+            if result["milliseconds"] > args.max_ms
+        )
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            failures.extend(regressions(results, json.load(file)["results"], args.max_regression))
+    for failure in failures:
+        print(f"Regression: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
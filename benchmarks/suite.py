@@ -0,0 +1,448 @@
+"""
+Throughput and memory benchmarks of the maps, the sets and the predicates, compared with
+the builtin dict and set. The results are written as JSON, and can be checked against the
+results of a previous run to fail on regressions:
+
+    python -m benchmarks.suite --sizes 10,1000,100000 --output results.json
+    python -m benchmarks.suite --baseline results.json --max-regression 0.25
+
+Every result is the best of `--repeat` runs, in operations per second (entries per second for
+contains_value, which scans the map), and memory is the size traced by tracemalloc while the
+collection is built, per entry. `relative` is the throughput divided by the throughput of the
+builtin collection for the same operation and size, which is what `--baseline` compares, so
+results taken on different machines can be compared.
+"""
+import argparse
+import dataclasses
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pycommons.base.function import BiPredicate, Function, Predicate
+
+from pycommons.collections.functions.predicate import (
+    AdaptiveAllPredicate,
+    AdaptiveAnyPredicate,
+    AllPredicate,
+    AndPredicate,
+    AnyPredicate,
+    EqualsPredicate,
+    ExactCountPredicate,
+    ExactOnePredicate,
+    IdentityPredicate,
+    InPredicate,
+    NeitherPredicate,
+    NotEqualsPredicate,
+    NotInPredicate,
+    NotPredicate,
+    OrPredicate,
+)
+from pycommons.collections.maps import (
+    AsyncLazyMap,
+    ColumnarMultiValuedMap,
+    CompactMultiValuedMap,
+    ConcurrentLazyMap,
+    ConcurrentMap,
+    DefaultedMap,
+    FIFOMap,
+    FixedSizeMap,
+    FrozenMap,
+    IndexedMap,
+    IterableMap,
+    LazyMap,
+    LazyOrderedMap,
+    LFUMap,
+    LRUMap,
+    MemoryMappedMap,
+    MultiValuedMap,
+    OrderedMap,
+    PersistentMap,
+    SingletonMap,
+    SortedMap,
+    TTLMap,
+    UnmodifiableMap,
+)
+from pycommons.collections.maps.predicated import (
+    CompositePredicatedMap,
+    PredicatedMap,
+    PredicatedOrderedMap,
+)
+from pycommons.collections.sets import OrderedSet, ScalableBloomFilter, SortedSet
+
+BUILTIN = "builtin"
+
+_IDENTITY = Function.of(lambda key: key)
+_IS_INT = Predicate.of(lambda value: isinstance(value, int))
+_IS_EVEN = Predicate.of(lambda value: value % 2 == 0)
+_IS_POSITIVE = Predicate.of(lambda value: value > 0)
+_IS_SMALL = Predicate.of(lambda value: value < 1000)
+
+
+@dataclasses.dataclass
+class MapCase:
+    """
+    A map to benchmark. Mutable maps are created empty with `create` and filled by setting the
+    keys, unmodifiable ones are built from all the entries at once with `build`.
+    """
+
+    name: str
+    create: Optional[Callable[[int], Any]] = None
+    build: Optional[Callable[[List[Tuple[Any, Any]]], Any]] = None
+    bytes_keys: bool = False
+    max_size: Optional[int] = None
+
+
+def _unmodifiable(items: List[Tuple[Any, Any]]) -> UnmodifiableMap[Any, Any]:
+    return UnmodifiableMap(items)
+
+
+# Removed when the interpreter exits
+_DIRECTORY = tempfile.TemporaryDirectory(prefix="pycommons-benchmarks-")  # pylint: disable=R1732
+
+
+def _memory_mapped(items: List[Tuple[Any, Any]]) -> MemoryMappedMap:
+    return MemoryMappedMap.build(os.path.join(_DIRECTORY.name, "benchmark.map"), items)
+
+
+async def _load(key: Any) -> Any:  # pragma: no cover
+    return key
+
+
+def _ordered(_: int) -> OrderedMap[Any, Any]:
+    return OrderedMap()
+
+
+MAP_CASES = [
+    MapCase(BUILTIN, create=lambda _: {}),
+    MapCase("IterableMap", create=lambda _: IterableMap()),
+    MapCase("OrderedMap", create=_ordered),
+    MapCase("IndexedMap", create=lambda _: IndexedMap()),
+    MapCase("DefaultedMap", create=lambda _: DefaultedMap(0)),
+    MapCase("LazyMap", create=lambda _: LazyMap(_IDENTITY)),
+    MapCase("LazyOrderedMap", create=lambda _: LazyOrderedMap(_IDENTITY)),
+    MapCase("ConcurrentLazyMap", create=lambda _: ConcurrentLazyMap(_IDENTITY)),
+    MapCase("AsyncLazyMap", create=lambda _: AsyncLazyMap(_load)),
+    MapCase("ConcurrentMap", create=lambda _: ConcurrentMap()),
+    MapCase("FIFOMap", create=FIFOMap),
+    MapCase("LRUMap", create=LRUMap),
+    MapCase("LFUMap", create=LFUMap),
+    MapCase("TTLMap", create=lambda size: TTLMap(size, 3600)),
+    MapCase("FixedSizeMap", create=FixedSizeMap),
+    MapCase("SingletonMap", create=lambda _: SingletonMap(), max_size=1),
+    MapCase("PredicatedMap", create=lambda _: PredicatedMap(_IS_INT, _IS_INT)),
+    MapCase("PredicatedOrderedMap", create=lambda _: PredicatedOrderedMap(_IS_INT, _IS_INT)),
+    MapCase(
+        "CompositePredicatedMap",
+        create=lambda _: CompositePredicatedMap(BiPredicate.of(lambda key, value: key == value)),
+    ),
+    MapCase("SortedMap", create=lambda _: SortedMap()),
+    MapCase("MultiValuedMap", create=lambda _: MultiValuedMap()),
+    MapCase("CompactMultiValuedMap", create=lambda _: CompactMultiValuedMap()),
+    MapCase("ColumnarMultiValuedMap", build=ColumnarMultiValuedMap),
+    MapCase("FrozenMap", build=FrozenMap),
+    MapCase("PersistentMap", build=PersistentMap),
+    MapCase("UnmodifiableMap", build=_unmodifiable),
+    MapCase("MemoryMappedMap", build=_memory_mapped, bytes_keys=True),
+]
+
+PREDICATE_CASES: Dict[str, Any] = {
+    BUILTIN: Predicate.of(lambda value: value % 2 == 0 and value > 0),
+    "EqualsPredicate": EqualsPredicate(7),
+    "NotEqualsPredicate": NotEqualsPredicate(7),
+    "IdentityPredicate": IdentityPredicate(7),
+    "InPredicate": InPredicate(range(0, 1000, 3)),
+    "NotInPredicate": NotInPredicate(range(0, 1000, 3)),
+    "NotPredicate": NotPredicate(_IS_EVEN),
+    "AndPredicate": AndPredicate(_IS_EVEN, _IS_POSITIVE),
+    "OrPredicate": OrPredicate(_IS_EVEN, _IS_POSITIVE),
+    "AllPredicate": AllPredicate([_IS_SMALL, _IS_POSITIVE, _IS_EVEN]),
+    "AnyPredicate": AnyPredicate([_IS_SMALL, _IS_POSITIVE, _IS_EVEN]),
+    "AdaptiveAllPredicate": AdaptiveAllPredicate([_IS_SMALL, _IS_POSITIVE, _IS_EVEN]),
+    "AdaptiveAnyPredicate": AdaptiveAnyPredicate([_IS_SMALL, _IS_POSITIVE, _IS_EVEN]),
+    "NeitherPredicate": NeitherPredicate([_IS_SMALL, _IS_EVEN]),
+    "ExactCountPredicate": ExactCountPredicate([_IS_SMALL, _IS_POSITIVE, _IS_EVEN], 2),
+    "ExactOnePredicate": ExactOnePredicate([_IS_SMALL, _IS_EVEN]),
+}
+
+
+def _best(
+    function: Callable[..., Any], repeat: int, setup: Optional[Callable[[], Any]] = None
+) -> float:
+    """
+    The best time of `repeat` runs of `function`. With `setup`, every run is passed a new
+    result of `setup`, which is not timed.
+    """
+    timings = []
+    for _ in range(repeat):
+        arguments = () if setup is None else (setup(),)
+        gc.collect()
+        start = time.perf_counter()
+        function(*arguments)
+        timings.append(time.perf_counter() - start)
+    return max(min(timings), 1e-9)
+
+
+def _traced_size(function: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+class Suite:
+    def __init__(self, sizes: Sequence[int], repeat: int, name_filter: Optional[str]):
+        self.sizes = sizes
+        self.repeat = repeat
+        self.name_filter = name_filter
+        self.results: List[Dict[str, Any]] = []
+
+    def selected(self, name: str) -> bool:
+        return name == BUILTIN or self.name_filter is None or self.name_filter in name
+
+    def record(self, group: str, case: str, operation: str, size: int, **values: float) -> None:
+        self.results.append(
+            {"group": group, "case": case, "operation": operation, "size": size, **values}
+        )
+        measured = ", ".join(f"{name}={value:.6g}" for name, value in values.items())
+        print(f"{group:<11}{case:<24}{operation:<16}{size:>10}  {measured}", file=sys.stderr)
+
+    def throughput(
+        self,
+        group: str,
+        case: str,
+        operation: str,
+        size: int,
+        function: Callable[..., Any],
+        *,
+        setup: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        seconds = _best(function, self.repeat, setup)
+        self.record(group, case, operation, size, seconds=seconds, ops_per_second=size / seconds)
+
+    def memory(self, group: str, case: str, size: int, function: Callable[[], Any]) -> None:
+        self.record(
+            group, case, "memory", size, bytes_per_entry=_traced_size(function) / max(size, 1)
+        )
+
+    def run_maps(self) -> None:
+        for case in MAP_CASES:
+            if not self.selected(case.name):
+                continue
+            # The sizes above the maximum size of the map are measured once, at that size
+            for size in dict.fromkeys(min(size, case.max_size or size) for size in self.sizes):
+                self.run_map(case, size)
+
+    def run_map(self, case: MapCase, size: int) -> None:
+        keys: List[Any] = (
+            [str(i).encode() for i in range(size)] if case.bytes_keys else list(range(size))
+        )
+        items = list(zip(keys, keys))
+
+        def fill() -> Any:
+            if case.build is not None:
+                return case.build(items)
+            _map = case.create(size)  # type: ignore[misc]
+            for key, value in items:
+                _map[key] = value
+            return _map
+
+        def get() -> None:
+            for key in keys:
+                _ = _map[key]
+
+        def contains_value() -> None:
+            if hasattr(_map, "contains_value"):
+                _map.contains_value(missing)
+            else:
+                _ = missing in _map.values()
+
+        def iterate() -> None:
+            iterator = _map.items_iterator() if hasattr(_map, "items_iterator") else _map.items()
+            for _ in iterator:
+                pass
+
+        def delete(filled: Any) -> None:
+            for key in keys:
+                del filled[key]
+
+        group = "maps"
+        missing = b"missing" if case.bytes_keys else -1
+        self.throughput(group, case.name, "set", size, fill)
+        self.memory(group, case.name, size, fill)
+        _map = fill()
+        self.throughput(group, case.name, "get", size, get)
+        self.throughput(group, case.name, "contains_value", size, contains_value)
+        self.throughput(group, case.name, "iterate", size, iterate)
+        if case.build is None:
+            self.throughput(group, case.name, "delete", size, delete, setup=fill)
+        if isinstance(_map, MemoryMappedMap):
+            _map.close()
+
+    def run_sets(self) -> None:
+        for name, create in (
+            (BUILTIN, set),
+            ("OrderedSet", OrderedSet),
+            ("SortedSet", SortedSet),
+            ("ScalableBloomFilter", ScalableBloomFilter),
+        ):
+            if not self.selected(name):
+                continue
+            for size in self.sizes:
+                self.run_set(name, create, size)
+
+    def run_set(self, name: str, create: Callable[[], Any], size: int) -> None:
+        elements = list(range(size))
+
+        def fill() -> Any:
+            _set = create()
+            for element in elements:
+                _set.add(element)
+            return _set
+
+        def contains() -> None:
+            for element in elements:
+                _ = element in _set
+
+        def iterate() -> None:
+            for _ in _set:
+                pass
+
+        def discard(filled: Any) -> None:
+            for element in elements:
+                filled.discard(element)
+
+        group = "sets"
+        self.throughput(group, name, "add", size, fill)
+        self.memory(group, name, size, fill)
+        _set = fill()
+        self.throughput(group, name, "contains", size, contains)
+        # The Bloom filters cannot be iterated and their elements cannot be removed
+        if hasattr(_set, "discard"):
+            self.throughput(group, name, "iterate", size, iterate)
+            self.throughput(group, name, "discard", size, discard, setup=fill)
+
+    def run_predicates(self) -> None:
+        for name, predicate in PREDICATE_CASES.items():
+            if not self.selected(name):
+                continue
+            for size in self.sizes:
+                self.run_predicate(name, predicate, size)
+
+    def run_predicate(self, name: str, predicate: Any, size: int) -> None:
+        values = list(range(-size // 2, size - size // 2))
+
+        def test() -> None:
+            _test = predicate.test
+            for value in values:
+                _test(value)
+
+        self.throughput("predicates", name, "test", size, test)
+        if hasattr(predicate, "test_many"):
+            self.throughput(
+                "predicates", name, "test_many", size, lambda: predicate.test_many(values)
+            )
+
+    def add_relative(self) -> None:
+        baselines = {
+            (result["group"], result["operation"], result["size"]): result
+            for result in self.results
+            if result["case"] == BUILTIN
+        }
+        for result in self.results:
+            baseline = baselines.get((result["group"], result["operation"], result["size"]))
+            if baseline is None:
+                continue
+            if "ops_per_second" in result:
+                result["relative"] = result["ops_per_second"] / baseline["ops_per_second"]
+            elif baseline["bytes_per_entry"]:
+                result["relative"] = result["bytes_per_entry"] / baseline["bytes_per_entry"]
+
+
+def regressions(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], max_regression: float
+) -> List[str]:
+    """
+    Compare the results relative to the builtin collections with a previous run. Throughput
+    regresses when it is lower, memory when it is higher, by more than `max_regression`.
+    """
+    previous = {
+        (result["group"], result["case"], result["operation"], result["size"]): result
+        for result in baseline
+    }
+    failures = []
+    for result in results:
+        key = (result["group"], result["case"], result["operation"], result["size"])
+        before = previous.get(key)
+        if before is None or "relative" not in result or "relative" not in before:
+            continue
+        if result["operation"] == "memory":
+            regressed = result["relative"] > before["relative"] * (1 + max_regression)
+        else:
+            regressed = result["relative"] < before["relative"] * (1 - max_regression)
+        if regressed:
+            failures.append(
+                f"{'/'.join(map(str, key))}: {before['relative']:.3f} -> {result['relative']:.3f}"
+            )
+    return failures
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("--sizes", default="10,1000,100000", help="Comma separated sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--groups", default="maps,sets,predicates", help="Groups to run")
+    parser.add_argument("--filter", help="Only run the cases whose name contains this text")
+    parser.add_argument("--output", help="File to write the JSON results to, stdout if not set")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    suite = Suite([int(size) for size in args.sizes.split(",")], args.repeat, args.filter)
+    groups = args.groups.split(",")
+    for group, run in (
+        ("maps", suite.run_maps),
+        ("sets", suite.run_sets),
+        ("predicates", suite.run_predicates),
+    ):
+        if group in groups:
+            run()
+    suite.add_relative()
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "sizes": suite.sizes,
+        "repeat": suite.repeat,
+        "results": suite.results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            failures = regressions(suite.results, json.load(file)["results"], args.max_regression)
+        for failure in failures:
+            print(f"Regression: {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
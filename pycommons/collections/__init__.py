@@ -1,14 +1,43 @@
 """PyCommons Lang namespace."""
 from __future__ import annotations
 
-from importlib_metadata import PackageNotFoundError, version
+import importlib
+from typing import Any, List
 
 __author__ = "Shashank Sharma"
 __email__ = "shashankrnr32@gmail.com"
+# Only annotated: it is computed by __getattr__ when it is first read
+__version__: str
 
-# Used to automatically set version number from GitHub actions
-# as well as not break when being tested locally
-try:
-    __version__ = version(__package__)
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "0.0.0"
+# Subpackages and modules, imported on first access (PEP 562) so that importing one of them
+# does not import the others
+_SUBMODULES = ("codec", "functions", "instrumentation", "maps", "sets")
+
+
+def _version() -> str:
+    # importlib_metadata takes longer to import than the rest of the package, it is only
+    # imported when the version is read
+    from importlib_metadata import PackageNotFoundError, version  # pylint: disable=C0415
+
+    # Used to automatically set version number from GitHub actions
+    # as well as not break when being tested locally
+    try:
+        return version(__package__)
+    except PackageNotFoundError:  # pragma: no cover
+        return "0.0.0"
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        value: Any = _version()
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_SUBMODULES) | {"__version__"})
@@ -0,0 +1,692 @@
+"""
+A compact binary format for the collections of this package and the builtin types they hold.
+
+A message is a header followed by one value. Every value starts with a one byte tag; lengths,
+counts and integers are varints. Maps and sets are written as their entries in iteration
+order, without the containers wrapping them, so they are read back in the same order. With
+string interning, a string that was already written is replaced by its index in the table of
+the strings written before it, which is rebuilt while reading, so no table is stored.
+
+The elements of a sequence or a set, and the keys and the values of a map, are written as a
+column: a count followed by the values. A column of at least `_MIN_COLUMN` values starts with
+its kind. Integers that fit in 64 bits and floats are packed into an array of the smallest
+item size, which is read back in one call. Strings are written as their lengths and their
+UTF-8 text, followed by their indexes in the string table when interning, and bytes as their
+lengths and their contents. Lists and tuples are written as their lengths and one column of
+all their elements, and dicts that all have the same keys as their keys followed by one
+column per key, so that these columns can be packed too.
+
+Evicting maps are written with their size, their entries in eviction order, and the frequency
+(LFUMap) or the remaining time to live (TTLMap) of their entries. Their statistics, eviction
+listeners and clock are not written. FixedSizeMap is written with its size, DefaultedMap with
+its default value and ConcurrentMap with its concurrency level. The lazy and the predicated
+maps, which hold functions, MemoryMappedMap, which holds a file, and ColumnarMultiValuedMap
+cannot be encoded.
+
+`encode` / `decode` convert a single value. `StreamEncoder` / `StreamDecoder` write and read
+a sequence of length-prefixed messages on a binary stream and share the string table across
+them.
+"""
+# The state of the LFU and TTL maps is read and restored from this module
+# pylint: disable=W0212
+from __future__ import annotations
+
+import array
+import collections
+import itertools
+import operator
+import struct
+import sys
+import typing
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from pycommons.collections.maps.concurrent import ConcurrentMap
+from pycommons.collections.maps.defaulted import DefaultedMap
+from pycommons.collections.maps.evicting import EvictingMap, FIFOMap, LFUMap, LRUMap, TTLMap
+from pycommons.collections.maps.frozen import FrozenMap
+from pycommons.collections.maps.indexed import IndexedMap
+from pycommons.collections.maps.iterable import IterableMap
+from pycommons.collections.maps.multi_valued import CompactMultiValuedMap, MultiValuedMap
+from pycommons.collections.maps.ordered import OrderedMap
+from pycommons.collections.maps.persistent import PersistentMap
+from pycommons.collections.maps.sized import FixedSizeMap, SingletonMap
+from pycommons.collections.maps.sorted import SortedMap
+from pycommons.collections.maps.unmodifiable import UnmodifiableMap
+from pycommons.collections.sets.ordered import OrderedSet
+from pycommons.collections.sets.sorted import SortedSet
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_MAGIC = b"PC"
+_VERSION = 1
+_FLAG_INTERNED = 1
+
+_FLOAT = struct.Struct("<d")
+
+_NONE = 0x00
+_FALSE = 0x01
+_TRUE = 0x02
+_INT = 0x03
+_FLOAT_TAG = 0x04
+_STR = 0x05
+_STR_REF = 0x06
+_BYTES = 0x07
+_LIST = 0x08
+_TUPLE = 0x09
+_SET = 0x0A
+_FROZENSET = 0x0B
+_DICT = 0x0C
+_ORDERED_DICT = 0x0D
+_ITERABLE_MAP = 0x10
+_ORDERED_MAP = 0x11
+_MULTI_VALUED_MAP = 0x12
+_COMPACT_MULTI_VALUED_MAP = 0x13
+_FROZEN_MAP = 0x14
+_PERSISTENT_MAP = 0x15
+_ORDERED_SET = 0x16
+_SORTED_SET = 0x17
+_SORTED_MAP = 0x18
+_INDEXED_MAP = 0x19
+_FIFO_MAP = 0x1A
+_LRU_MAP = 0x1B
+_LFU_MAP = 0x1C
+_TTL_MAP = 0x1D
+_FIXED_SIZE_MAP = 0x1E
+_SINGLETON_MAP = 0x1F
+_UNMODIFIABLE_MAP = 0x20
+_DEFAULTED_MAP = 0x21
+_CONCURRENT_MAP = 0x22
+
+# Kinds of the columns of at least _MIN_COLUMN values
+_MIN_COLUMN = 8
+_VALUES = 0x00
+_INTS = 0x01
+_FLOATS = 0x02
+_RECORDS = 0x03
+_STRINGS = 0x04
+_LISTS = 0x05
+_TUPLES = 0x06
+_BLOBS = 0x07
+
+# Array type codes of the signed integers of every item size, and the floats
+_INT_TYPECODES: Dict[int, str] = {array.array(code).itemsize: code for code in "qlihb"}
+_INT_SIZES = tuple(sorted(_INT_TYPECODES))
+_FLOAT_TYPECODE = "d"
+
+# Sequences and sets written as a column of their elements
+_SEQUENCE_TAGS: Dict[type, int] = {
+    list: _LIST,
+    tuple: _TUPLE,
+    set: _SET,
+    frozenset: _FROZENSET,
+    OrderedSet: _ORDERED_SET,
+    SortedSet: _SORTED_SET,
+}
+# Maps written as a column of their keys and a column of their values
+_MAPPING_TAGS: Dict[type, int] = {
+    dict: _DICT,
+    collections.OrderedDict: _ORDERED_DICT,
+    IterableMap: _ITERABLE_MAP,
+    OrderedMap: _ORDERED_MAP,
+    FrozenMap: _FROZEN_MAP,
+    PersistentMap: _PERSISTENT_MAP,
+    SortedMap: _SORTED_MAP,
+    IndexedMap: _INDEXED_MAP,
+    SingletonMap: _SINGLETON_MAP,
+    UnmodifiableMap: _UNMODIFIABLE_MAP,
+}
+# Maps written as their parameter (the size, the default value or the concurrency level), a
+# column of their keys and a column of their values
+_PARAMETRIZED_TAGS: Dict[type, int] = {
+    FixedSizeMap: _FIXED_SIZE_MAP,
+    DefaultedMap: _DEFAULTED_MAP,
+    ConcurrentMap: _CONCURRENT_MAP,
+}
+# Maps of keys to collections of values, written as a column of their keys and a column of the
+# values of each key
+_MULTI_VALUED_TAGS: Dict[type, int] = {
+    MultiValuedMap: _MULTI_VALUED_MAP,
+    CompactMultiValuedMap: _COMPACT_MULTI_VALUED_MAP,
+}
+# Evicting maps, written as their size, [their ttl,] a column of their keys, a column of their
+# values[, and a column of the frequencies or the remaining time to live of the keys]
+_EVICTING_TAGS: Dict[type, int] = {
+    FIFOMap: _FIFO_MAP,
+    LRUMap: _LRU_MAP,
+    LFUMap: _LFU_MAP,
+    TTLMap: _TTL_MAP,
+}
+
+
+class _Writer:
+    __slots__ = ("out", "strings")
+
+    def __init__(self, out: bytearray, strings: Optional[Dict[str, int]]):
+        self.out = out
+        self.strings = strings
+
+    def varint(self, value: int) -> None:
+        out = self.out
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def write(self, value: Any) -> None:  # pylint: disable=R0912,R0915
+        _type = type(value)
+        out = self.out
+        if _type is str:
+            self.string(value)
+        elif _type is int:
+            out.append(_INT)
+            self.varint(value << 1 if value >= 0 else ((-value) << 1) - 1)
+        elif value is None:
+            out.append(_NONE)
+        elif _type is bool:
+            out.append(_TRUE if value else _FALSE)
+        elif _type is float:
+            out.append(_FLOAT_TAG)
+            out += _FLOAT.pack(value)
+        elif _type in (bytes, bytearray, memoryview):
+            if _type is memoryview:
+                # The length of a memoryview counts its items, which may be wider than a byte
+                value = value.cast("B") if value.c_contiguous else memoryview(value.tobytes())
+            out.append(_BYTES)
+            self.varint(len(value))
+            out += value
+        elif _type in _SEQUENCE_TAGS:
+            out.append(_SEQUENCE_TAGS[_type])
+            self.column(value if _type is list or _type is tuple else list(value))
+        elif _type in _MAPPING_TAGS:
+            out.append(_MAPPING_TAGS[_type])
+            self.column(list(value.keys()))
+            self.column_values(list(value.values()))
+        elif _type in _MULTI_VALUED_TAGS:
+            out.append(_MULTI_VALUED_TAGS[_type])
+            self.column(list(value.data))
+            for values in value.data.values():
+                self.column(list(values))
+        elif _type in _EVICTING_TAGS:
+            out.append(_EVICTING_TAGS[_type])
+            self.evicting_map(value)
+        elif _type in _PARAMETRIZED_TAGS:
+            out.append(_PARAMETRIZED_TAGS[_type])
+            self.parametrized_map(value)
+        else:
+            raise TypeError(f"Cannot encode an object of type {_type.__name__}")
+
+    def string(self, value: str) -> None:
+        strings = self.strings
+        if strings is not None:
+            index = strings.get(value)
+            if index is not None:
+                self.out.append(_STR_REF)
+                self.varint(index)
+                return
+            strings[value] = len(strings)
+
+        encoded = value.encode("utf-8")
+        self.out.append(_STR)
+        self.varint(len(encoded))
+        self.out += encoded
+
+    def column(self, values: Sequence[Any]) -> None:
+        self.varint(len(values))
+        self.column_values(values)
+
+    def column_values(self, values: Sequence[Any]) -> None:
+        out = self.out
+        if len(values) >= _MIN_COLUMN:
+            types = set(map(type, values))
+            if types == {int}:
+                typecode = _int_typecode(min(values), max(values))
+                if typecode is not None:
+                    out.append(_INTS)
+                    out.append(array.array(typecode).itemsize)
+                    out += _pack(typecode, values)
+                    return
+            elif types == {float}:
+                out.append(_FLOATS)
+                out += _pack(_FLOAT_TYPECODE, values)
+                return
+            elif types == {str}:
+                out.append(_STRINGS)
+                self.strings_column(values)
+                return
+            elif types == {bytes}:
+                out.append(_BLOBS)
+                self.column_values(list(map(len, values)))
+                out += b"".join(values)
+                return
+            elif types in ({list}, {tuple}):
+                out.append(_LISTS if types == {list} else _TUPLES)
+                self.column_values([len(value) for value in values])
+                self.column_values(list(itertools.chain.from_iterable(values)))
+                return
+            elif types == {dict} and len(set(map(tuple, values))) == 1:
+                out.append(_RECORDS)
+                keys = list(values[0])
+                self.column(keys)
+                for key in keys:
+                    self.column_values(list(map(operator.itemgetter(key), values)))
+                return
+            out.append(_VALUES)
+
+        write = self.write
+        for value in values:
+            write(value)
+
+    def strings_column(self, values: Sequence[str]) -> None:
+        # The lengths and the UTF-8 text of the strings that are not in the table yet, then the
+        # index of every string in the table. Without interning, every string is written.
+        strings = self.strings
+        added = values
+        if strings is not None:
+            start = len(strings)
+            indexes = [strings.setdefault(value, len(strings)) for value in values]
+            added = list(itertools.islice(reversed(strings), len(strings) - start))[::-1]
+            self.varint(len(added))
+        self.column_values([len(value) for value in added])
+        encoded = "".join(added).encode("utf-8")
+        self.varint(len(encoded))
+        self.out += encoded
+        if strings is not None:
+            self.column_values(indexes)
+
+    def evicting_map(self, value: EvictingMap[Any, Any]) -> None:
+        # Read the entries from the backing dict: reading them from the map counts as a use
+        self.varint(value.max_size())
+        if isinstance(value, TTLMap):
+            self.out += _FLOAT.pack(value.ttl())
+        self.column(list(value.data))
+        self.column_values(list(value.data.values()))
+        if isinstance(value, LFUMap):
+            self.column_values([value.get_frequency(key) for key in value.data])
+        elif isinstance(value, TTLMap):
+            now = value._clock.get()
+            self.column_values([value._expiry[key] - now for key in value.data])
+
+    def parametrized_map(self, value: IterableMap[Any, Any]) -> None:
+        if isinstance(value, FixedSizeMap):
+            self.varint(value.max_size())
+        elif isinstance(value, DefaultedMap):
+            self.write(value._default_value)
+        else:
+            self.varint(len(typing.cast(ConcurrentMap[Any, Any], value).data.segments))
+        # One copy of the entries, so that the keys and the values of a concurrent map match
+        items = list(value.data.items())
+        self.column([key for key, _ in items])
+        self.column_values([value for _, value in items])
+
+
+class _Reader:
+    __slots__ = ("buffer", "position", "strings", "zero_copy", "readers")
+
+    def __init__(self, buffer: memoryview, strings: Optional[List[str]], zero_copy: bool):
+        self.buffer = buffer
+        self.position = 0
+        self.strings = strings
+        self.zero_copy = zero_copy
+        self.readers: Dict[int, Callable[[], Any]] = {
+            _NONE: lambda: None,
+            _FALSE: lambda: False,
+            _TRUE: lambda: True,
+            _INT: self.integer,
+            _FLOAT_TAG: self.float,
+            _STR: self.string,
+            _STR_REF: self.string_reference,
+            _BYTES: self.bytes,
+            _LIST: self.column,
+            _TUPLE: lambda: tuple(self.column()),
+            _SET: lambda: set(self.column()),
+            _FROZENSET: lambda: frozenset(self.column()),
+            _ORDERED_SET: lambda: OrderedSet(self.column()),
+            _SORTED_SET: lambda: SortedSet(self.column()),
+            _DICT: lambda: dict(self.entries()),
+            _ORDERED_DICT: lambda: collections.OrderedDict(self.entries()),
+            _FROZEN_MAP: lambda: FrozenMap(self.entries()),
+            _PERSISTENT_MAP: lambda: PersistentMap(self.entries()),
+            _SORTED_MAP: lambda: SortedMap(self.entries()),
+            _INDEXED_MAP: lambda: IndexedMap(self.entries()),
+            _ITERABLE_MAP: lambda: self.iterable_map(IterableMap()),
+            _ORDERED_MAP: lambda: self.iterable_map(OrderedMap()),
+            _MULTI_VALUED_MAP: self.multi_valued_map,
+            _COMPACT_MULTI_VALUED_MAP: self.compact_multi_valued_map,
+            _FIFO_MAP: lambda: self.evicting_map(FIFOMap),
+            _LRU_MAP: lambda: self.evicting_map(LRUMap),
+            _LFU_MAP: lambda: self.evicting_map(LFUMap),
+            _TTL_MAP: lambda: self.evicting_map(TTLMap),
+            _FIXED_SIZE_MAP: lambda: self.fixed_size_map(FixedSizeMap(self.varint())),
+            _SINGLETON_MAP: lambda: self.fixed_size_map(SingletonMap()),
+            _UNMODIFIABLE_MAP: lambda: UnmodifiableMap(self.entries()),
+            _DEFAULTED_MAP: lambda: self.iterable_map(DefaultedMap(self.read())),
+            _CONCURRENT_MAP: lambda: self.iterable_map(
+                ConcurrentMap(concurrency_level=self.varint())
+            ),
+        }
+
+    def varint(self) -> int:
+        buffer = self.buffer
+        try:
+            result = buffer[self.position]
+            if result < 0x80:
+                self.position += 1
+                return result
+
+            result = shift = 0
+            while True:
+                byte = buffer[self.position]
+                self.position += 1
+                result |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    return result
+                shift += 7
+        except IndexError:
+            raise ValueError("Truncated message") from None
+
+    def byte(self) -> int:
+        position = self.position
+        try:
+            value = self.buffer[position]
+        except IndexError:
+            raise ValueError("Truncated message") from None
+        self.position = position + 1
+        return value
+
+    def read(self) -> Any:
+        position = self.position
+        try:
+            tag = self.buffer[position]
+        except IndexError:
+            raise ValueError("Truncated message") from None
+        self.position = position + 1
+        # Strings are the most common values, read them without looking up their reader
+        if tag == _STR_REF:
+            return self.string_reference()
+        if tag == _STR:
+            return self.string()
+        reader = self.readers.get(tag)
+        if reader is None:
+            raise ValueError(f"Unknown tag {tag:#04x} at position {position}")
+        return reader()
+
+    def integer(self) -> int:
+        value = self.varint()
+        return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+    def float(self) -> float:
+        try:
+            value: float = _FLOAT.unpack_from(self.buffer, self.position)[0]
+        except struct.error:
+            raise ValueError("Truncated message") from None
+        self.position += _FLOAT.size
+        return value
+
+    def take(self, length: int) -> memoryview:
+        start = self.position
+        self.position += length
+        if self.position > len(self.buffer):
+            raise ValueError("Truncated message")
+        return self.buffer[start : self.position]
+
+    def string(self) -> str:
+        value = str(self.take(self.varint()), "utf-8")
+        if self.strings is not None:
+            self.strings.append(value)
+        return value
+
+    def string_reference(self) -> str:
+        if self.strings is None:
+            raise ValueError("String reference in a message without interned strings")
+        return self.strings[self.varint()]
+
+    def bytes(self) -> Union[bytes, memoryview]:
+        value = self.take(self.varint())
+        return value if self.zero_copy else value.tobytes()
+
+    def column(self) -> List[Any]:
+        return self.column_values(self.varint())
+
+    def column_values(self, count: int) -> List[Any]:  # pylint: disable=R0911
+        read = self.read
+        if count < _MIN_COLUMN:
+            return [read() for _ in range(count)]
+
+        kind = self.byte()
+        if kind == _VALUES:
+            return [read() for _ in range(count)]
+        if kind == _INTS:
+            size = self.byte()
+            if size not in _INT_TYPECODES:
+                raise ValueError(f"Unsupported integer size {size} at position {self.position - 1}")
+            return _unpack(_INT_TYPECODES[size], self.take(count * size))
+        if kind == _FLOATS:
+            return _unpack(_FLOAT_TYPECODE, self.take(count * 8))
+        if kind == _STRINGS:
+            return self.strings_column(count)
+        if kind == _BLOBS:
+            lengths = self.column_values(count)
+            data = self.take(sum(lengths))
+            return _split(data if self.zero_copy else data.tobytes(), lengths)
+        if kind in (_LISTS, _TUPLES):
+            lengths = self.column_values(count)
+            lists = _split(self.column_values(sum(lengths)), lengths)
+            return lists if kind == _LISTS else list(map(tuple, lists))
+        if kind == _RECORDS:
+            keys = self.column()
+            if not keys:
+                return [{} for _ in range(count)]
+            columns = [self.column_values(count) for _ in keys]
+            return list(map(dict, map(zip, itertools.repeat(keys), zip(*columns))))
+        raise ValueError(f"Unknown column kind {kind:#04x} at position {self.position - 1}")
+
+    def strings_column(self, count: int) -> List[str]:
+        strings = self.strings
+        lengths = self.column_values(count if strings is None else self.varint())
+        text = str(self.take(self.varint()), "utf-8")
+        if sum(lengths) != len(text):
+            raise ValueError(f"Invalid string lengths at position {self.position}")
+        added = _split(text, lengths)
+        if strings is None:
+            return added
+        strings.extend(added)
+        try:
+            return list(map(strings.__getitem__, self.column_values(count)))
+        except IndexError:
+            raise ValueError(f"Invalid string reference at position {self.position}") from None
+
+    def entries(self) -> Iterator[Any]:
+        keys = self.column()
+        return zip(keys, self.column_values(len(keys)))
+
+    def iterable_map(self, _map: IterableMap[Any, Any]) -> IterableMap[Any, Any]:
+        _map.data.update(self.entries())
+        return _map
+
+    def fixed_size_map(self, _map: FixedSizeMap[Any, Any]) -> FixedSizeMap[Any, Any]:
+        self.iterable_map(_map)
+        if len(_map.data) > _map.max_size():
+            raise ValueError(f"More entries than the size of the map at position {self.position}")
+        return _map
+
+    def multi_valued_map(self) -> MultiValuedMap[Any, Any]:
+        _map: MultiValuedMap[Any, Any] = MultiValuedMap()
+        for key in self.column():
+            _map.data[key] = OrderedSet(self.column())
+        return _map
+
+    def compact_multi_valued_map(self) -> CompactMultiValuedMap[Any, Any]:
+        _map: CompactMultiValuedMap[Any, Any] = CompactMultiValuedMap()
+        for key in self.column():
+            values = self.column()
+            if len(values) > CompactMultiValuedMap.PROMOTION_THRESHOLD:
+                _map.data[key] = OrderedSet(values)
+            else:
+                _map.data[key] = tuple(values)
+        return _map
+
+    def evicting_map(self, cls: Callable[..., EvictingMap[Any, Any]]) -> EvictingMap[Any, Any]:
+        size = self.varint()
+        _map = cls(size, self.float()) if cls is TTLMap else cls(size)
+        keys = self.column()
+        # Adding the keys in eviction order restores the order of the FIFO and LRU maps
+        for key, value in zip(keys, self.column_values(len(keys))):
+            _map[key] = value
+        if isinstance(_map, LFUMap):
+            for key, frequency in zip(keys, self.column_values(len(keys))):
+                _map._set_frequency(key, frequency)
+        elif isinstance(_map, TTLMap):
+            now = _map._clock.get()
+            for key, remaining in zip(keys, self.column_values(len(keys))):
+                _map._expiry[key] = now + remaining
+        return _map
+
+
+def _int_typecode(minimum: int, maximum: int) -> Optional[str]:
+    """
+    Returns:
+        The type code of the smallest array of signed integers holding the integers between
+        minimum and maximum, or None if they do not fit in 64 bits
+    """
+    for size in _INT_SIZES:
+        bound = 1 << (8 * size - 1)
+        if -bound <= minimum and maximum < bound:
+            return _INT_TYPECODES[size]
+    return None
+
+
+def _pack(typecode: str, values: Sequence[Any]) -> bytes:
+    packed = array.array(typecode, values)
+    if sys.byteorder != "little":  # pragma: no cover
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(typecode: str, data: memoryview) -> List[Any]:
+    unpacked = array.array(typecode)
+    unpacked.frombytes(data)
+    if sys.byteorder != "little":  # pragma: no cover
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
+def _split(values: Any, lengths: List[int]) -> List[Any]:
+    # Slices of the given lengths of a sequence, without a Python loop
+    ends = list(itertools.accumulate(lengths))
+    return list(map(values.__getitem__, map(slice, [0] + ends[:-1], ends)))
+
+
+def _header(intern_strings: bool) -> bytes:
+    return _MAGIC + bytes((_VERSION, _FLAG_INTERNED if intern_strings else 0))
+
+
+def _read_header(buffer: memoryview) -> bool:
+    if bytes(buffer[:2]) != _MAGIC or len(buffer) < 4:
+        raise ValueError("Not an encoded message")
+    if buffer[2] != _VERSION:
+        raise ValueError(f"Unsupported version {buffer[2]}")
+    return bool(buffer[3] & _FLAG_INTERNED)
+
+
+def encode(value: Any, intern_strings: bool = True) -> bytes:
+    """
+    Encode a value: None, a bool, int, float, str, bytes, list, tuple, set, frozenset, dict,
+    OrderedDict, IterableMap, OrderedMap, SortedMap, IndexedMap, MultiValuedMap,
+    CompactMultiValuedMap, FrozenMap, PersistentMap, FIFOMap, LRUMap, LFUMap, TTLMap,
+    FixedSizeMap, SingletonMap, UnmodifiableMap, DefaultedMap, ConcurrentMap, OrderedSet or
+    SortedSet, nested in any way. Subclasses of these types, other than the ones listed, are not
+    supported.
+
+    Args:
+        value: Value to be encoded.
+        intern_strings: Write repeated strings as references to their first occurrence.
+
+    Returns:
+        The encoded message
+    """
+    out = bytearray(_header(intern_strings))
+    _Writer(out, {} if intern_strings else None).write(value)
+    return bytes(out)
+
+
+def decode(data: Buffer, zero_copy: bool = False) -> Any:
+    """
+    Decode a message created by `encode`. The message is read in place, without copying it.
+
+    Args:
+        data: The message.
+        zero_copy: Return the bytes values as memoryviews into the message instead of copies.
+
+    Returns:
+        The decoded value
+    """
+    buffer = memoryview(data).cast("B")
+    reader = _Reader(buffer[4:], [] if _read_header(buffer) else None, zero_copy)
+    value = reader.read()
+    if reader.position != len(reader.buffer):
+        raise ValueError("Unexpected data after the encoded value")
+    return value
+
+
+class StreamEncoder:
+    """
+    Writes values to a binary stream, each as a message prefixed with its length. A string is
+    written once per stream when `intern_strings` is True.
+    """
+
+    def __init__(self, stream: BinaryIO, intern_strings: bool = True):
+        self._stream = stream
+        self._strings: Optional[Dict[str, int]] = {} if intern_strings else None
+        self._stream.write(_header(intern_strings))
+
+    def write(self, value: Any) -> None:
+        out = bytearray()
+        _Writer(out, self._strings).write(value)
+        length = _Writer(bytearray(), None)
+        length.varint(len(out))
+        self._stream.write(length.out)
+        self._stream.write(out)
+
+
+class StreamDecoder:
+    """
+    Reads the values written by a StreamEncoder from a binary stream, one message at a time.
+    """
+
+    def __init__(self, stream: BinaryIO, zero_copy: bool = False):
+        self._stream = stream
+        self._zero_copy = zero_copy
+        header = memoryview(self._stream.read(4))
+        self._strings: Optional[List[str]] = [] if _read_header(header) else None
+
+    def read(self) -> Any:
+        """
+        Returns:
+            The next value of the stream
+
+        Raises:
+            EOFError: if the stream has no more values
+        """
+        length = shift = 0
+        while True:
+            byte = self._stream.read(1)
+            if not byte:
+                if shift:
+                    raise ValueError("Truncated message")
+                raise EOFError("No more values in the stream")
+            length |= (byte[0] & 0x7F) << shift
+            if byte[0] < 0x80:
+                break
+            shift += 7
+
+        message = self._stream.read(length)
+        if len(message) != length:
+            raise ValueError("Truncated message")
+        return _Reader(memoryview(message), self._strings, self._zero_copy).read()
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                yield self.read()
+            except EOFError:
+                return
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import typing
+from typing import TypeVar, Generic, Any, Callable, Dict, List, Tuple, FrozenSet
+
+from pycommons.base.function import Predicate
+from pycommons.base.function.predicate import PassingPredicate, FailingPredicate
+
+from pycommons.collections.functions.predicate import (
+    AllPredicate,
+    AndPredicate,
+    AnyPredicate,
+    EqualsPredicate,
+    ExactCountPredicate,
+    IdentityPredicate,
+    InPredicate,
+    NeitherPredicate,
+    NotEqualsPredicate,
+    NotInPredicate,
+    NotPredicate,
+    OrPredicate,
+    _record,
+)
+from pycommons.collections.instrumented import Instrumented
+
+_T = TypeVar("_T")
+
+# A predicate tree is lowered to nested tuples whose first element is the kind of the node:
+#   ("const", bool), ("and", [nodes]), ("or", [nodes]), ("not", node), ("count", [nodes], int),
+#   ("eq" | "ne" | "is" | "isnot", value), ("in" | "notin", frozenset), ("leaf", predicate)
+_Node = Tuple[Any, ...]
+
+_TRUE: _Node = ("const", True)
+_FALSE: _Node = ("const", False)
+_NEGATIONS = {"eq": "ne", "ne": "eq", "is": "isnot", "isnot": "is", "in": "notin", "notin": "in"}
+
+
+class CompiledPredicate(Predicate[_T], Instrumented, Generic[_T]):
+    """
+    A predicate that evaluates a whole predicate tree with a single generated function. Use
+    `compile_predicate` to create one.
+    """
+
+    def __init__(self, predicate: Predicate[_T], node: _Node, source: str, function: Any):
+        self._predicate = predicate
+        self._node = node
+        self._source = source
+        self._function: Callable[[_T], bool] = function
+
+    def test(self, value: _T) -> bool:
+        result = self._function(value)
+        return result if self._instrument is None else _record(self, result)
+
+    def get_predicate(self) -> Predicate[_T]:
+        return self._predicate
+
+    def get_source(self) -> str:
+        return self._source
+
+
+def compile_predicate(predicate: Predicate[_T]) -> CompiledPredicate[_T]:
+    """
+    Compile a predicate tree into a single specialized function. The tree is flattened, double
+    negations are removed, `PassingPredicate` and `FailingPredicate` are folded into the
+    predicates that decorate them, and `EqualsPredicate` / `InPredicate` siblings are merged
+    into a single frozenset lookup. The compiled predicate returns the same results as the tree.
+    Only the `EqualsPredicate` of None, bools, numbers other than NaN, strings and bytes are
+    merged, the others stay `==` comparisons.
+
+    Predicates that are not part of this module are kept as they are and called from the
+    compiled function.
+
+    Args:
+        predicate: Root of the predicate tree.
+
+    Returns:
+        The compiled predicate
+    """
+    node = _simplify(_lower(predicate))
+    constants: Dict[str, Any] = {}
+    expression = _emit(node, constants)
+
+    body = f"return True if {expression} else False"
+    if _contains_set_lookup(node):
+        # Unhashable values cannot be looked up in a frozenset. Let the original tree decide,
+        # before any leaf is called: a TypeError raised by a leaf must not run the leaves twice.
+        constants["_fallback"] = predicate.test
+        body = (
+            "try:\n        hash(value)\n    except TypeError:\n        return _fallback(value)"
+            f"\n    {body}"
+        )
+    source = f"def _compiled(value):\n    {body}\n"
+
+    namespace: Dict[str, Any] = {}
+    code = compile(source, "<compiled predicate>", "exec")
+    exec(code, constants, namespace)  # pylint: disable=W0122
+    return CompiledPredicate(predicate, node, source, namespace["_compiled"])
+
+
+def _lower(predicate: Predicate[Any]) -> _Node:  # pylint: disable=R0911,R0912
+    if isinstance(predicate, CompiledPredicate):
+        return predicate._node  # pylint: disable=W0212
+    if isinstance(predicate, PassingPredicate):
+        return _TRUE
+    if isinstance(predicate, FailingPredicate):
+        return _FALSE
+    if isinstance(predicate, NotPredicate):
+        return "not", _lower(predicate.get_predicates()[0])
+    if isinstance(predicate, (AllPredicate, AndPredicate)):
+        return "and", [_lower(child) for child in predicate.get_predicates()]
+    if isinstance(predicate, (AnyPredicate, OrPredicate)):
+        return "or", [_lower(child) for child in predicate.get_predicates()]
+    if isinstance(predicate, NeitherPredicate):
+        return "not", ("or", [_lower(child) for child in predicate.get_predicates()])
+    if isinstance(predicate, ExactCountPredicate):
+        decorated = predicate._decorated  # pylint: disable=W0212
+        if decorated is not None:
+            return _lower(decorated)
+        return (
+            "count",
+            [_lower(child) for child in predicate.get_predicates()],
+            predicate._expected_count,  # pylint: disable=W0212
+        )
+    if isinstance(predicate, EqualsPredicate):
+        return "eq", predicate._value  # pylint: disable=W0212
+    if isinstance(predicate, NotEqualsPredicate):
+        return "ne", predicate._value  # pylint: disable=W0212
+    if isinstance(predicate, IdentityPredicate):
+        return "is", predicate._value  # pylint: disable=W0212
+    if isinstance(predicate, (InPredicate, NotInPredicate)):
+        values = predicate._values  # pylint: disable=W0212
+        if isinstance(values, frozenset):
+            return ("in" if isinstance(predicate, InPredicate) else "notin"), values
+    return "leaf", predicate
+
+
+# Types whose equality agrees with set membership. A frozenset lookup also matches a value by
+# identity, so NaN, which is not equal to itself, and the types that can define their own
+# equality are only compared with ==.
+_SET_LOOKUP_TYPES = (type(None), bool, int, str, bytes)
+
+
+def _is_set_lookup_safe(value: Any) -> bool:
+    if type(value) in (float, complex):  # pylint: disable=C0123
+        return bool(value == value)  # pylint: disable=R0124
+    return type(value) in _SET_LOOKUP_TYPES  # pylint: disable=C0123
+
+
+def _simplify(node: _Node) -> _Node:
+    kind = node[0]
+    if kind == "not":
+        return _negate(_simplify(node[1]))
+    if kind in ("and", "or"):
+        return _simplify_junction(kind, [_simplify(child) for child in node[1]])
+    if kind == "count":
+        return _simplify_count([_simplify(child) for child in node[1]], node[2])
+    return node
+
+
+def _negate(node: _Node) -> _Node:
+    kind = node[0]
+    if kind == "not":
+        return typing.cast(_Node, node[1])
+    if kind == "const":
+        return "const", not node[1]
+    if kind in _NEGATIONS:
+        return _NEGATIONS[kind], node[1]
+    return "not", node
+
+
+def _simplify_junction(kind: str, children: List[_Node]) -> _Node:
+    # "and" short-circuits on False, "or" on True. The other constant is the identity.
+    absorbing, identity = (_FALSE, _TRUE) if kind == "and" else (_TRUE, _FALSE)
+
+    flattened: List[_Node] = []
+    for child in children:
+        if child[0] == kind:
+            flattened.extend(child[1])
+        elif child == absorbing:
+            return absorbing
+        elif child != identity:
+            flattened.append(child)
+
+    merged = _merge_set_lookups(kind, flattened)
+    if not merged:
+        return identity
+    if len(merged) == 1:
+        return merged[0]
+    return kind, merged
+
+
+def _merge_set_lookups(kind: str, children: List[_Node]) -> List[_Node]:
+    # Sibling set lookups are merged into one, at the position of the first of them. Membership
+    # sets intersect under "and" and unite under "or", non-membership sets the other way round.
+    merged: List[_Node] = []
+    positions: Dict[str, int] = {}
+    values: Dict[str, FrozenSet[Any]] = {}
+    for child in children:
+        set_kind, child_values = _as_set_lookup(child)
+        if set_kind is None:
+            merged.append(child)
+        elif set_kind not in values:
+            positions[set_kind] = len(merged)
+            values[set_kind] = child_values
+            merged.append(child)
+        elif (set_kind == "in") == (kind == "and"):
+            values[set_kind] = values[set_kind] & child_values
+        else:
+            values[set_kind] = values[set_kind] | child_values
+
+    for set_kind, position in positions.items():
+        merged[position] = _set_node(set_kind, values[set_kind])
+    return merged
+
+
+def _as_set_lookup(node: _Node) -> Tuple[typing.Optional[str], FrozenSet[Any]]:
+    if node[0] in ("in", "notin"):
+        return node[0], node[1]
+    if node[0] in ("eq", "ne") and _is_set_lookup_safe(node[1]):
+        return ("in" if node[0] == "eq" else "notin"), frozenset((node[1],))
+    return None, frozenset()
+
+
+def _set_node(kind: str, values: FrozenSet[Any]) -> _Node:
+    if len(values) == 1:
+        return ("eq" if kind == "in" else "ne"), next(iter(values))
+    if not values:
+        return _FALSE if kind == "in" else _TRUE
+    return kind, values
+
+
+def _simplify_count(children: List[_Node], count: int) -> _Node:
+    remaining: List[_Node] = []
+    for child in children:
+        if child == _TRUE:
+            count -= 1
+        elif child != _FALSE:
+            remaining.append(child)
+
+    if count < 0 or count > len(remaining):
+        return _FALSE
+    if count == 0:
+        return _negate(_simplify_junction("or", remaining))
+    if count == len(remaining):
+        return _simplify_junction("and", remaining)
+    return "count", remaining, count
+
+
+def _emit(node: _Node, constants: Dict[str, Any]) -> str:
+    kind = node[0]
+    if kind == "const":
+        return "True" if node[1] else "False"
+    if kind in ("and", "or"):
+        return "(" + f" {kind} ".join(_emit(child, constants) for child in node[1]) + ")"
+    if kind == "not":
+        return f"(not {_emit(node[1], constants)})"
+    if kind == "count":
+        terms = " + ".join(f"(1 if {_emit(child, constants)} else 0)" for child in node[1])
+        return f"({terms} == {node[2]})"
+
+    name = f"_c{len(constants)}"
+    if kind == "leaf":
+        constants[name] = node[1].test
+        return f"{name}(value)"
+
+    constants[name] = node[1]
+    operator = {
+        "eq": "==",
+        "ne": "!=",
+        "is": "is",
+        "isnot": "is not",
+        "in": "in",
+        "notin": "not in",
+    }[kind]
+    return f"(value {operator} {name})"
+
+
+def _contains_set_lookup(node: _Node) -> bool:
+    kind = node[0]
+    if kind in ("in", "notin"):
+        return True
+    if kind in ("and", "or", "count"):
+        return any(_contains_set_lookup(child) for child in node[1])
+    if kind == "not":
+        return _contains_set_lookup(node[1])
+    return False
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from typing import TypeVar, Generic, Any, Optional, Tuple
+
+from pycommons.base.function import Predicate, Supplier
+
+from pycommons.collections.functions.predicate import DecoratedPredicate, _record
+from pycommons.collections.maps.evicting import EvictingMap, EvictionStatistics, LRUMap, TTLMap
+
+_T = TypeVar("_T")
+
+
+class MemoizedPredicate(DecoratedPredicate[_T], Generic[_T]):
+    """
+    A Predicate that caches the results of the predicate that it is decorating. The cache holds
+    at most `max_size` results and evicts the least recently used one to make room, or the
+    oldest one if a `ttl` (in seconds) is given, after which results expire.
+
+    Values are the keys of the cache, together with their type, so they must be hashable. Values
+    that are equal but of different types, such as `1`, `True` and `1.0`, are cached separately,
+    like with `functools.lru_cache(typed=True)`. Unhashable values are tested without caching.
+    With `by_identity=True` the cache is keyed by the identity of the values instead, which
+    works for unhashable values and does not call `__eq__`/`__hash__`. The value is kept alive
+    by the cache entry so its identity cannot be reused while cached.
+
+    The cache is guarded by a lock, so the predicate can be shared between threads. The lock
+    is not held while the decorated predicate is tested, so concurrent misses of the same value
+    may test it more than once.
+    """
+
+    def __init__(
+        self,
+        predicate: Predicate[_T],
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+        by_identity: bool = False,
+        clock: Optional[Supplier[float]] = None,
+    ):
+        super().__init__((predicate,), None)
+        self._by_identity = by_identity
+        self._lock = threading.Lock()
+        self._cache: EvictingMap[Any, Tuple[Any, bool]] = (
+            LRUMap(max_size) if ttl is None else TTLMap(max_size, ttl, clock=clock)
+        )
+
+    def test(self, value: _T) -> bool:
+        key: Any = id(value) if self._by_identity else (type(value), value)
+        try:
+            with self._lock:
+                entry = self._cache.get(key)
+        except TypeError:
+            result = self._predicates[0].test(value)
+        else:
+            if entry is not None and (not self._by_identity or entry[0] is value):
+                result = entry[1]
+            else:
+                result = self._predicates[0].test(value)
+                with self._lock:
+                    self._cache[key] = (value if self._by_identity else None, result)
+        return result if self._instrument is None else _record(self, result)
+
+    def get_statistics(self) -> EvictionStatistics:
+        with self._lock:
+            return self._cache.get_statistics()
+
+    def reset_statistics(self) -> None:
+        with self._lock:
+            self._cache.reset_statistics()
+
+    def cache_size(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
@@ -1,15 +1,136 @@
+import bisect
+import dataclasses
+import math
+import numbers
+import operator
+import sys
+import time
+import typing
 from abc import ABC
-from typing import TypeVar, Iterable, Generic, Tuple, Optional
+from typing import (
+    TypeVar,
+    Iterable,
+    Generic,
+    Tuple,
+    Optional,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Sequence,
+)
 
 from pycommons.base.container import IntegerContainer
-from pycommons.base.function import Predicate
+from pycommons.base.function import Predicate, Supplier
 from pycommons.base.function.predicate import PassingPredicate, FailingPredicate
 from pycommons.base.utils import ObjectUtils
 
+from pycommons.collections.instrumented import PREDICATE_EVALUATIONS, REJECTIONS, Instrumented
+
 _T = TypeVar("_T")
 
+# A boolean mask: a list of bools, or a NumPy array of bools when testing a NumPy array.
+BooleanMask = Sequence[bool]
+
+# NumPy kinds of booleans, integers, floating point and complex numbers
+_NUMERIC_KINDS = frozenset("biufc")
+
+# Immutable containers whose own `in` is used instead of a snapshot of their elements
+_CONTAINER_TYPES = (str, bytes, range, frozenset)
+
+# Snapshots of the values of an IterableValuedPredicate
+_SNAPSHOT_TYPES = (frozenset, list, tuple)
+
+# Keeps a predicate that never short-circuits from getting an infinite expected cost.
+_MIN_SHORT_CIRCUIT_RATE = 1e-3
+
+
+def _mask(array: Any) -> BooleanMask:
+    return typing.cast(BooleanMask, array)
+
+
+def _numpy() -> Any:
+    # NumPy is not imported by this module, it takes longer to import than the whole package.
+    # The values can only be a NumPy array if NumPy was imported by the application, and the
+    # array paths are only taken for NumPy arrays.
+    return sys.modules.get("numpy")
+
+
+def _is_array(values: Any) -> bool:
+    numpy = _numpy()
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def _kind(value: Any) -> str:
+    kind: str = _numpy().asarray(value).dtype.kind
+    return kind
+
+
+def _is_compatible(array: Any, kinds: Iterable[str]) -> bool:
+    # NumPy converts the operands to a common type before comparing them, which changes the
+    # result of comparing numbers with strings (or fails). Only numbers are compared with
+    # numbers and strings with strings of the same kind, the other values are tested one by one.
+    array_kind = array.dtype.kind
+    if array_kind in _NUMERIC_KINDS:
+        return all(kind in _NUMERIC_KINDS for kind in kinds)
+    return array_kind in ("U", "S") and all(kind == array_kind for kind in kinds)
+
+
+def _test_each(test: Callable[[_T], bool], values: Iterable[_T]) -> BooleanMask:
+    if _is_array(values):
+        array: Any = values
+        return _mask(
+            _numpy().fromiter((test(value) for value in array), dtype=bool, count=len(array))
+        )
+    return [bool(test(value)) for value in values]
+
+
+def _constant_mask(result: bool, values: Iterable[_T]) -> BooleanMask:
+    if _is_array(values):
+        array: Any = values
+        return _mask(_numpy().full(len(array), result, dtype=bool))
+    return [result for _ in values]
+
+
+def test_many(predicate: Predicate[_T], values: Iterable[_T]) -> BooleanMask:
+    """
+    Test many values with a predicate. Predicates of this module are tested with their
+    `test_many`, other predicates are tested value by value.
+
+    Args:
+        predicate: Predicate to test the values with.
+        values: Values to be tested.
 
-class DecoratedPredicate(Predicate[_T], Generic[_T], ABC):
+    Returns:
+        A mask with the result of the test for every value
+    """
+    if isinstance(predicate, BatchPredicate):
+        return predicate.test_many(values)
+    if isinstance(predicate, PassingPredicate):
+        return _constant_mask(True, values)
+    if isinstance(predicate, FailingPredicate):
+        return _constant_mask(False, values)
+    return _test_each(predicate.test, values)
+
+
+class BatchPredicate(Predicate[_T], Instrumented, Generic[_T], ABC):
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        """
+        Test many values at once. If the values are a NumPy array, the result is a NumPy array of
+        bools and the predicates that can be vectorized are evaluated with NumPy operations.
+        Otherwise, the result is a list of bools.
+
+        Args:
+            values: Values to be tested.
+
+        Returns:
+            A mask with the result of the test for every value
+        """
+        return _test_each(self.test, values)
+
+
+class DecoratedPredicate(BatchPredicate[_T], Generic[_T], ABC):
     def __init__(
         self, predicates: Iterable[Predicate[_T]], empty_predicate: Optional[Predicate[_T]]
     ):
@@ -46,10 +167,17 @@ class AllPredicate(DecoratedPredicate[_T], Generic[_T]):
         Returns:
             True if all the predicates returns True
         """
+        result = True
         for predicate in self._predicates:
             if not predicate.test(value):
-                return False
-        return True
+                result = False
+                break
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if not _is_array(values):
+            return super().test_many(values)
+        return _record_many(self, _all_mask(self._predicates, values))
 
 
 class AnyPredicate(DecoratedPredicate[_T], Generic[_T]):
@@ -72,10 +200,190 @@ class AnyPredicate(DecoratedPredicate[_T], Generic[_T]):
         Returns:
             True if any the predicates returns True
         """
+        result = False
         for predicate in self._predicates:
             if predicate.test(value):
-                return True
-        return False
+                result = True
+                break
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if not _is_array(values):
+            return super().test_many(values)
+        return _record_many(self, _any_mask(self._predicates, values))
+
+
+class _ChildStatistics:
+    __slots__ = ("calls", "passes", "seconds")
+
+    def __init__(self) -> None:
+        self.calls: float = 0
+        self.passes: float = 0
+        self.seconds: float = 0.0
+
+
+class _AdaptiveOrdering(DecoratedPredicate[_T], Generic[_T], ABC):  # pylint: disable=R0902
+    """
+    Base of the adaptive predicates. Every `sample_interval`-th test is timed and the outcome of
+    each child it evaluated is recorded. After `reorder_interval` sampled tests the children
+    are sorted by their expected cost to decide the result, i.e. the average cost of a test
+    divided by the probability that the child short-circuits, like a query planner orders
+    filters. Older samples are halved on every reordering so the ordering follows changes in
+    the workload.
+    """
+
+    _short_circuit: bool
+
+    def __init__(
+        self,
+        predicates: Iterable[Predicate[_T]],
+        empty_predicate: Predicate[_T],
+        sample_interval: int,
+        reorder_interval: int,
+        clock: Optional[Supplier[float]],
+    ):
+        # The __init__ of AllPredicate / AnyPredicate only chooses the empty predicate
+        DecoratedPredicate.__init__(self, predicates, empty_predicate)
+        if sample_interval <= 0 or reorder_interval <= 0:
+            raise ValueError("sample_interval and reorder_interval must be greater than 0")
+
+        self._ordering: Tuple[Predicate[_T], ...] = tuple(self._predicates)
+        self._statistics: Dict[int, _ChildStatistics] = {
+            id(predicate): _ChildStatistics() for predicate in self._predicates
+        }
+        self._sample_interval = sample_interval
+        self._reorder_interval = reorder_interval
+        self._clock: Supplier[float] = clock or Supplier.of(time.perf_counter)
+        self._tests = 0
+        self._samples = 0
+        self._pinned = False
+
+    def get_ordering(self) -> Tuple[Predicate[_T], ...]:
+        """
+        Returns:
+            The predicates in the order they are currently evaluated in
+        """
+        return self._ordering
+
+    def pin_ordering(self, ordering: Optional[Iterable[Predicate[_T]]] = None) -> None:
+        """
+        Stop adapting and evaluate the predicates in a fixed order.
+
+        Args:
+            ordering: The order to evaluate the predicates in, which must contain each of the
+                decorated predicates once. Defaults to the current ordering.
+        """
+        if ordering is not None:
+            _ordering = tuple(ordering)
+            if sorted(map(id, _ordering)) != sorted(map(id, self._predicates)):
+                raise ValueError("ordering must contain each of the decorated predicates once")
+            self._ordering = _ordering
+        self._pinned = True
+
+    def unpin_ordering(self) -> None:
+        self._pinned = False
+
+    def is_pinned(self) -> bool:
+        return self._pinned
+
+    def test(self, value: _T) -> bool:
+        self._tests += 1
+        if self._pinned or self._tests % self._sample_interval:
+            short_circuit = self._short_circuit
+            result = not short_circuit
+            for predicate in self._ordering:
+                if bool(predicate.test(value)) is short_circuit:
+                    result = short_circuit
+                    break
+        else:
+            result = self._sampled_test(value)
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if not _is_array(values):
+            return super().test_many(values)
+        if self._short_circuit:
+            return _record_many(self, _any_mask(self._ordering, values))
+        return _record_many(self, _all_mask(self._ordering, values))
+
+    def _sampled_test(self, value: _T) -> bool:
+        short_circuit = self._short_circuit
+        result = not short_circuit
+        for predicate in self._ordering:
+            statistics = self._statistics[id(predicate)]
+            start = self._clock.get()
+            passed = bool(predicate.test(value))
+            statistics.seconds += self._clock.get() - start
+            statistics.calls += 1
+            statistics.passes += passed
+            if passed is short_circuit:
+                result = short_circuit
+                break
+
+        self._samples += 1
+        if self._samples % self._reorder_interval == 0 and not self._pinned:
+            self._reorder()
+        return result
+
+    def _reorder(self) -> None:
+        def _expected_cost(predicate: Predicate[_T]) -> float:
+            statistics = self._statistics[id(predicate)]
+            if not statistics.calls:
+                return math.inf
+            passes = (
+                statistics.passes if self._short_circuit else statistics.calls - statistics.passes
+            )
+            short_circuit_rate = max(passes / statistics.calls, _MIN_SHORT_CIRCUIT_RATE)
+            return statistics.seconds / statistics.calls / short_circuit_rate
+
+        self._ordering = tuple(sorted(self._ordering, key=_expected_cost))
+        for statistics in self._statistics.values():
+            statistics.calls /= 2
+            statistics.passes /= 2
+            statistics.seconds /= 2
+
+
+class AdaptiveAllPredicate(  # pylint: disable=R0901
+    _AdaptiveOrdering[_T], AllPredicate[_T], Generic[_T]
+):
+    """
+    An AllPredicate that learns the order to evaluate its predicates in, so that the predicates
+    that are cheap and likely to return False are tested first. The result is the same as
+    the one of AllPredicate, only the order, and so the number, of the tests changes.
+    `get_predicates` returns the predicates in the order they were given, `get_ordering` in
+    the order they are evaluated.
+    """
+
+    _short_circuit = False
+
+    def __init__(
+        self,
+        predicates: Iterable[Predicate[_T]],
+        sample_interval: int = 16,
+        reorder_interval: int = 64,
+        clock: Optional[Supplier[float]] = None,
+    ):
+        super().__init__(predicates, PassingPredicate(), sample_interval, reorder_interval, clock)
+
+
+class AdaptiveAnyPredicate(  # pylint: disable=R0901
+    _AdaptiveOrdering[_T], AnyPredicate[_T], Generic[_T]
+):
+    """
+    An AnyPredicate that learns the order to evaluate its predicates in, so that the predicates
+    that are cheap and likely to return True are tested first. See AdaptiveAllPredicate.
+    """
+
+    _short_circuit = True
+
+    def __init__(
+        self,
+        predicates: Iterable[Predicate[_T]],
+        sample_interval: int = 16,
+        reorder_interval: int = 64,
+        clock: Optional[Supplier[float]] = None,
+    ):
+        super().__init__(predicates, FailingPredicate(), sample_interval, reorder_interval, clock)
 
 
 class NeitherPredicate(DecoratedPredicate[_T], Generic[_T]):
@@ -99,26 +407,47 @@ class NeitherPredicate(DecoratedPredicate[_T], Generic[_T]):
         Returns:
             True if neither the predicates returns True
         """
+        result = True
         for predicate in self._predicates:
             if predicate.test(value):
-                return False
-        return True
+                result = False
+                break
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if not _is_array(values):
+            return super().test_many(values)
+        return _record_many(self, _mask(_numpy().logical_not(_any_mask(self._predicates, values))))
 
 
 class ExactCountPredicate(DecoratedPredicate[_T], Generic[_T]):
     def test(self, value: _T) -> bool:
         if self._decorated:
-            return self._decorated.test(value)
+            result = self._decorated.test(value)
+        else:
+            count: IntegerContainer = IntegerContainer()
+            for predicate in self._predicates:
+                if predicate.test(value):
+                    count.increment()
 
-        count: IntegerContainer = IntegerContainer()
-        for predicate in self._predicates:
-            if predicate.test(value):
-                count.increment()
+                    if count.get() > self._expected_count:
+                        break
+
+            result = count.get() == self._expected_count
+        return result if self._instrument is None else _record(self, result)
 
-                if count.get() > self._expected_count:
-                    return False
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if self._decorated:
+            return _record_many(self, self._decorated.test_many(values))
+        if not _is_array(values):
+            return super().test_many(values)
 
-        return count.get() == self._expected_count
+        array: Any = values
+        numpy = _numpy()
+        counts = numpy.zeros(len(array), dtype=numpy.intp)
+        for predicate in self._predicates:
+            counts += test_many(predicate, array)
+        return _record_many(self, _mask(counts == self._expected_count))
 
     def get_predicates(self) -> Tuple[Predicate[_T], ...]:
         if self._decorated:
@@ -150,7 +479,13 @@ class AndPredicate(DecoratedPredicate[_T], Generic[_T]):
         super().__init__((predicate1, predicate2), None)
 
     def test(self, value: _T) -> bool:
-        return self._predicates[0].test(value) and self._predicates[1].test(value)
+        result = self._predicates[0].test(value) and self._predicates[1].test(value)
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if not _is_array(values):
+            return super().test_many(values)
+        return _record_many(self, _all_mask(self._predicates, values))
 
 
 class OrPredicate(DecoratedPredicate[_T], Generic[_T]):
@@ -158,7 +493,13 @@ class OrPredicate(DecoratedPredicate[_T], Generic[_T]):
         super().__init__((predicate1, predicate2), None)
 
     def test(self, value: _T) -> bool:
-        return self._predicates[0].test(value) and self._predicates[1].test(value)
+        result = self._predicates[0].test(value) or self._predicates[1].test(value)
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if not _is_array(values):
+            return super().test_many(values)
+        return _record_many(self, _any_mask(self._predicates, values))
 
 
 class NotPredicate(DecoratedPredicate[_T], Generic[_T]):
@@ -166,27 +507,67 @@ class NotPredicate(DecoratedPredicate[_T], Generic[_T]):
         super().__init__((predicate,), None)
 
     def test(self, value: _T) -> bool:
-        return not self._predicates[0].test(value)
+        result = not self._predicates[0].test(value)
+        return result if self._instrument is None else _record(self, result)
 
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if not _is_array(values):
+            return super().test_many(values)
+        return _record_many(
+            self, _mask(_numpy().logical_not(test_many(self._predicates[0], values)))
+        )
 
-class ValuedPredicate(Predicate[_T], Generic[_T], ABC):
+
+class ValuedPredicate(BatchPredicate[_T], Generic[_T], ABC):
     def __init__(self, value: _T):
         self._value: _T = value
 
+    def _is_vectorizable(self, values: Iterable[_T]) -> bool:
+        return (
+            _is_array(values)
+            and _numpy().isscalar(self._value)
+            and _is_compatible(values, (_kind(self._value),))
+        )
+
 
 class IdentityPredicate(ValuedPredicate[_T], Generic[_T]):
     def test(self, value: _T) -> bool:
-        return value is self._value
+        result = value is self._value
+        return result if self._instrument is None else _record(self, result)
 
 
 class EqualsPredicate(ValuedPredicate[_T], Generic[_T]):
     def test(self, value: _T) -> bool:
-        return value == self._value
+        result = value == self._value
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if self._is_vectorizable(values):
+            numpy = _numpy()
+            return _record_many(
+                self, _mask(numpy.asarray(numpy.equal(values, self._value), dtype=bool))
+            )
+        if _is_array(values):
+            return super().test_many(values)
+        _value = self._value
+        return _record_many(self, [bool(value == _value) for value in values])
 
 
 class NotEqualsPredicate(ValuedPredicate[_T], Generic[_T]):
     def test(self, value: _T) -> bool:
-        return value != self._value
+        result = value != self._value
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        if self._is_vectorizable(values):
+            numpy = _numpy()
+            return _record_many(
+                self, _mask(numpy.asarray(numpy.not_equal(values, self._value), dtype=bool))
+            )
+        if _is_array(values):
+            return super().test_many(values)
+        _value = self._value
+        return _record_many(self, [bool(value != _value) for value in values])
 
 
 NonePredicate = IdentityPredicate(None)
@@ -194,19 +575,181 @@ NoneIsTruePredicate = NonePredicate
 NoneIsFalsePredicate = NotPredicate(NonePredicate)
 
 
-class IterableValuedPredicate(Predicate[_T], Generic[_T], ABC):
+@dataclasses.dataclass
+class MembershipStatistics:
+    tests: int = 0
+    hits: int = 0
+
+    def hit_rate(self) -> float:
+        return self.hits / self.tests if self.tests else 0.0
+
+
+class IterableValuedPredicate(BatchPredicate[_T], Generic[_T], ABC):
+    """
+    Base of the predicates that test the membership of a value in a collection. The iterable
+    is consumed once and snapshotted: into a frozenset if its elements are hashable, otherwise
+    into a sorted list searched with bisect if they are bytes-like, otherwise into a tuple that
+    is scanned. Changes made to the iterable after the predicate is created are not seen.
+
+    Strings, bytes, ranges and frozensets are immutable and kept as they are, so that their own
+    `in` is used: a substring test for strings and bytes, an arithmetic test for ranges. A
+    bytearray is copied into bytes. Other sets, including views such as `dict.keys()`, are
+    snapshotted like any other iterable.
+    """
+
     def __init__(self, iterable: Iterable[_T]):
-        self._value_iterable: Iterable[_T] = iterable
+        self._values: Collection[_T] = _snapshot(iterable)
+        self._statistics = MembershipStatistics()
+        # NumPy kinds of the values, computed when a NumPy array is first tested
+        self._kinds: Optional[FrozenSet[str]] = None
+
+    def get_size(self) -> int:
+        return len(self._values)
+
+    def get_statistics(self) -> MembershipStatistics:
+        return dataclasses.replace(self._statistics)
+
+    def reset_statistics(self) -> None:
+        self._statistics = MembershipStatistics()
+
+    def _contains(self, value: _T) -> bool:
+        self._statistics.tests += 1
+        found = _contains(self._values, value)
+        if found:
+            self._statistics.hits += 1
+        return found
+
+    def _contains_many(self, values: Iterable[_T]) -> BooleanMask:
+        mask = self._isin(values)
+        if mask is None:
+            _values = self._values
+            mask = _test_each(lambda value: _contains(_values, value), values)
+        self._statistics.tests += len(mask)
+        self._statistics.hits += int(sum(mask))
+        return mask
+
+    def _isin(self, values: Iterable[_T]) -> Optional[BooleanMask]:
+        if not _is_array(values) or not isinstance(self._values, _SNAPSHOT_TYPES):
+            return None
+        if self._kinds is None:
+            numpy = _numpy()
+            self._kinds = (
+                frozenset(_kind(value) for value in self._values)
+                if all(numpy.isscalar(value) for value in self._values)
+                else frozenset("O")
+            )
+        if not _is_compatible(values, self._kinds):
+            return None
+        return _mask(_numpy().isin(values, list(self._values)))
 
 
 class InPredicate(IterableValuedPredicate[_T], Generic[_T]):
     def test(self, value: _T) -> bool:
-        return value in self._value_iterable
+        result = self._contains(value)
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        return _record_many(self, self._contains_many(values))
 
 
-class NotInPredicate(Predicate[_T], Generic[_T]):
-    def __init__(self, value: Iterable[_T]):
-        self._value_iterable: Iterable[_T] = value
+class NotInPredicate(IterableValuedPredicate[_T], Generic[_T]):
+    def __init__(self, value: Iterable[_T]):  # pylint: disable=W0246
+        super().__init__(value)
 
     def test(self, value: _T) -> bool:
-        return value not in self._value_iterable
+        result = not self._contains(value)
+        return result if self._instrument is None else _record(self, result)
+
+    def test_many(self, values: Iterable[_T]) -> BooleanMask:
+        mask = self._contains_many(values)
+        if _is_array(mask):
+            return _record_many(self, _mask(_numpy().logical_not(mask)))
+        return _record_many(self, [not found for found in mask])
+
+
+def _record(predicate: Instrumented, result: bool) -> bool:
+    instrument = predicate._instrument  # pylint: disable=W0212
+    if instrument is not None:
+        instrument.increment(PREDICATE_EVALUATIONS, predicate)
+        if not result:
+            instrument.increment(REJECTIONS, predicate)
+    return result
+
+
+def _record_many(predicate: Instrumented, mask: BooleanMask) -> BooleanMask:
+    instrument = predicate._instrument  # pylint: disable=W0212
+    if instrument is not None:
+        instrument.increment(PREDICATE_EVALUATIONS, predicate, len(mask))
+        rejections = len(mask) - int(sum(mask))
+        if rejections:
+            instrument.increment(REJECTIONS, predicate, rejections)
+    return mask
+
+
+def _snapshot(iterable: Iterable[_T]) -> Collection[_T]:
+    if isinstance(iterable, _CONTAINER_TYPES):
+        return iterable
+    if isinstance(iterable, bytearray):
+        return typing.cast(Collection[_T], bytes(iterable))
+    values = tuple(iterable)
+    try:
+        return frozenset(values)
+    except TypeError:
+        pass
+    # Hashable values are in a frozenset already. Bytearrays are the only unhashable values
+    # known to be totally ordered: sets, for example, are only partially ordered.
+    if all(isinstance(value, (bytes, bytearray)) for value in values):
+        return sorted(typing.cast(Tuple[Any, ...], values))
+    return values
+
+
+def _contains(values: Collection[_T], value: _T) -> bool:
+    try:
+        if isinstance(values, range):
+            return _in_range(values, value)
+        if isinstance(values, list):
+            position = bisect.bisect_left(values, value)
+            return position < len(values) and values[position] == value
+        return value in values
+    except TypeError:
+        # An unhashable value, or a value that cannot be ordered with the elements, can still
+        # be equal to one of them.
+        return any(element == value for element in values)
+
+
+def _in_range(values: range, value: Any) -> bool:
+    # A range computes the membership of an int, but scans all its elements for other types,
+    # such as NumPy integers and floats. Only numbers can be equal to its elements.
+    try:
+        return operator.index(value) in values
+    except TypeError:
+        pass
+    if isinstance(value, numbers.Real):
+        return math.isfinite(value) and math.floor(value) == value and math.floor(value) in values
+    if isinstance(value, numbers.Complex):
+        return not value.imag and _in_range(values, value.real)
+    return False
+
+
+def _all_mask(predicates: Iterable[Predicate[_T]], values: Any) -> BooleanMask:
+    numpy = _numpy()
+    mask = numpy.ones(len(values), dtype=bool)
+    for predicate in predicates:
+        # Only test the values that have passed all the predicates so far
+        remaining = numpy.flatnonzero(mask)
+        if remaining.size == 0:
+            break
+        mask[remaining] = test_many(predicate, values[remaining])
+    return _mask(mask)
+
+
+def _any_mask(predicates: Iterable[Predicate[_T]], values: Any) -> BooleanMask:
+    numpy = _numpy()
+    mask = numpy.zeros(len(values), dtype=bool)
+    for predicate in predicates:
+        # Only test the values that have not passed any predicate so far
+        remaining = numpy.flatnonzero(~mask)
+        if remaining.size == 0:
+            break
+        mask[remaining] = test_many(predicate, values[remaining])
+    return _mask(mask)
@@ -0,0 +1,422 @@
+"""
+Opt-in metrics of the maps and the predicates: lookups, misses, sets and iterations of the maps,
+factory latency of LazyMap, and evaluations and rejections of the predicates and of
+PredicatedMap. A miss is a lookup of a key that is not in the map, or for LazyMap a value
+created by its factories.
+
+Nothing is recorded by default, and an uninstrumented map only pays for one attribute lookup per
+instrumented operation. Instrumentation is enabled for every map with `enable`, for the code
+running in a block with `profile`, or for a single map with `instrument`, and the metrics are
+sent to a Sink: an InMemorySink aggregates them, a LoggingSink logs them and a
+PrometheusFileSink writes them to a file in the Prometheus text format. Metrics are labelled
+with the class of the map, or with the name the map was instrumented with.
+"""
+# The instrument of the collections is set on them and on their base class from this module
+# pylint: disable=W0212
+from __future__ import annotations
+
+import abc
+import bisect
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from pycommons.collections.instrumented import (
+    BULK_FACTORY_SECONDS,
+    FACTORY_SECONDS,
+    GETS,
+    ITERATIONS,
+    MISSES,
+    PREDICATE_EVALUATIONS,
+    REJECTIONS,
+    SETS,
+    Instrumented,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import logging
+
+__all__ = [
+    "BULK_FACTORY_SECONDS",
+    "FACTORY_SECONDS",
+    "GETS",
+    "ITERATIONS",
+    "LATENCY_BUCKETS",
+    "MISSES",
+    "PREDICATE_EVALUATIONS",
+    "REJECTIONS",
+    "SETS",
+    "Histogram",
+    "InMemorySink",
+    "Instrumented",
+    "LoggingSink",
+    "PrometheusFileSink",
+    "Sink",
+    "disable",
+    "enable",
+    "instrument",
+    "is_enabled",
+    "profile",
+    "uninstrument",
+]
+
+_T = TypeVar("_T")
+_S = TypeVar("_S", bound="Sink")
+
+LATENCY_BUCKETS: Tuple[float, ...] = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+
+class Sink(abc.ABC):
+    """
+    Receives the metrics of instrumented collections. `source` is the label of the collection
+    that recorded the metric. Sinks may be called from many threads at once.
+    """
+
+    @abc.abstractmethod
+    def increment(self, metric: str, source: str, amount: int = 1) -> None:
+        ...
+
+    @abc.abstractmethod
+    def observe(self, metric: str, source: str, seconds: float) -> None:
+        ...
+
+    def flush(self) -> None:
+        """
+        Export the metrics recorded so far. Called when a `profile` block exits.
+        """
+
+
+class Histogram:
+    """
+    Distribution of durations over fixed buckets. `counts[i]` is the number of durations lower
+    than or equal to `bounds[i]` and greater than the previous bound, and the last count is the
+    number of durations greater than all the bounds.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def cumulative_counts(self) -> List[int]:
+        cumulative = []
+        count = 0
+        for bucket_count in self.counts:
+            count += bucket_count
+            cumulative.append(count)
+        return cumulative
+
+
+class InMemorySink(Sink):
+    """
+    Aggregates the metrics in memory: counters and latency histograms per metric and source.
+    """
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self._bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def increment(self, metric: str, source: str, amount: int = 1) -> None:
+        key = (metric, source)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, metric: str, source: str, seconds: float) -> None:
+        key = (metric, source)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._bounds)
+            histogram.observe(seconds)
+
+    def counter(self, metric: str, source: Optional[str] = None) -> int:
+        """
+        Args:
+            metric: Name of the counter.
+            source: Label of a collection, or None for the total of all the collections.
+
+        Returns:
+            The value of the counter
+        """
+        with self._lock:
+            return sum(
+                count
+                for (_metric, _source), count in self._counters.items()
+                if _metric == metric and source in (None, _source)
+            )
+
+    def histogram(self, metric: str, source: Optional[str] = None) -> Histogram:
+        """
+        Args:
+            metric: Name of the histogram.
+            source: Label of a collection, or None for the durations of all the collections.
+
+        Returns:
+            A copy of the histogram
+        """
+        merged = Histogram(self._bounds)
+        with self._lock:
+            for (_metric, _source), histogram in self._histograms.items():
+                if _metric == metric and source in (None, _source):
+                    merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                    merged.count += histogram.count
+                    merged.total += histogram.total
+        return merged
+
+    def counters(self) -> Dict[Tuple[str, str], int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def histograms(self) -> Dict[Tuple[str, str], Histogram]:
+        with self._lock:
+            keys = list(self._histograms)
+        return {key: self.histogram(*key) for key in keys}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class LoggingSink(Sink):
+    """
+    Logs every metric as it is recorded, at DEBUG level by default.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: Optional[int] = None):
+        # logging is only imported by the applications that log the metrics
+        import logging  # pylint: disable=C0415
+
+        self._logger = logger or logging.getLogger(__name__)
+        self._level = logging.DEBUG if level is None else level
+
+    def increment(self, metric: str, source: str, amount: int = 1) -> None:
+        if self._logger.isEnabledFor(self._level):
+            self._logger.log(self._level, "%s %s +%d", source, metric, amount)
+
+    def observe(self, metric: str, source: str, seconds: float) -> None:
+        if self._logger.isEnabledFor(self._level):
+            self._logger.log(self._level, "%s %s %.9f", source, metric, seconds)
+
+
+class PrometheusFileSink(InMemorySink):
+    """
+    An InMemorySink that writes the aggregated metrics to a file in the Prometheus text
+    exposition format on `flush`, e.g. for the textfile collector of the node exporter.
+    Counters are named `<prefix>_<metric>_total` and histograms `<prefix>_<metric>`, labelled
+    with `source`. The file is replaced atomically.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        prefix: str = "pycommons_collections",
+        bounds: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(bounds)
+        self._path = path
+        self._prefix = prefix
+
+    def render(self) -> str:
+        lines: List[str] = []
+        counters = self.counters()
+        for metric in sorted({metric for metric, _ in counters}):
+            name = f"{self._prefix}_{metric}_total"
+            lines.append(f"# TYPE {name} counter")
+            for (_metric, source), count in sorted(counters.items()):
+                if _metric == metric:
+                    lines.append(f"{name}{{source={_label(source)}}} {count}")
+
+        histograms = self.histograms()
+        for metric in sorted({metric for metric, _ in histograms}):
+            name = f"{self._prefix}_{metric}"
+            lines.append(f"# TYPE {name} histogram")
+            for (_metric, source), histogram in sorted(histograms.items()):
+                if _metric != metric:
+                    continue
+                label = _label(source)
+                bounds = [repr(bound) for bound in histogram.bounds] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.cumulative_counts()):
+                    lines.append(f'{name}_bucket{{source={label},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{source={label}}} {histogram.total!r}")
+                lines.append(f"{name}_count{{source={label}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        temporary_path = f"{os.fspath(self._path)}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temporary_path, self._path)
+
+
+def _label(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+class _Instrument:
+    __slots__ = ("sink", "name")
+
+    def __init__(self, sink: Sink, name: Optional[str] = None):
+        self.sink = sink
+        self.name = name
+
+    def increment(self, metric: str, owner: object, amount: int = 1) -> None:
+        self.sink.increment(metric, self.name or owner.__class__.__name__, amount)
+
+    def timed(self, metric: str, owner: object, function: Callable[..., _T], *args: Any) -> _T:
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.sink.observe(
+                metric, self.name or owner.__class__.__name__, time.perf_counter() - start
+            )
+
+
+class _ContextInstrument(_Instrument):
+    # Records to the instrument of the profile block running in the current context, or else to
+    # the enabled instrument
+    __slots__ = ()
+
+    def __init__(self) -> None:  # pylint: disable=W0231
+        pass
+
+    def increment(self, metric: str, owner: object, amount: int = 1) -> None:
+        _instrument = _profiled.get() or _enabled
+        if _instrument is not None:
+            _instrument.increment(metric, owner, amount)
+
+    def timed(self, metric: str, owner: object, function: Callable[..., _T], *args: Any) -> _T:
+        _instrument = _profiled.get() or _enabled
+        if _instrument is None:
+            return function(*args)
+        return _instrument.timed(metric, owner, function, *args)
+
+
+_context_instrument = _ContextInstrument()
+_lock = threading.Lock()
+_enabled: Optional[_Instrument] = None
+_profiled: contextvars.ContextVar[Optional[_Instrument]] = contextvars.ContextVar(
+    "_profiled", default=None
+)
+_profiles = 0
+
+
+def _update() -> None:
+    # Called with _lock held
+    Instrumented._instrument = _context_instrument if _enabled is not None or _profiles else None
+
+
+def enable(sink: Sink) -> None:
+    """
+    Send the metrics of every collection that is not instrumented on its own, and is not used in
+    a `profile` block, to the sink.
+    """
+    global _enabled  # pylint: disable=W0603
+    with _lock:
+        _enabled = _Instrument(sink)
+        _update()
+
+
+def disable() -> None:
+    global _enabled  # pylint: disable=W0603
+    with _lock:
+        _enabled = None
+        _update()
+
+
+def is_enabled() -> bool:
+    """
+    Returns:
+        True if instrumentation is enabled, or a `profile` block runs in the current context
+    """
+    return _enabled is not None or _profiled.get() is not None
+
+
+def instrument(target: Instrumented, sink: Sink, name: Optional[str] = None) -> None:
+    """
+    Send the metrics of a collection to the sink, whether instrumentation is enabled or not.
+
+    Args:
+        target: Collection to be instrumented.
+        sink: Sink receiving the metrics of the collection.
+        name: Label of the metrics, the class name of the collection by default.
+    """
+    target._instrument = _Instrument(sink, name)
+
+
+def uninstrument(target: Instrumented) -> None:
+    vars(target).pop("_instrument", None)
+
+
+@overload
+def profile() -> ContextManager[InMemorySink]:
+    ...
+
+
+@overload
+def profile(sink: _S) -> ContextManager[_S]:
+    ...
+
+
+@contextlib.contextmanager  # type: ignore[misc]
+def profile(sink: Optional[Sink] = None) -> Iterator[Sink]:
+    """
+    Send the metrics of the collections used by the code running in the block to the sink, and
+    flush the sink when it exits. Only the current context is profiled: blocks running at the
+    same time in other threads or asyncio tasks have their own sinks, and the threads started in
+    the block are not profiled unless they run in a copy of its context
+    (`contextvars.copy_context`). The metrics of a nested block only go to its own sink.
+
+        with profile() as metrics:
+            ...
+        print(metrics.counter(MISSES))
+
+    Args:
+        sink: Sink receiving the metrics of the block, a new InMemorySink by default.
+    """
+    global _profiles  # pylint: disable=W0603
+    _sink = sink if sink is not None else InMemorySink()
+    token = _profiled.set(_Instrument(_sink))
+    with _lock:
+        _profiles += 1
+        _update()
+    try:
+        yield _sink
+    finally:
+        _profiled.reset(token)
+        with _lock:
+            _profiles -= 1
+            _update()
+        _sink.flush()
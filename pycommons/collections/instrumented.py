@@ -0,0 +1,31 @@
+"""
+The names of the metrics and the base of the instrumented collections. They are kept apart from
+`instrumentation`, which sets the instrument of the collections, so that importing a collection
+does not import the sinks and the threading, contextvars and bisect modules they use.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pycommons.collections.instrumentation import _Instrument
+
+GETS = "gets"
+MISSES = "misses"
+SETS = "sets"
+ITERATIONS = "iterations"
+PREDICATE_EVALUATIONS = "predicate_evaluations"
+REJECTIONS = "rejections"
+FACTORY_SECONDS = "factory_seconds"
+BULK_FACTORY_SECONDS = "bulk_factory_seconds"
+
+
+class Instrumented:
+    """
+    Base of the collections that can be instrumented. `_instrument` is looked up on the instance
+    first, where `instrument` sets it, and then on this class, where it is set while
+    instrumentation is enabled or a `profile` block runs in any thread, so that the collections
+    only look up the sink of the current context then.
+    """
+
+    _instrument: Optional[_Instrument] = None
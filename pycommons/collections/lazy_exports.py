@@ -0,0 +1,40 @@
+"""
+Lazy exports of the packages (PEP 562): the names exported by a package are imported from their
+module the first time they are read, so importing a package, or one of its modules, does not
+import all of its modules.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    namespace: Dict[str, Any], exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Create the module `__getattr__` and `__dir__` of a package.
+
+    Args:
+        namespace: The globals of the package.
+        exports: Module of every exported name, relative to the package.
+
+    Returns:
+        The `__getattr__` and `__dir__` functions of the package
+    """
+    package: str = namespace["__name__"]
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module, package), name)
+        # Cached in the package, __getattr__ is not called for it again
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
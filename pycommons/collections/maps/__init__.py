@@ -1,7 +1,64 @@
-from .defaulted import DefaultedMap
-from .iterable import IterableMap, ItemsIterator
-from .lazy import LazyMap, LazyOrderedMap
-from .multi_valued import MultiValuedMap
-from .ordered import OrderedMap
-from .sized import FixedSizeMap, SingletonMap
-from .unmodifiable import UnmodifiableMap, UnmodifiableLateInitMap, UnmodifiableItemsIterator
+from typing import TYPE_CHECKING
+
+from pycommons.collections.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .async_lazy import AsyncLazyMap
+    from .concurrent import ConcurrentMap
+    from .defaulted import DefaultedMap
+    from .evicting import EvictingMap, EvictionStatistics, FIFOMap, LFUMap, LRUMap, TTLMap
+    from .frozen import FrozenMap
+    from .indexed import IndexedMap
+    from .iterable import IterableMap, ItemsIterator, MapCursor
+    from .lazy import LazyMap, LazyOrderedMap, ConcurrentLazyMap
+    from .memory_mapped import MemoryMappedMap
+    from .multi_valued import MultiValuedMap, CompactMultiValuedMap, ColumnarMultiValuedMap
+    from .ordered import OrderedMap
+    from .persistent import PersistentMap, PersistentMapBuilder
+    from .sized import FixedSizeMap, SingletonMap
+    from .sorted import SortedMap, SortedMapView
+    from .unmodifiable import (
+        UnmodifiableMap,
+        UnmodifiableLateInitMap,
+        UnmodifiableItemsIterator,
+        UnmodifiableMapCursor,
+    )
+
+# The maps are imported from their module when they are first used
+_EXPORTS = {
+    "AsyncLazyMap": ".async_lazy",
+    "ConcurrentMap": ".concurrent",
+    "DefaultedMap": ".defaulted",
+    "EvictingMap": ".evicting",
+    "EvictionStatistics": ".evicting",
+    "FIFOMap": ".evicting",
+    "LFUMap": ".evicting",
+    "LRUMap": ".evicting",
+    "TTLMap": ".evicting",
+    "FrozenMap": ".frozen",
+    "IndexedMap": ".indexed",
+    "IterableMap": ".iterable",
+    "ItemsIterator": ".iterable",
+    "MapCursor": ".iterable",
+    "LazyMap": ".lazy",
+    "LazyOrderedMap": ".lazy",
+    "ConcurrentLazyMap": ".lazy",
+    "MemoryMappedMap": ".memory_mapped",
+    "MultiValuedMap": ".multi_valued",
+    "CompactMultiValuedMap": ".multi_valued",
+    "ColumnarMultiValuedMap": ".multi_valued",
+    "OrderedMap": ".ordered",
+    "PersistentMap": ".persistent",
+    "PersistentMapBuilder": ".persistent",
+    "FixedSizeMap": ".sized",
+    "SingletonMap": ".sized",
+    "SortedMap": ".sorted",
+    "SortedMapView": ".sorted",
+    "UnmodifiableMap": ".unmodifiable",
+    "UnmodifiableLateInitMap": ".unmodifiable",
+    "UnmodifiableItemsIterator": ".unmodifiable",
+    "UnmodifiableMapCursor": ".unmodifiable",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import time
+import typing
+from typing import (
+    TypeVar,
+    Generic,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+)
+
+from pycommons.collections.instrumented import GETS, MISSES, SETS
+from pycommons.collections.maps.iterable import IterableMap
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+AsyncFactory = Callable[[_K], Awaitable[_V]]
+AsyncBatchFactory = Callable[[List[_K]], Awaitable[Mapping[_K, _V]]]
+
+
+class AsyncLazyMap(IterableMap[_K, _V], Generic[_K, _V]):  # pylint: disable=R0902
+    """
+    A lazy map for asyncio code, whose values are created by awaiting a coroutine function.
+
+    `await m.get(key)` returns the cached value or loads it. Concurrent loads of the same key
+    share one in-flight task, and cancelling one caller does not cancel the load for the others.
+    `await m.get_many(keys)` queues the missing keys and, if a `batch_factory` is given, loads
+    all the keys queued during the same event loop iteration with a single call to it. Keys
+    missing from the batch result are loaded with `factory`.
+
+    With `max_size` the least recently used value is dropped to make room for a new one, and with
+    `ttl` values are dropped that many seconds after they were loaded. Subscripting the map
+    never loads, it only returns values that are already cached.
+    """
+
+    data: typing.OrderedDict[_K, _V]
+
+    def __init__(
+        self,
+        factory: AsyncFactory[_K, _V],
+        *args: Any,
+        batch_factory: Optional[AsyncBatchFactory[_K, _V]] = None,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        **kwargs: Any,
+    ):
+        if max_size is not None and max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+
+        self._factory = factory
+        self._batch_factory = batch_factory
+        self._max_size = max_size
+        self._ttl = ttl
+        self._expiry: Dict[_K, float] = {}
+        self._in_flight: Dict[_K, asyncio.Future[_V]] = {}
+        self._pending_batch: Dict[_K, asyncio.Future[_V]] = {}
+        self._batch_tasks: Set[asyncio.Future[None]] = set()
+        super().__init__()
+
+        self.data = collections.OrderedDict()
+        self.update(*args, **kwargs)
+
+    async def get(self, key: _K) -> _V:  # type: ignore[override]
+        if self._lookup(key):
+            return self.data[key]
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = self._track(key, asyncio.ensure_future(self._load(key)))
+        return await asyncio.shield(future)
+
+    async def get_many(self, keys: Iterable[_K]) -> Dict[_K, _V]:
+        _keys = list(keys)
+        # The cached values are read before awaiting the others, loading them can evict them
+        values: Dict[_K, _V] = {}
+        futures: Dict[_K, asyncio.Future[_V]] = {}
+        for key in dict.fromkeys(_keys):
+            if self._lookup(key):
+                values[key] = self.data[key]
+                continue
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._enqueue(key)
+            futures[key] = future
+
+        if futures:
+            await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+            for key, future in futures.items():
+                values[key] = future.result()
+
+        return {key: values[key] for key in _keys}
+
+    def __getitem__(self, key: _K) -> _V:
+        if not self._lookup(key):
+            raise KeyError(key)
+        return self.data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return self._is_cached(typing.cast(_K, key))
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        if key in self.data:
+            self.data.move_to_end(key)
+        elif self._max_size is not None and len(self.data) >= self._max_size:
+            self._expiry.pop(self.data.popitem(last=False)[0], None)
+
+        self.data[key] = value
+        if self._ttl is not None:
+            self._expiry[key] = time.monotonic() + self._ttl
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self)
+
+    def __delitem__(self, key: _K) -> None:
+        del self.data[key]
+        self._expiry.pop(key, None)
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._expiry.clear()
+
+    def _lookup(self, key: _K) -> bool:
+        cached = self._is_cached(key)
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(GETS, self)
+            if not cached:
+                instrument.increment(MISSES, self)
+        return cached
+
+    def _is_cached(self, key: _K) -> bool:
+        if key not in self.data:
+            return False
+
+        if self._ttl is not None and self._expiry[key] <= time.monotonic():
+            del self[key]
+            return False
+
+        if self._max_size is not None:
+            self.data.move_to_end(key)
+        return True
+
+    async def _load(self, key: _K) -> _V:
+        value = await self._factory(key)
+        self[key] = value
+        return value
+
+    def _track(self, key: _K, future: asyncio.Future[_V]) -> asyncio.Future[_V]:
+        def _done(_future: asyncio.Future[_V]) -> None:
+            if self._in_flight.get(key) is _future:
+                del self._in_flight[key]
+            if not _future.cancelled():
+                # Mark the exception as retrieved, the callers awaiting the future get it.
+                _future.exception()
+
+        self._in_flight[key] = future
+        future.add_done_callback(_done)
+        return future
+
+    def _enqueue(self, key: _K) -> asyncio.Future[_V]:
+        if self._batch_factory is None:
+            return self._track(key, asyncio.ensure_future(self._load(key)))
+
+        loop = asyncio.get_running_loop()
+        if not self._pending_batch:
+            loop.call_soon(self._dispatch_batch)
+
+        future: asyncio.Future[_V] = loop.create_future()
+        self._pending_batch[key] = future
+        return self._track(key, future)
+
+    def _dispatch_batch(self) -> None:
+        batch, self._pending_batch = self._pending_batch, {}
+        task = asyncio.ensure_future(self._load_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _load_batch(self, batch: Dict[_K, asyncio.Future[_V]]) -> None:
+        try:
+            await self._resolve_batch(batch)
+        finally:
+            # If the task is cancelled or fails midway, no waiter is left on an unresolved future.
+            for future in batch.values():
+                if not future.done():
+                    future.cancel()
+
+    async def _resolve_batch(self, batch: Dict[_K, asyncio.Future[_V]]) -> None:
+        batch_factory = typing.cast(AsyncBatchFactory[_K, _V], self._batch_factory)
+        try:
+            values = await batch_factory(list(batch))
+        except Exception as exc:  # pylint: disable=broad-except
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        missing = [key for key in batch if key not in values]
+        fallback = await asyncio.gather(
+            *(self._factory(key) for key in missing), return_exceptions=True
+        )
+        failures: Dict[_K, BaseException] = {}
+        loaded: Dict[_K, _V] = dict(values)
+        for key, value in zip(missing, fallback):
+            if isinstance(value, BaseException):
+                failures[key] = value
+            else:
+                loaded[key] = value
+
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if key in failures:
+                future.set_exception(failures[key])
+            else:
+                self[key] = loaded[key]
+                future.set_result(loaded[key])
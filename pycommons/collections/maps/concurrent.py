@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import threading
+import typing
+from typing import (
+    TypeVar,
+    Generic,
+    Any,
+    Callable,
+    Dict,
+    ItemsView,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    ValuesView,
+)
+
+from pycommons.base.function import Function
+
+from pycommons.collections.instrumented import GETS, MISSES
+from pycommons.collections.maps.iterable import IterableMap, ItemsIterator, MapCursor
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_MISSING: Any = object()
+
+
+class _Segment(Generic[_K, _V]):
+    __slots__ = ("entries", "lock")
+
+    def __init__(self) -> None:
+        self.entries: Dict[_K, _V] = {}
+        self.lock = threading.RLock()
+
+
+class _SegmentedDict(MutableMapping[_K, _V], Generic[_K, _V]):
+    """
+    The backing mapping of a ConcurrentMap: the entries are spread over dicts, each guarded by
+    its own lock, by the hash of their key. Writes lock the segment of the key, reads do not
+    lock. Iterating copies one segment at a time, under its lock, so it never blocks all the
+    writers and never fails because of a concurrent write.
+    """
+
+    __slots__ = ("segments", "_mask")
+
+    def __init__(self, concurrency_level: int):
+        count = 1
+        while count < concurrency_level:
+            count <<= 1
+        self.segments: List[_Segment[_K, _V]] = [_Segment() for _ in range(count)]
+        self._mask = count - 1
+
+    def segment(self, key: object) -> _Segment[_K, _V]:
+        return self.segments[hash(key) & self._mask]
+
+    def __getitem__(self, key: _K) -> _V:
+        return self.segment(key).entries[key]
+
+    def get(self, key: _K, default: Any = None) -> Any:
+        return self.segment(key).entries.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.segment(key).entries
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        segment = self.segment(key)
+        with segment.lock:
+            segment.entries[key] = value
+
+    def __delitem__(self, key: _K) -> None:
+        segment = self.segment(key)
+        with segment.lock:
+            del segment.entries[key]
+
+    def __len__(self) -> int:
+        return sum(len(segment.entries) for segment in self.segments)
+
+    def __iter__(self) -> Iterator[_K]:
+        return (key for key, _ in self.iterate())
+
+    def iterate(self) -> Iterator[Tuple[_K, _V]]:
+        for segment in self.segments:
+            with segment.lock:
+                entries = list(segment.entries.items())
+            yield from entries
+
+    def items(self) -> ItemsView[_K, _V]:
+        return _ItemsView(self)
+
+    def values(self) -> ValuesView[_V]:
+        return _ValuesView(self)
+
+    def clear(self) -> None:
+        for segment in self.segments:
+            with segment.lock:
+                segment.entries.clear()
+
+    def copy(self) -> Dict[_K, _V]:
+        return dict(self.iterate())
+
+
+class _ItemsView(ItemsView[_K, _V], Generic[_K, _V]):
+    _mapping: _SegmentedDict[_K, _V]
+
+    def __iter__(self) -> Iterator[Tuple[_K, _V]]:
+        return self._mapping.iterate()
+
+
+class _ValuesView(ValuesView[_V], Generic[_V]):
+    _mapping: _SegmentedDict[Any, _V]
+
+    def __iter__(self) -> Iterator[_V]:
+        return (value for _, value in self._mapping.iterate())
+
+
+class ConcurrentMap(IterableMap[_K, _V], Generic[_K, _V]):
+    """
+    A thread safe IterableMap. The entries are split into `concurrency_level` segments (rounded
+    up to a power of 2), each with its own lock, so writers of keys in different segments do
+    not wait for each other.
+
+    `put_if_absent`, `setdefault`, `pop`, `popitem`, `compute_if_absent`, `compute_if_present`
+    and `merge` are atomic: they lock the segment of the key. The functions of the last three
+    are called under this lock, so they should be short and must not modify other keys of the
+    map from another thread. The lock is reentrant, so the function can read the map.
+
+    Iteration is weakly consistent: it does not block the writers, never raises because of a
+    concurrent write, returns every entry that was in the map when it started and was not
+    removed since, and may or may not return the entries that were changed during it.
+    """
+
+    data: _SegmentedDict[_K, _V]  # type: ignore[assignment]
+
+    def __init__(self, *args: Any, concurrency_level: int = 16, **kwargs: Any):
+        if concurrency_level <= 0:
+            raise ValueError("concurrency_level must be greater than 0")
+
+        super().__init__()
+        self.data = _SegmentedDict(concurrency_level)
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key: _K) -> _V:
+        value = self._get(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return typing.cast(_V, value)
+
+    def get(self, key: _K, default: Optional[_V] = None) -> Optional[_V]:  # type: ignore
+        value = self._get(key)
+        return default if value is _MISSING else typing.cast(_V, value)
+
+    def _get(self, key: _K) -> Any:
+        value = self.data.get(key, _MISSING)
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(GETS, self)
+            if value is _MISSING:
+                instrument.increment(MISSES, self)
+        return value
+
+    def put_if_absent(self, key: _K, value: _V) -> Optional[_V]:
+        """
+        Set the value of the key if the key is not in the map.
+
+        Args:
+            key: Key of the entry.
+            value: Value to be set.
+
+        Returns:
+            The current value of the key, or None if the value was set
+        """
+        segment = self.data.segment(key)
+        with segment.lock:
+            current = segment.entries.get(key, _MISSING)
+            if current is _MISSING:
+                segment.entries[key] = value
+                return None
+        return typing.cast(_V, current)
+
+    def setdefault(self, key: _K, default: Optional[_V] = None) -> Optional[_V]:
+        segment = self.data.segment(key)
+        with segment.lock:
+            return segment.entries.setdefault(key, default)  # type: ignore
+
+    def pop(self, key: _K, default: Any = _MISSING) -> Any:
+        segment = self.data.segment(key)
+        with segment.lock:
+            if default is _MISSING:
+                return segment.entries.pop(key)
+            return segment.entries.pop(key, default)
+
+    def compute_if_absent(self, key: _K, function: Function[_K, _V]) -> _V:
+        """
+        Compute and set the value of the key if the key is not in the map. The function is
+        called at most once per missing key, even when many threads ask for the key at once.
+
+        Args:
+            key: Key of the entry.
+            function: Function computing the value from the key.
+
+        Returns:
+            The current value or the computed value of the key
+        """
+        segment = self.data.segment(key)
+        current = segment.entries.get(key, _MISSING)
+        if current is not _MISSING:
+            return typing.cast(_V, current)
+
+        with segment.lock:
+            current = segment.entries.get(key, _MISSING)
+            if current is _MISSING:
+                current = segment.entries[key] = function.apply(key)
+        return typing.cast(_V, current)
+
+    def compute_if_present(
+        self, key: _K, function: Callable[[_K, _V], Optional[_V]]
+    ) -> Optional[_V]:
+        """
+        Compute a new value of the key from its current value if the key is in the map. The key
+        is removed if the function returns None.
+
+        Args:
+            key: Key of the entry.
+            function: Function computing the new value from the key and the current value.
+
+        Returns:
+            The new value of the key, or None if the key is not in the map anymore
+        """
+        segment = self.data.segment(key)
+        with segment.lock:
+            current = segment.entries.get(key, _MISSING)
+            if current is _MISSING:
+                return None
+            return self._set_or_remove(segment, key, function(key, current))
+
+    def merge(self, key: _K, value: _V, function: Callable[[_V, _V], Optional[_V]]) -> Optional[_V]:
+        """
+        Set the value of the key if the key is not in the map, otherwise set it to the result of
+        the function on the current value and the value. The key is removed if the function
+        returns None.
+
+        Args:
+            key: Key of the entry.
+            value: Value to be set or merged with the current value.
+            function: Function merging the current value and the value.
+
+        Returns:
+            The new value of the key, or None if the key is not in the map anymore
+        """
+        segment = self.data.segment(key)
+        with segment.lock:
+            current = segment.entries.get(key, _MISSING)
+            if current is _MISSING:
+                segment.entries[key] = value
+                return value
+            return self._set_or_remove(segment, key, function(current, value))
+
+    def items_iterator(self) -> ItemsIterator[_K, _V]:
+        return ItemsIterator(self.data, self.data.iterate())
+
+    def cursor_iterator(self) -> MapCursor[_K, _V]:
+        return MapCursor(self.data, self.data.iterate())
+
+    def items_tuple_iterator(self) -> Iterator[Tuple[_K, _V]]:
+        return self.data.iterate()
+
+    def contains_value(self, value: _V) -> bool:
+        for _, _value in self.data.iterate():
+            if value == _value:
+                return True
+        return False
+
+    def popitem(self) -> Tuple[_K, _V]:
+        for segment in self.data.segments:
+            with segment.lock:
+                if segment.entries:
+                    return segment.entries.popitem()
+        raise KeyError(f"popitem(): {self.__class__.__name__} is empty")
+
+    def copy(self) -> ConcurrentMap[_K, _V]:
+        return self.__class__(self.data.copy(), concurrency_level=len(self.data.segments))
+
+    def __copy__(self) -> ConcurrentMap[_K, _V]:
+        return self.copy()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.data.copy()!r})"
+
+    @staticmethod
+    def _set_or_remove(segment: _Segment[_K, _V], key: _K, value: Optional[_V]) -> Optional[_V]:
+        if value is None:
+            del segment.entries[key]
+        else:
+            segment.entries[key] = value
+        return value
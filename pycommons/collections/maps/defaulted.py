@@ -1,5 +1,6 @@
 from typing import TypeVar, Generic, Any
 
+from pycommons.collections.instrumented import GETS, MISSES
 from pycommons.collections.maps.iterable import IterableMap
 
 _K = TypeVar("_K")
@@ -12,4 +13,9 @@ class DefaultedMap(IterableMap[_K, _V], Generic[_K, _V]):
         super().__init__(*args, **kwargs)
 
     def __getitem__(self, item: _K) -> _V:
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(GETS, self)
+            if item not in self.data:
+                instrument.increment(MISSES, self)
         return self.data.get(item, self._default_value)
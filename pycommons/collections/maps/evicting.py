@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import abc
+import collections
+import copy
+import dataclasses
+import time
+import typing
+from typing import TypeVar, Generic, Any, List, Dict, Iterable, Optional, Tuple
+
+from pycommons.base.function import BiConsumer, Supplier
+
+from pycommons.collections.instrumented import GETS, MISSES, SETS
+from pycommons.collections.maps.sized import BoundedMap
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+@dataclasses.dataclass
+class EvictionStatistics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def requests(self) -> int:
+        return self.hits + self.misses
+
+    def hit_rate(self) -> float:
+        requests = self.requests()
+        return self.hits / requests if requests else 0.0
+
+
+class EvictingMap(BoundedMap[_K, _V], abc.ABC, Generic[_K, _V]):
+    """
+    A BoundedMap that makes room for a new key by evicting an existing entry instead of
+    rejecting the write once the map is full. The entry to be evicted is chosen by the eviction
+    policy implemented by the subclass, in O(1).
+
+    Eviction listeners are notified with the key and the value of every evicted entry. Entries
+    removed explicitly (`del`, `pop`, `clear`) are not evictions.
+    """
+
+    data: typing.OrderedDict[_K, _V]
+
+    def __init__(self, size: int, *args: Any, **kwargs: Any):
+        if size <= 0:
+            raise ValueError(f"size must be greater than 0 for {self.__class__.__name__}")
+
+        self._max_size: int = size
+        self._eviction_listeners: List[BiConsumer[_K, _V]] = []
+        self._statistics = EvictionStatistics()
+        super().__init__()
+
+        self.data = collections.OrderedDict()
+        self.update(*args, **kwargs)
+
+    def is_full(self) -> bool:
+        return len(self.data) >= self._max_size
+
+    def max_size(self) -> int:
+        return self._max_size
+
+    def add_eviction_listener(self, listener: BiConsumer[_K, _V]) -> None:
+        self._eviction_listeners.append(listener)
+
+    def remove_eviction_listener(self, listener: BiConsumer[_K, _V]) -> None:
+        self._eviction_listeners.remove(listener)
+
+    def get_statistics(self) -> EvictionStatistics:
+        return dataclasses.replace(self._statistics)
+
+    def reset_statistics(self) -> None:
+        self._statistics = EvictionStatistics()
+
+    def __getitem__(self, key: _K) -> _V:
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(GETS, self)
+
+        if key in self.data:
+            self._statistics.hits += 1
+            self._on_access(key)
+            return self.data[key]
+
+        self._statistics.misses += 1
+        if instrument is not None:
+            instrument.increment(MISSES, self)
+        raise KeyError(key)
+
+    def get(self, key: _K, default: Optional[_V] = None) -> Optional[_V]:  # type: ignore
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        if key in self.data:
+            self.data[key] = value
+            self._on_update(key)
+        else:
+            if len(self.data) >= self._max_size:
+                self._evict(self._select_victim())
+
+            self.data[key] = value
+            self._on_insert(key)
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self)
+
+    def __delitem__(self, key: _K) -> None:
+        del self.data[key]
+        self._on_remove(key)
+
+    def extend(self, pairs: Iterable[Tuple[_K, _V]], chunk_size: int = 1024) -> None:
+        """
+        Add the (key, value) pairs one at a time, like `__setitem__`. Unlike
+        `IterableMap.extend`, the call is not atomic: the pairs added before an error are kept,
+        because the entries they evicted cannot be restored once the eviction listeners have
+        been notified. `chunk_size` is unused.
+
+        Args:
+            pairs: (key, value) pairs to be added.
+            chunk_size: Unused.
+        """
+        for key, value in pairs:
+            self[key] = value
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._on_clear()
+
+    def __copy__(self) -> EvictingMap[_K, _V]:
+        inst = self.__class__.__new__(self.__class__)
+        inst.__dict__.update(self.__dict__)
+        inst.data = self.data.copy()
+        inst._eviction_listeners = self._eviction_listeners.copy()
+        inst._statistics = dataclasses.replace(self._statistics)
+        return inst
+
+    def copy(self) -> EvictingMap[_K, _V]:
+        return copy.copy(self)
+
+    def _evict(self, key: _K) -> None:
+        value = self.data.pop(key)
+        self._on_remove(key)
+        self._statistics.evictions += 1
+
+        for listener in self._eviction_listeners:
+            listener.accept(key, value)
+
+    @abc.abstractmethod
+    def _select_victim(self) -> _K:
+        ...
+
+    def _on_insert(self, key: _K) -> None:
+        pass
+
+    def _on_update(self, key: _K) -> None:
+        pass
+
+    def _on_access(self, key: _K) -> None:
+        pass
+
+    def _on_remove(self, key: _K) -> None:
+        pass
+
+    def _on_clear(self) -> None:
+        pass
+
+
+class FIFOMap(EvictingMap[_K, _V], Generic[_K, _V]):
+    """
+    An EvictingMap that evicts the entry that was inserted first.
+    """
+
+    def _select_victim(self) -> _K:
+        return next(iter(self.data))
+
+
+class LRUMap(EvictingMap[_K, _V], Generic[_K, _V]):
+    """
+    An EvictingMap that evicts the least recently used entry. Both reads and writes count as a
+    use of the entry.
+    """
+
+    def _select_victim(self) -> _K:
+        return next(iter(self.data))
+
+    def _on_update(self, key: _K) -> None:
+        self.data.move_to_end(key)
+
+    def _on_access(self, key: _K) -> None:
+        self.data.move_to_end(key)
+
+
+class LFUMap(EvictingMap[_K, _V], Generic[_K, _V]):
+    """
+    An EvictingMap that evicts the least frequently used entry. Entries with the same frequency
+    are evicted in the order they reached that frequency.
+    """
+
+    def __init__(self, size: int, *args: Any, **kwargs: Any):
+        self._frequencies: Dict[_K, int] = {}
+        self._buckets: Dict[int, typing.OrderedDict[_K, None]] = {}
+        self._min_frequency: int = 0
+        super().__init__(size, *args, **kwargs)
+
+    def __copy__(self) -> LFUMap[_K, _V]:
+        inst = typing.cast(LFUMap[_K, _V], super().__copy__())
+        inst._frequencies = self._frequencies.copy()
+        inst._buckets = {frequency: keys.copy() for frequency, keys in self._buckets.items()}
+        return inst
+
+    def get_frequency(self, key: _K) -> int:
+        return self._frequencies.get(key, 0)
+
+    def _select_victim(self) -> _K:
+        if self._min_frequency not in self._buckets:
+            self._min_frequency = min(self._buckets)
+        return next(iter(self._buckets[self._min_frequency]))
+
+    def _on_insert(self, key: _K) -> None:
+        self._frequencies[key] = 1
+        self._buckets.setdefault(1, collections.OrderedDict())[key] = None
+        self._min_frequency = 1
+
+    def _on_update(self, key: _K) -> None:
+        self._increment(key)
+
+    def _on_access(self, key: _K) -> None:
+        self._increment(key)
+
+    def _on_remove(self, key: _K) -> None:
+        self._remove_from_bucket(key, self._frequencies.pop(key))
+
+    def _on_clear(self) -> None:
+        self._frequencies.clear()
+        self._buckets.clear()
+        self._min_frequency = 0
+
+    def _increment(self, key: _K) -> None:
+        frequency = self._frequencies[key]
+        self._remove_from_bucket(key, frequency)
+        if self._min_frequency == frequency and frequency not in self._buckets:
+            self._min_frequency = frequency + 1
+
+        self._frequencies[key] = frequency + 1
+        self._buckets.setdefault(frequency + 1, collections.OrderedDict())[key] = None
+
+    def _set_frequency(self, key: _K, frequency: int) -> None:
+        # Restores the frequency of a decoded entry
+        self._remove_from_bucket(key, self._frequencies[key])
+        self._frequencies[key] = frequency
+        self._buckets.setdefault(frequency, collections.OrderedDict())[key] = None
+        self._min_frequency = min(self._min_frequency, frequency)
+
+    def _remove_from_bucket(self, key: _K, frequency: int) -> None:
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+
+
+class TTLMap(EvictingMap[_K, _V], Generic[_K, _V]):
+    """
+    An EvictingMap whose entries expire `ttl` seconds after they were last written. Expired
+    entries are evicted lazily, when they are read or when the map is written to or sized. When
+    the map is full, the entry that was written the longest time ago is evicted.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        ttl: float,
+        *args: Any,
+        clock: Optional[Supplier[float]] = None,
+        **kwargs: Any,
+    ):
+        if ttl <= 0:
+            raise ValueError(f"ttl must be greater than 0 for {self.__class__.__name__}")
+
+        self._ttl: float = ttl
+        self._clock: Supplier[float] = clock or Supplier.of(time.monotonic)
+        self._expiry: Dict[_K, float] = {}
+        super().__init__(size, *args, **kwargs)
+
+    def __copy__(self) -> TTLMap[_K, _V]:
+        inst = typing.cast(TTLMap[_K, _V], super().__copy__())
+        inst._expiry = self._expiry.copy()
+        return inst
+
+    def ttl(self) -> float:
+        return self._ttl
+
+    def expire(self) -> int:
+        """
+        Evict all the entries that have expired.
+
+        Returns:
+            The number of entries evicted
+        """
+        now = self._clock.get()
+        expired = 0
+        while self.data:
+            key = next(iter(self.data))
+            if self._expiry[key] > now:
+                break
+            self._evict(key)
+            expired += 1
+        return expired
+
+    def is_full(self) -> bool:
+        self.expire()
+        return super().is_full()
+
+    def size(self) -> int:
+        self.expire()
+        return super().size()
+
+    def __len__(self) -> int:
+        self.expire()
+        return super().__len__()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data and not self._evict_if_expired(typing.cast(_K, key))
+
+    def __getitem__(self, key: _K) -> _V:
+        if key in self.data:
+            self._evict_if_expired(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        self.expire()
+        super().__setitem__(key, value)
+
+    def _evict_if_expired(self, key: _K) -> bool:
+        if self._expiry[key] <= self._clock.get():
+            self._evict(key)
+            return True
+        return False
+
+    def _select_victim(self) -> _K:
+        return next(iter(self.data))
+
+    def _on_insert(self, key: _K) -> None:
+        self._expiry[key] = self._clock.get() + self._ttl
+
+    def _on_update(self, key: _K) -> None:
+        self._expiry[key] = self._clock.get() + self._ttl
+        self.data.move_to_end(key)
+
+    def _on_remove(self, key: _K) -> None:
+        del self._expiry[key]
+
+    def _on_clear(self) -> None:
+        self._expiry.clear()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import TypeVar, Generic, Any, Dict, Iterable, Mapping, NoReturn, Optional, Tuple, Union
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+class FrozenMap(Dict[_K, _V], Generic[_K, _V]):
+    """
+    An immutable map. A FrozenMap is a dict whose mutators raise a TypeError, so reads and
+    iteration run at the speed of a plain dict, and it can be passed wherever a dict is
+    expected.
+
+    A FrozenMap is hashable if its values are, and caches its hash the first time it is
+    computed, so it can be used as a key of another map. `with_item` and `without_item` return
+    a new FrozenMap and leave this one untouched, copying the entries with a single C-level dict
+    copy, which is O(n). PersistentMap has the same methods, in O(log n) with structural
+    sharing, for maps that are derived from often.
+    """
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        # Calling __init__ again would change the entries, and leave the cached hash stale
+        if hasattr(self, "_hash"):
+            self._unsupported()
+        super().__init__(*args, **kwargs)
+        self._hash: Optional[int] = None
+
+    @classmethod
+    def fromkeys(cls, iterable: Iterable[Any], value: Any = None) -> FrozenMap[Any, Any]:
+        return cls(dict.fromkeys(iterable, value))
+
+    def with_item(self, key: _K, value: _V) -> FrozenMap[_K, _V]:
+        """
+        Args:
+            key: Key of the new entry.
+            value: Value of the new entry.
+
+        Returns:
+            A FrozenMap with the entries of this map and the entry, which replaces the entry
+            of this map with the same key.
+        """
+        if key in self and self[key] is value:
+            return self
+        _copy = self.__class__(self)
+        dict.__setitem__(_copy, key, value)
+        return _copy
+
+    def with_items(
+        self, __m: Union[Mapping[_K, _V], Iterable[Tuple[_K, _V]]] = (), **kwargs: _V
+    ) -> FrozenMap[_K, _V]:
+        _copy = self.__class__(self)
+        dict.update(_copy, __m, **kwargs)
+        return _copy
+
+    def without_item(self, key: _K) -> FrozenMap[_K, _V]:
+        """
+        Args:
+            key: Key of the entry to be left out.
+
+        Returns:
+            A FrozenMap with the entries of this map but the one of the key
+        """
+        if key not in self:
+            return self
+        _copy = self.__class__(self)
+        dict.__delitem__(_copy, key)
+        return _copy
+
+    def size(self) -> int:
+        return len(self)
+
+    def is_empty(self) -> bool:
+        return not self
+
+    def contains_key(self, key: _K) -> bool:
+        return key in self
+
+    def contains_value(self, value: _V) -> bool:
+        for _value in self.values():
+            if value == _value:
+                return True
+        return False
+
+    def copy(self) -> FrozenMap[_K, _V]:
+        return self
+
+    def __hash__(self) -> int:  # type: ignore[override]
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict.__repr__(self)})"
+
+    def __or__(self, other: Any) -> Any:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.with_items(other)
+
+    def _unsupported(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(f"Cannot modify {self.__class__.__name__}")
+
+    __setitem__ = _unsupported
+    __delitem__ = _unsupported
+    __ior__ = _unsupported
+    clear = _unsupported
+    pop = _unsupported
+    popitem = _unsupported
+    setdefault = _unsupported
+    update = _unsupported
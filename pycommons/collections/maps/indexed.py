@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import copy
+from typing import TypeVar, Generic, Any, Dict, Tuple
+
+from pycommons.collections.instrumented import SETS
+from pycommons.collections.maps.iterable import IterableMap, ItemsIterator, MapCursor
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+class IndexedMap(IterableMap[_K, _V], Generic[_K, _V]):
+    """
+    An IterableMap that keeps a reverse index from every value to the keys mapped to it. The
+    index is kept in sync on every write to the map, which makes `contains_value` an O(1)
+    lookup and adds the `keys_for_value` inverse lookup.
+
+    Unhashable values cannot be indexed. Keys mapped to such values are tracked separately and
+    only those are scanned on a reverse lookup.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._value_index: Dict[_V, Dict[_K, None]] = {}
+        self._unindexed_keys: Dict[_K, None] = {}
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        if key in self.data:
+            self._remove_from_index(key, self.data[key])
+        self.data[key] = value
+        self._add_to_index(key, value)
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self)
+
+    def __delitem__(self, key: _K) -> None:
+        value = self.data.pop(key)
+        self._remove_from_index(key, value)
+
+    def __copy__(self) -> IndexedMap[_K, _V]:
+        inst = self.__class__.__new__(self.__class__)
+        inst.__dict__.update(self.__dict__)
+        inst.data = self.data.copy()
+        inst._value_index = {value: keys.copy() for value, keys in self._value_index.items()}
+        inst._unindexed_keys = self._unindexed_keys.copy()
+        return inst
+
+    def copy(self) -> IndexedMap[_K, _V]:
+        return copy.copy(self)
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._value_index.clear()
+        self._unindexed_keys.clear()
+
+    def contains_value(self, value: _V) -> bool:
+        try:
+            if value in self._value_index:
+                return True
+        except TypeError:
+            return super().contains_value(value)
+
+        for key in self._unindexed_keys:
+            if value == self.data[key]:
+                return True
+        return False
+
+    def keys_for_value(self, value: _V) -> Tuple[_K, ...]:
+        """
+        Get the keys that are mapped to a value.
+
+        Args:
+            value: Value to be looked up.
+
+        Returns:
+            The keys mapped to the value, in the order they were mapped to it.
+        """
+        try:
+            keys = tuple(self._value_index.get(value, ()))
+        except TypeError:
+            return tuple(key for key, _value in self.data.items() if value == _value)
+
+        if self._unindexed_keys:
+            keys += tuple(key for key in self._unindexed_keys if value == self.data[key])
+        return keys
+
+    def items_iterator(self) -> ItemsIterator[_K, _V]:
+        return ItemsIterator(self, iter(self.data.items()))
+
+    def cursor_iterator(self) -> MapCursor[_K, _V]:
+        return MapCursor(self, iter(self.data.items()))
+
+    def _add_to_index(self, key: _K, value: _V) -> None:
+        try:
+            keys = self._value_index.get(value)
+        except TypeError:
+            self._unindexed_keys[key] = None
+            return
+
+        if keys is None:
+            self._value_index[value] = {key: None}
+        else:
+            keys[key] = None
+
+    def _remove_from_index(self, key: _K, value: _V) -> None:
+        try:
+            keys = self._value_index.get(value)
+        except TypeError:
+            del self._unindexed_keys[key]
+            return
+
+        if keys is not None:
+            del keys[key]
+            if not keys:
+                del self._value_index[value]
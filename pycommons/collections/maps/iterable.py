@@ -3,11 +3,17 @@ from __future__ import annotations
 import dataclasses
 import typing
 from collections import UserDict  # pylint: disable=E0611
-from typing import Iterator, KeysView, ValuesView
-from typing import TypeVar, Dict, Generic, Optional
+import itertools
+from typing import Iterator, KeysView, ValuesView, ItemsView, MutableMapping, Iterable, List, Type
+from typing import TypeVar, Dict, Generic, Optional, Any
+
+from pycommons.collections.instrumented import GETS, ITERATIONS, MISSES, SETS, Instrumented
 
 _K = TypeVar("_K")
 _V = TypeVar("_V")
+_M = TypeVar("_M", bound="IterableMap[Any, Any]")
+
+_MISSING: Any = object()
 
 
 @dataclasses.dataclass
@@ -17,9 +23,18 @@ class MapItem(Generic[_K, _V]):
 
 
 class ItemsIterator(Iterator["ItemsIterator[_K, _V]"], Generic[_K, _V]):
+    """
+    Iterator over the entries of a map that returns a new `ItemsIterator` for every entry, so
+    each returned object can be held on to after the iteration has moved on. Use
+    `IterableMap.cursor_iterator` or `IterableMap.items_tuple_iterator` when the entries are
+    only looked at while iterating.
+    """
+
+    __slots__ = ("_data", "_items_iterator", "_current_key", "_current_value")
+
     def __init__(
         self,
-        data: Dict[_K, _V],
+        data: MutableMapping[_K, _V],
         items_iterator: Iterator[typing.Tuple[_K, _V]],
         current_key: Optional[_K] = None,
         current_value: Optional[_V] = None,
@@ -61,15 +76,95 @@ class ItemsIterator(Iterator["ItemsIterator[_K, _V]"], Generic[_K, _V]):
         return ItemsIterator(self._data, self._items_iterator, _next[0], _next[1])
 
 
-class IterableMap(UserDict, Generic[_K, _V]):  # type: ignore
+class MapCursor(Iterator["MapCursor[_K, _V]"], Generic[_K, _V]):
+    """
+    A reusable cursor over the entries of a map. Advancing the cursor moves it to the next entry
+    in place and returns the same cursor object, so iterating does not allocate an object per
+    entry. The `key` and `value` of the cursor are only valid until the next call to `next`.
+    """
+
+    __slots__ = ("_data", "_items_iterator", "_key", "_value")
+
+    def __init__(
+        self, data: MutableMapping[_K, _V], items_iterator: Iterator[typing.Tuple[_K, _V]]
+    ):
+        self._data = data
+        self._items_iterator: Iterator[typing.Tuple[_K, _V]] = items_iterator
+        self._key: Optional[_K] = None
+        self._value: Optional[_V] = None
+
+    def get_key(self) -> _K:
+        return self.key
+
+    def get_value(self) -> _V:
+        return self.value
+
+    def get_item(self) -> typing.Tuple[_K, _V]:
+        return self.key, self.value
+
+    def set_value(self, val: _V) -> _V:
+        _prev_val = self._value
+        self._value = val
+        self._data[typing.cast(_K, self._key)] = val
+        return typing.cast(_V, _prev_val)
+
+    @property
+    def key(self) -> _K:
+        return typing.cast(_K, self._key)
+
+    @property
+    def value(self) -> _V:
+        return typing.cast(_V, self._value)
+
+    @value.setter
+    def value(self, val: _V) -> None:
+        self.set_value(val)
+
+    def __next__(self) -> MapCursor[_K, _V]:
+        self._key, self._value = next(self._items_iterator)
+        return self
+
+
+class IterableMap(UserDict, Instrumented, Generic[_K, _V]):  # type: ignore
     data: Dict[_K, _V]
 
+    def __getitem__(self, key: _K) -> _V:
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(GETS, self)
+        data = self.data
+        if key in data:
+            return data[key]
+
+        if instrument is not None:
+            instrument.increment(MISSES, self)
+        # UserDict calls __missing__ if the subclass defines it, or raises KeyError
+        return typing.cast(_V, super().__getitem__(key))
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        self.data[key] = value
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self)
+
     def __iter__(self) -> ItemsIterator[_K, _V]:
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(ITERATIONS, self)
         return self.items_iterator()
 
     def items_iterator(self) -> ItemsIterator[_K, _V]:
         return ItemsIterator(self.data, iter(self.data.items()))
 
+    def cursor_iterator(self) -> MapCursor[_K, _V]:
+        return MapCursor(self.data, iter(self.data.items()))
+
+    def items_tuple_iterator(self) -> Iterator[typing.Tuple[_K, _V]]:
+        return iter(self.data.items())
+
+    def items(self) -> ItemsView[_K, _V]:
+        return ItemsView(self.data)
+
     def keys(self) -> typing.KeysView[_K]:
         return KeysView(self.data)
 
@@ -89,10 +184,136 @@ class IterableMap(UserDict, Generic[_K, _V]):  # type: ignore
         return len(self.data)
 
     def contains_value(self, value: _V) -> bool:
-        for item in self:
-            if value == item.value:
+        for _value in self.data.values():
+            if value == _value:
                 return True
         return False
 
     def contains_key(self, key: _K) -> bool:
         return key in self.data
+
+    def popitem(self) -> typing.Tuple[_K, _V]:
+        try:
+            key = next(reversed(self.data.keys()))
+        except StopIteration:
+            raise KeyError(f"popitem(): {self.__class__.__name__} is empty") from None
+        value = self.data[key]
+        del self[key]
+        return key, value
+
+    def update(self, __m: Any = (), **kwargs: Any) -> None:
+        # MutableMapping.update iterates a Mapping argument with __iter__, which yields
+        # ItemsIterator objects for an IterableMap. Hand it the backing dict instead.
+        super().update(__m.data if isinstance(__m, IterableMap) else __m, **kwargs)
+
+    def clear(self) -> None:
+        self.data.clear()
+
+    @classmethod
+    def from_iterable(
+        cls: Type[_M],
+        pairs: Iterable[typing.Tuple[Any, Any]],
+        *args: Any,
+        chunk_size: int = 1024,
+        **kwargs: Any,
+    ) -> _M:
+        """
+        Create a map and add the pairs to it with `extend`. The other arguments are passed to
+        the constructor.
+
+        Args:
+            pairs: (key, value) pairs to be added.
+            chunk_size: Number of pairs validated and added at once.
+
+        Returns:
+            The new map
+        """
+        _map = cls(*args, **kwargs)
+        _map.extend(pairs, chunk_size)
+        return _map
+
+    def extend(self, pairs: Iterable[typing.Tuple[_K, _V]], chunk_size: int = 1024) -> None:
+        """
+        Add many (key, value) pairs. The pairs are consumed `chunk_size` at a time, and each
+        chunk is validated as a whole before any of its pairs is added, which lets the maps that
+        validate their entries test a chunk in one batch. The call is atomic: if a chunk is
+        rejected or adding a pair raises, the entries added or replaced by the call are restored
+        before the error is raised. Maps whose writes cannot be undone, such as the evicting
+        maps, add the pairs one at a time instead, and keep the pairs added before an error.
+
+        Args:
+            pairs: (key, value) pairs to be added.
+            chunk_size: Number of pairs validated and added at once.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+
+        undo_log: List[typing.Tuple[_K, Any]] = []
+        iterator = iter(pairs)
+        try:
+            while True:
+                chunk = list(itertools.islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                self._validate_chunk(chunk)
+                undo_log.extend((key, self.data.get(key, _MISSING)) for key, _ in chunk)
+                self._put_chunk(chunk)
+        except BaseException:
+            for key, value in reversed(undo_log):
+                self._restore(key, value)
+            raise
+
+    def iter_chunks(self, n: int) -> Iterator[List[typing.Tuple[_K, _V]]]:
+        """
+        Iterate over the entries in lists of up to `n` (key, value) pairs, so that a large map
+        can be written out in pieces without copying it. The map must not be modified while the
+        chunks are iterated.
+
+        Args:
+            n: Maximum number of pairs per chunk.
+
+        Returns:
+            An iterator over the chunks
+        """
+        if n <= 0:
+            raise ValueError("n must be greater than 0")
+
+        iterator = self.items_tuple_iterator()
+        chunk = list(itertools.islice(iterator, n))
+        while chunk:
+            yield chunk
+            chunk = list(itertools.islice(iterator, n))
+
+    def _validate_chunk(self, chunk: List[typing.Tuple[_K, _V]]) -> None:
+        """
+        Raise if any of the pairs of the chunk cannot be added to the map. Called by `extend`.
+        """
+
+    def _put_chunk(self, chunk: List[typing.Tuple[_K, _V]]) -> None:
+        if type(self).__setitem__ is IterableMap.__setitem__:
+            self._put_data(chunk)
+        else:
+            for key, value in chunk:
+                self[key] = value
+
+    def _restore(self, key: _K, value: Any) -> None:
+        if value is not _MISSING:
+            self[key] = value
+        elif key in self.data:
+            del self[key]
+
+    def _put_data(self, chunk: List[typing.Tuple[_K, _V]]) -> None:
+        # For the maps that validated the chunk in _validate_chunk: store it at once, and count
+        # its pairs like __setitem__ does
+        self.data.update(chunk)
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self, len(chunk))
+
+    def _restore_data(self, key: _K, value: Any) -> None:
+        # The entries were validated before they were added, restore them without validating
+        # them again
+        if value is _MISSING:
+            self.data.pop(key, None)
+        else:
+            self.data[key] = value
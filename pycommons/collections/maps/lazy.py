@@ -1,7 +1,18 @@
-from typing import TypeVar, Generic, Any
+import threading
+import time
+from concurrent.futures import Future
+from typing import TypeVar, Generic, Any, Dict, Tuple, Optional, List, Mapping, Iterable
 
 from pycommons.base.function import Function
 
+from pycommons.collections.instrumented import (
+    BULK_FACTORY_SECONDS,
+    FACTORY_SECONDS,
+    GETS,
+    MISSES,
+    SETS,
+)
+
 from pycommons.collections.maps.iterable import IterableMap
 from pycommons.collections.maps.ordered import OrderedMap
 
@@ -10,18 +21,212 @@ _V = TypeVar("_V")
 
 
 class LazyMap(IterableMap[_K, _V], Generic[_K, _V]):
-    def __init__(self, factory: Function[_K, _V], *args: Any, **kwargs: Any):
+    def __init__(
+        self,
+        factory: Function[_K, _V],
+        *args: Any,
+        bulk_factory: Optional[Function[List[_K], Mapping[_K, _V]]] = None,
+        **kwargs: Any,
+    ):
         self._factory = factory
+        self._bulk_factory = bulk_factory
         super().__init__(*args, **kwargs)
 
     def __getitem__(self, item: _K) -> _V:
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(GETS, self)
+
         if item not in self.data:
-            self.data[item] = self._factory.apply(item)
+            self.data[item] = self._create(item)
 
         return self.data[item]
 
+    def _create(self, item: _K) -> _V:
+        instrument = self._instrument
+        if instrument is None:
+            return self._factory.apply(item)
+
+        instrument.increment(MISSES, self)
+        return instrument.timed(FACTORY_SECONDS, self, self._factory.apply, item)
+
+    def get_many(self, keys: Iterable[_K]) -> Dict[_K, _V]:
+        """
+        Get the values of many keys, creating the missing ones with a single call to the bulk
+        factory (see `prefetch`).
+
+        Args:
+            keys: Keys to be looked up.
+
+        Returns:
+            A dict of the keys and their values, in the order of the keys passed
+        """
+        _keys = list(keys)
+        self.prefetch(_keys)
+        return {key: self[key] for key in _keys}
+
+    def prefetch(self, keys: Iterable[_K]) -> None:
+        """
+        Create the values of the keys that are not in the map yet. The missing keys are passed to
+        the bulk factory in a single call, and the keys it does not return a value for are
+        created with the factory. Without a bulk factory, every missing key is created with the
+        factory.
+
+        Args:
+            keys: Keys to be loaded into the map.
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in self.data]
+        if missing and self._bulk_factory is not None:
+            instrument = self._instrument
+            if instrument is None:
+                loaded = self._bulk_factory.apply(missing)
+            else:
+                loaded = instrument.timed(
+                    BULK_FACTORY_SECONDS, self, self._bulk_factory.apply, missing
+                )
+            loaded = {key: loaded[key] for key in missing if key in loaded}
+            if instrument is not None:
+                # The keys not loaded are counted when they are created with the factory
+                instrument.increment(MISSES, self, len(loaded))
+            self._put_loaded(loaded)
+
+        for key in missing:
+            if key not in self.data:
+                _ = self[key]
+
+    def _put_loaded(self, loaded: Dict[_K, _V]) -> None:
+        self.data.update(loaded)
+
 
 class LazyOrderedMap(LazyMap[_K, _V], OrderedMap[_K, _V], Generic[_K, _V]):
-    def __init__(self, factory: Function[_K, _V]):
-        LazyMap.__init__(self, factory)
+    def __init__(
+        self,
+        factory: Function[_K, _V],
+        bulk_factory: Optional[Function[List[_K], Mapping[_K, _V]]] = None,
+    ):
+        LazyMap.__init__(self, factory, bulk_factory=bulk_factory)
         OrderedMap.__init__(self)
+
+
+class _LockStripe(Generic[_K, _V]):
+    __slots__ = ("lock", "in_flight", "failures")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight: Dict[_K, "Future[_V]"] = {}
+        self.failures: Dict[_K, Tuple[BaseException, float]] = {}
+
+
+class ConcurrentLazyMap(LazyMap[_K, _V], Generic[_K, _V]):
+    """
+    A LazyMap that can be shared between threads. Concurrent misses on the same key are
+    coalesced so that the factory runs once, and every caller waits for its result or is raised
+    the exception it failed with. Keys are spread over a fixed number of lock stripes, so misses
+    on unrelated keys do not wait for each other.
+
+    If `negative_ttl` is set, a failure of the factory is cached for that many seconds, and
+    lookups of the key raise the cached exception instead of calling the factory again.
+    """
+
+    def __init__(
+        self,
+        factory: Function[_K, _V],
+        *args: Any,
+        bulk_factory: Optional[Function[List[_K], Mapping[_K, _V]]] = None,
+        stripes: int = 16,
+        negative_ttl: Optional[float] = None,
+        **kwargs: Any,
+    ):
+        if stripes <= 0:
+            raise ValueError("stripes must be greater than 0")
+
+        self._stripes: Tuple[_LockStripe[_K, _V], ...] = tuple(
+            _LockStripe() for _ in range(stripes)
+        )
+        self._negative_ttl = negative_ttl
+        super().__init__(factory, *args, bulk_factory=bulk_factory, **kwargs)
+
+    def __getitem__(self, item: _K) -> _V:
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(GETS, self)
+
+        try:
+            return self.data[item]
+        except KeyError:
+            pass
+
+        stripe = self._stripe(item)
+        with stripe.lock:
+            if item in self.data:
+                return self.data[item]
+
+            self._raise_cached_failure(stripe, item)
+
+            future = stripe.in_flight.get(item)
+            if future is not None:
+                owner = False
+            else:
+                future = Future()
+                stripe.in_flight[item] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = self._create(item)
+        except BaseException as exc:
+            with stripe.lock:
+                del stripe.in_flight[item]
+                if self._negative_ttl is not None:
+                    stripe.failures[item] = (exc, time.monotonic() + self._negative_ttl)
+            future.set_exception(exc)
+            raise
+
+        with stripe.lock:
+            self.data[item] = value
+            del stripe.in_flight[item]
+        future.set_result(value)
+        return value
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.failures.pop(key, None)
+            self.data[key] = value
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self)
+
+    def __delitem__(self, key: _K) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.failures.pop(key, None)
+            del self.data[key]
+
+    def _put_loaded(self, loaded: Dict[_K, _V]) -> None:
+        # Keep the values that were created or set by other threads while the bulk factory ran
+        for key, value in loaded.items():
+            with self._stripe(key).lock:
+                self.data.setdefault(key, value)
+
+    def invalidate_failures(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.failures.clear()
+
+    def _stripe(self, key: _K) -> _LockStripe[_K, _V]:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    @staticmethod
+    def _raise_cached_failure(stripe: _LockStripe[_K, _V], key: _K) -> None:
+        failure = stripe.failures.get(key)
+        if failure is None:
+            return
+
+        exc, expiry = failure
+        if expiry > time.monotonic():
+            raise exc
+        del stripe.failures[key]
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import typing
+from typing import Any, Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+from pycommons.collections.instrumented import GETS, MISSES
+from pycommons.collections.maps.iterable import IterableMap, ItemsIterator, MapCursor
+from pycommons.collections.maps.unmodifiable import UnmodifiableItemsIterator, UnmodifiableMapCursor
+
+# File layout, all integers little endian:
+#   header:  magic, number of keys, number of index slots, offset of the index
+#   records: key length (u32), value length (u32), key, value; one after the other
+#   index:   (key hash (u64), record offset (u64)) per slot, offset 0 for an empty slot
+_MAGIC = b"PCMMAP01"
+_HEADER = struct.Struct("<8sQQQ")
+_RECORD = struct.Struct("<II")
+_SLOT = struct.Struct("<QQ")
+
+_PathLike = Union[str, "os.PathLike[str]"]
+
+
+def _hash_key(key: bytes) -> int:
+    # A stable hash, unlike hash(), so the index can be shared between processes
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class _MappedRecords(Mapping[bytes, memoryview]):
+    __slots__ = ("_mmap", "_view", "_size", "_slot_mask", "_index_offset")
+
+    def __init__(self, path: _PathLike):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, self._size, slot_count, self._index_offset = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a MemoryMappedMap file")
+        self._slot_mask = slot_count - 1
+
+    def find(self, key: bytes) -> int:
+        key_hash = _hash_key(key)
+        slot = key_hash & self._slot_mask
+        while True:
+            _hash, offset = _SLOT.unpack_from(self._mmap, self._index_offset + slot * _SLOT.size)
+            if offset == 0:
+                return 0
+            if _hash == key_hash:
+                key_length, _ = _RECORD.unpack_from(self._mmap, offset)
+                start = offset + _RECORD.size
+                if self._view[start : start + key_length] == key:
+                    return typing.cast(int, offset)
+            slot = (slot + 1) & self._slot_mask
+
+    def record(self, offset: int) -> Tuple[bytes, memoryview]:
+        key_length, value_length = _RECORD.unpack_from(self._mmap, offset)
+        start = offset + _RECORD.size
+        return (
+            self._mmap[start : start + key_length],
+            self._view[start + key_length : start + key_length + value_length],
+        )
+
+    def offsets(self) -> Iterator[int]:
+        for slot in range(self._slot_mask + 1):
+            _, offset = _SLOT.unpack_from(self._mmap, self._index_offset + slot * _SLOT.size)
+            if offset:
+                yield offset
+
+    def __getitem__(self, key: bytes) -> memoryview:
+        offset = self.find(key) if isinstance(key, (bytes, bytearray, memoryview)) else 0
+        if not offset:
+            raise KeyError(key)
+        return self.record(offset)[1]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, (bytes, bytearray, memoryview)) and self.find(bytes(key)) != 0
+
+    def __len__(self) -> int:
+        return typing.cast(int, self._size)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return (self.record(offset)[0] for offset in self.offsets())
+
+    def items_tuples(self) -> Iterator[Tuple[bytes, memoryview]]:
+        return (self.record(offset) for offset in self.offsets())
+
+    def close(self) -> None:
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Values are still referenced. The file is unmapped when the last one is released.
+            pass
+
+
+class MemoryMappedMap(IterableMap[bytes, memoryview]):
+    """
+    An unmodifiable map of bytes to bytes stored in a file and read through a memory map, so the
+    map can be larger than the memory and is shared by all the processes that open the same
+    file. The file is built once with `MemoryMappedMap.build`, and opening it only reads a
+    fixed size header: nothing is loaded until it is looked up.
+
+    The keys are found with an open-addressing (linear probing) hash index stored in the file,
+    hashed with blake2b so the index does not depend on the process. Values are returned as
+    read-only memoryviews into the memory map, without copying them. If some of them are still
+    referenced when the map is closed, the file stays mapped until they are released.
+    """
+
+    data: _MappedRecords  # type: ignore[assignment]
+
+    def __init__(self, path: _PathLike):
+        super().__init__()
+        self._path = path
+        self.data = _MappedRecords(path)
+
+    @classmethod
+    def build(
+        cls,
+        path: _PathLike,
+        items: Union[Mapping[bytes, bytes], Iterable[Tuple[bytes, bytes]]],
+        load_factor: float = 0.5,
+    ) -> MemoryMappedMap:
+        """
+        Write a map file from the items, sorted or not, and open it. If a key is repeated, the
+        last value is kept. The file is written next to the path and moved in place when
+        complete, so processes that have the previous file open keep reading it. The items are
+        written as they are iterated, and the index is built in the file through a memory map,
+        so building takes little memory whatever the number of items.
+
+        Args:
+            path: Path of the file.
+            items: The entries, as a mapping or as (key, value) pairs.
+            load_factor: The maximum ratio of keys to index slots.
+
+        Returns:
+            The map reading the file
+        """
+        if not 0 < load_factor < 1:
+            raise ValueError("load_factor must be between 0 and 1")
+
+        temporary_path = f"{os.fspath(path)}.tmp"
+        with open(temporary_path, "w+b") as file:
+            records = _write_records(file, items.items() if isinstance(items, Mapping) else items)
+            slot_count = 8
+            while slot_count * load_factor < records:
+                slot_count <<= 1
+
+            index_offset = file.tell()
+            file.truncate(index_offset + slot_count * _SLOT.size)
+            with mmap.mmap(file.fileno(), 0) as mapped:
+                count = _build_index(mapped, index_offset, slot_count)
+                _HEADER.pack_into(mapped, 0, _MAGIC, count, slot_count, index_offset)
+                mapped.flush()
+
+        os.replace(temporary_path, path)
+        return cls(path)
+
+    def get_path(self) -> _PathLike:
+        return self._path
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __enter__(self) -> MemoryMappedMap:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getitem__(self, key: bytes) -> memoryview:
+        instrument = self._instrument
+        if instrument is None:
+            return self.data[key]
+
+        instrument.increment(GETS, self)
+        try:
+            return self.data[key]
+        except KeyError:
+            instrument.increment(MISSES, self)
+            raise
+
+    def get(self, key: bytes, default: Optional[Any] = None) -> Optional[Any]:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: bytes, value: memoryview) -> None:
+        raise TypeError(f"Cannot modify {self.__class__.__name__}")
+
+    def __delitem__(self, key: bytes) -> None:
+        raise TypeError(f"Cannot modify {self.__class__.__name__}")
+
+    def popitem(self) -> Tuple[bytes, memoryview]:
+        raise TypeError(f"Cannot modify {self.__class__.__name__}")
+
+    def update(self, __m: Any = (), **kwargs: Any) -> None:
+        if __m or kwargs:
+            raise TypeError(f"Cannot modify {self.__class__.__name__}")
+
+    def clear(self) -> None:
+        raise TypeError(f"Cannot modify {self.__class__.__name__}")
+
+    def items_tuple_iterator(self) -> Iterator[Tuple[bytes, memoryview]]:
+        return self.data.items_tuples()
+
+    def items_iterator(self) -> ItemsIterator[bytes, memoryview]:
+        return UnmodifiableItemsIterator(typing.cast(Any, self.data), self.data.items_tuples())
+
+    def cursor_iterator(self) -> MapCursor[bytes, memoryview]:
+        return UnmodifiableMapCursor(typing.cast(Any, self.data), self.data.items_tuples())
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self._path,)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({os.fspath(self._path)!r})"
+
+
+def _write_records(file: typing.BinaryIO, items: Iterable[Tuple[bytes, bytes]]) -> int:
+    """
+    Returns:
+        The number of records written, repeated keys included
+    """
+    file.write(bytes(_HEADER.size))
+    records = 0
+    for key, value in items:
+        file.write(_RECORD.pack(len(key), len(value)))
+        file.write(key)
+        file.write(value)
+        records += 1
+    return records
+
+
+def _build_index(mapped: mmap.mmap, index_offset: int, slot_count: int) -> int:
+    """
+    Index the records, which go from the header to `index_offset`, in the zeroed index slots
+    that follow them.
+
+    Returns:
+        The number of distinct keys
+    """
+    mask = slot_count - 1
+    count = 0
+    offset = _HEADER.size
+    while offset < index_offset:
+        key_length, value_length = _RECORD.unpack_from(mapped, offset)
+        key = mapped[offset + _RECORD.size : offset + _RECORD.size + key_length]
+        key_hash = _hash_key(key)
+        slot = key_hash & mask
+        while True:
+            _hash, other = _SLOT.unpack_from(mapped, index_offset + slot * _SLOT.size)
+            if not other:
+                count += 1
+                break
+            if _hash == key_hash and _RECORD.unpack_from(mapped, other)[0] == key_length:
+                start = other + _RECORD.size
+                if mapped[start : start + key_length] == key:
+                    break
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(mapped, index_offset + slot * _SLOT.size, key_hash, offset)
+        offset += _RECORD.size + key_length + value_length
+    return count
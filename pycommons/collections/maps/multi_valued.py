@@ -1,5 +1,24 @@
-from typing import TypeVar, Any, Generic
+from __future__ import annotations
 
+import array
+import typing
+from typing import (
+    TypeVar,
+    Any,
+    Generic,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from pycommons.collections.instrumented import SETS
 from pycommons.collections.maps.iterable import IterableMap
 from pycommons.collections.sets.ordered import OrderedSet
 
@@ -11,8 +30,217 @@ class MultiValuedMap(IterableMap[_K, OrderedSet[_V]], Generic[_K, _V]):
     def __init__(self, *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
 
-    def __setitem__(self, key: _K, value: _V) -> None:
+    def __setitem__(self, key: _K, value: _V) -> None:  # type: ignore[override]
         if key in self:
             self.data[key].add(value)
         else:
             self.data[key] = OrderedSet((value,))
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self)
+
+    def put_all(self, key: _K, values: Iterable[_V]) -> None:
+        """
+        Add all the values to the values of the key. Nothing is added for no values, not even
+        the key.
+
+        Args:
+            key: Key to add the values to.
+            values: Values to be added.
+        """
+        values = _as_collection(values)
+        if not values:
+            return
+        _values = self.data.get(key)
+        if _values is None:
+            self.data[key] = OrderedSet(values)
+        else:
+            _values.update(values)
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self, len(values))
+
+    def extend(  # type: ignore[override]
+        self, pairs: Iterable[Tuple[_K, _V]], chunk_size: int = 1024
+    ) -> None:
+        """
+        Add the value of every (key, value) pair to the values of its key. Unlike
+        `IterableMap.extend`, the pairs are added as they come: nothing is validated, and the
+        values added before an error are kept. `chunk_size` is unused.
+
+        Args:
+            pairs: Pairs to be added.
+            chunk_size: Unused.
+        """
+        data = self.data
+        count = 0
+        for key, value in pairs:
+            values = data.get(key)
+            if values is None:
+                data[key] = OrderedSet((value,))
+            else:
+                values.add(value)
+            count += 1
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self, count)
+
+
+class CompactMultiValuedMap(IterableMap[_K, Collection[_V]], Generic[_K, _V]):
+    """
+    A MultiValuedMap for many keys with few values each. The values of a key are kept in a
+    tuple, which costs a fraction of an `OrderedSet`, and are moved to an `OrderedSet` once the
+    key has more than `PROMOTION_THRESHOLD` values, so adding a value stays O(1) for keys with
+    many values.
+
+    As in MultiValuedMap, `m[key] = value` adds the value to the values of the key and a value
+    is only kept once per key. Reading a key returns the tuple or the OrderedSet of its values.
+    """
+
+    PROMOTION_THRESHOLD = 8
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key: _K, value: _V) -> None:  # type: ignore[override]
+        values = self.data.get(key)
+        if not isinstance(values, OrderedSet):
+            # Like in an OrderedSet, which the values are moved to once there are many of them
+            hash(value)
+        if values is None:
+            self.data[key] = (value,)
+        elif isinstance(values, tuple):
+            if value not in values:
+                self.data[key] = self._grow(values, (value,))
+        else:
+            typing.cast(OrderedSet[_V], values).add(value)
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self)
+
+    def put_all(self, key: _K, values: Iterable[_V]) -> None:
+        """
+        Add all the values to the values of the key. Nothing is added for no values, not even
+        the key.
+
+        Args:
+            key: Key to add the values to.
+            values: Values to be added.
+        """
+        values = _as_collection(values)
+        self._put_all(key, values)
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self, len(values))
+
+    def _put_all(self, key: _K, values: Iterable[_V]) -> None:
+        _values = self.data.get(key)
+        if isinstance(_values, OrderedSet):
+            _values.update(values)
+            return
+
+        new_values = tuple(value for value in dict.fromkeys(values) if value not in (_values or ()))
+        if new_values:
+            self.data[key] = self._grow(typing.cast(Tuple[_V, ...], _values or ()), new_values)
+
+    def extend(  # type: ignore[override]
+        self, pairs: Iterable[Tuple[_K, _V]], chunk_size: int = 1024
+    ) -> None:
+        """
+        Add the value of every (key, value) pair to the values of its key. See
+        `MultiValuedMap.extend`.
+
+        Args:
+            pairs: Pairs to be added.
+            chunk_size: Unused.
+        """
+        grouped: Dict[_K, List[_V]] = {}
+        for key, value in pairs:
+            values = grouped.get(key)
+            if values is None:
+                grouped[key] = [value]
+            else:
+                values.append(value)
+
+        for key, values in grouped.items():
+            self._put_all(key, values)
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self, sum(map(len, grouped.values())))
+
+    def _grow(self, values: Tuple[_V, ...], new_values: Tuple[_V, ...]) -> Collection[_V]:
+        if len(values) + len(new_values) > self.PROMOTION_THRESHOLD:
+            promoted: OrderedSet[_V] = OrderedSet(values)
+            promoted.update(new_values)
+            return promoted
+        return values + new_values
+
+
+def _as_collection(values: Iterable[_V]) -> Collection[_V]:
+    # The values are counted once they are added
+    return values if isinstance(values, Collection) else list(values)
+
+
+class ColumnarMultiValuedMap(Mapping[_K, Sequence[_V]], Generic[_K, _V]):
+    """
+    An unmodifiable multi valued map that stores the values of all the keys in one flat
+    sequence, with the values of each key next to each other. A key only costs an entry in a
+    dict and an offset. With a `typecode`, the values are stored in an `array.array` of that
+    type instead of a list, e.g. `"q"` stores 8 bytes per integer value.
+
+    The map is built from a mapping of keys to their values (e.g. a MultiValuedMap) or from
+    (key, value) pairs. A value is only kept once per key. Reading a key returns a list, or an
+    array, of its values.
+    """
+
+    def __init__(
+        self,
+        source: Union[Mapping[_K, Iterable[_V]], Iterable[Tuple[_K, _V]]] = (),
+        typecode: Optional[str] = None,
+    ):
+        grouped: Dict[_K, Dict[_V, None]] = {}
+        if isinstance(source, Mapping):
+            for key, values in source.items():
+                grouped.setdefault(key, {}).update(dict.fromkeys(values))
+        else:
+            for key, value in source:
+                grouped.setdefault(key, {})[value] = None
+
+        self._positions: Dict[_K, int] = {}
+        self._offsets = array.array("q", [0])
+        self._values: Any = [] if typecode is None else array.array(typecode)
+        for key, values in grouped.items():
+            self._positions[key] = len(self._positions)
+            self._values.extend(values)
+            self._offsets.append(len(self._values))
+
+    def __getitem__(self, key: _K) -> Sequence[_V]:
+        position = self._positions[key]
+        return typing.cast(
+            Sequence[_V], self._values[self._offsets[position] : self._offsets[position + 1]]
+        )
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def __iter__(self) -> Iterator[_K]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def count(self, key: _K) -> int:
+        position = self._positions[key]
+        return self._offsets[position + 1] - self._offsets[position]
+
+    def value_count(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 import collections
-from typing import TypeVar
+import itertools
+import typing
+from collections import UserDict  # pylint: disable=E0611
+from typing import Generic, Optional, Tuple, TypeVar
 
 from pycommons.collections.maps.iterable import IterableMap
 
@@ -7,17 +12,101 @@ _K = TypeVar("_K")
 _V = TypeVar("_V")
 
 
-class OrderedMap(IterableMap[_K, _V]):
-    def __init__(self) -> None:
+class OrderedMap(IterableMap[_K, _V], Generic[_K, _V]):
+    """
+    An IterableMap that iterates its entries in insertion order. The entries are kept in a plain
+    dict, which is insertion-ordered and smaller than an OrderedDict, so `repr`, `==` and `copy`
+    are done by the dict, in C.
+
+    Removing the first entry of a dict is O(n), because iteration has to skip the slots left
+    behind by the previous removals. The first `move_to_end(last=False)` or
+    `popitem(last=False)` therefore moves the entries to an OrderedDict, once, and the
+    operations on either end are O(1) from then on.
+
+    With `repr_limit`, `repr` and `str` only show that many entries followed by the number of
+    entries left out, so that printing or logging a very large map stays cheap.
+    """
+
+    def __init__(self, repr_limit: Optional[int] = None) -> None:
+        if repr_limit is not None and repr_limit < 0:
+            raise ValueError("repr_limit must not be negative")
+
         super().__init__()
-        self.data = collections.OrderedDict()
+        self._repr_limit = repr_limit
 
-    def __str__(self) -> str:
-        _str_list = []
-        for map_iterator in self:
-            _str_list.append(f"{repr(map_iterator.key)}: {repr(map_iterator.value)}")
+    def move_to_end(self, key: _K, last: bool = True) -> None:
+        """
+        Move an existing key to the end of the map, or to the beginning if `last` is False.
+        Both are O(1), except for the first move to the beginning, which is O(n).
+
+        Args:
+            key: Key to be moved.
+            last: Move the key to the end if True, to the beginning otherwise.
+        """
+        data = self.data
+        if isinstance(data, collections.OrderedDict):
+            data.move_to_end(key, last)
+        elif last:
+            data[key] = data.pop(key)
+        else:
+            if key not in data:
+                raise KeyError(key)
+            self._front_ordered().move_to_end(key, last=False)
+
+    def popitem(self, last: bool = True) -> Tuple[_K, _V]:
+        """
+        Remove and return the last entry, or the first one if `last` is False.
+        """
+        if last:
+            return super().popitem()
+
+        try:
+            key = next(iter(self._front_ordered()))
+        except StopIteration:
+            raise KeyError(f"popitem(): {self.__class__.__name__} is empty") from None
+        value = self.data[key]
+        del self[key]
+        return key, value
 
-        return f"{{{', '.join(_str_list)}}}"
+    def _front_ordered(self) -> typing.OrderedDict[_K, _V]:
+        data = self.data
+        if not isinstance(data, collections.OrderedDict):
+            data = self.data = collections.OrderedDict(data)
+        return data
+
+    def get_repr_limit(self) -> Optional[int]:
+        return self._repr_limit
+
+    def set_repr_limit(self, repr_limit: Optional[int]) -> None:
+        if repr_limit is not None and repr_limit < 0:
+            raise ValueError("repr_limit must not be negative")
+        self._repr_limit = repr_limit
+
+    def __eq__(self, other: object) -> bool:
+        _other = other.data if isinstance(other, UserDict) else other
+        if isinstance(_other, dict):
+            # Like dict, and unlike OrderedDict, the order of the entries is not compared
+            return dict.__eq__(self.data, _other)
+        return super().__eq__(other)
+
+    def copy(self) -> OrderedMap[_K, _V]:
+        copy: OrderedMap[_K, _V] = self.__class__.__new__(self.__class__)
+        copy.__dict__.update(self.__dict__)
+        copy.data = self.data.copy()
+        return copy
+
+    def __copy__(self) -> OrderedMap[_K, _V]:
+        return self.copy()
+
+    def __str__(self) -> str:
+        return self.__repr__()
 
     def __repr__(self) -> str:
-        return self.__str__()
+        limit = self._repr_limit
+        if limit is None or len(self.data) <= limit:
+            data = self.data
+            return repr(dict(data) if isinstance(data, collections.OrderedDict) else data)
+
+        shown = repr(dict(itertools.islice(self.data.items(), limit)))[1:-1]
+        left_out = f"... ({len(self.data) - limit} more)"
+        return f"{{{shown}, {left_out}}}" if shown else f"{{{left_out}}}"
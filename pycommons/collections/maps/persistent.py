@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import typing
+from typing import (
+    TypeVar,
+    Generic,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from pycommons.collections.maps.iterable import ItemsIterator, MapCursor
+from pycommons.collections.maps.unmodifiable import UnmodifiableItemsIterator, UnmodifiableMapCursor
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+
+# Marks a slot of a node that holds a child node instead of a key
+_NODE = object()
+_MISSING = object()
+
+
+def _hash_key(key: Any) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _bit_count(value: int) -> int:
+    return bin(value).count("1")
+
+
+class _BitmapNode:
+    """
+    A node of the trie. `bitmap` has a bit set for each of the 32 slots that is in use, and
+    `array` holds two entries for each of them, in order: the key and the value of an entry, or
+    `_NODE` and the child node. Nodes are only modified in place by the builder that owns
+    them (`edit`), otherwise they are copied.
+    """
+
+    __slots__ = ("bitmap", "array", "edit")
+
+    def __init__(self, bitmap: int, array: List[Any], edit: Optional[object]):
+        self.bitmap = bitmap
+        self.array = array
+        self.edit = edit
+
+    def editable(self, edit: Optional[object]) -> _BitmapNode:
+        if edit is not None and self.edit is edit:
+            return self
+        return _BitmapNode(self.bitmap, self.array.copy(), edit)
+
+
+class _CollisionNode:
+    """
+    A node holding the entries of the keys that have the same hash, as key, value pairs.
+    """
+
+    __slots__ = ("hash", "array", "edit")
+
+    def __init__(self, _hash: int, array: List[Any], edit: Optional[object]):
+        self.hash = _hash
+        self.array = array
+        self.edit = edit
+
+    def editable(self, edit: Optional[object]) -> _CollisionNode:
+        if edit is not None and self.edit is edit:
+            return self
+        return _CollisionNode(self.hash, self.array.copy(), edit)
+
+
+_Node = Union[_BitmapNode, _CollisionNode]
+_EMPTY = _BitmapNode(0, [], None)
+
+
+def _find(node: _Node, _hash: int, key: Any) -> Any:
+    shift = 0
+    while True:
+        array = node.array
+        if isinstance(node, _CollisionNode):
+            for i in range(0, len(array), 2):
+                if array[i] is key or array[i] == key:
+                    return array[i + 1]
+            return _MISSING
+
+        bit = 1 << ((_hash >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+        i = 2 * _bit_count(node.bitmap & (bit - 1))
+        _key = array[i]
+        if _key is _NODE:
+            node = array[i + 1]
+            shift += _BITS
+        elif _key is key or _key == key:
+            return array[i + 1]
+        else:
+            return _MISSING
+
+
+def _assoc(  # pylint: disable=R0911
+    node: _Node, shift: int, _hash: int, key: Any, value: Any, edit: Optional[object]
+) -> Tuple[_Node, bool]:
+    if isinstance(node, _CollisionNode):
+        return _assoc_collision(node, shift, _hash, key, value, edit)
+
+    bit = 1 << ((_hash >> shift) & _MASK)
+    i = 2 * _bit_count(node.bitmap & (bit - 1))
+    if not node.bitmap & bit:
+        _node = node.editable(edit)
+        _node.array[i:i] = (key, value)
+        _node.bitmap |= bit
+        return _node, True
+
+    _key, _value = node.array[i], node.array[i + 1]
+    if _key is _NODE:
+        child, added = _assoc(_value, shift + _BITS, _hash, key, value, edit)
+        if child is _value:
+            return node, added
+        _node = node.editable(edit)
+        _node.array[i + 1] = child
+        return _node, added
+
+    if _key is key or _key == key:
+        if _value is value:
+            return node, False
+        _node = node.editable(edit)
+        _node.array[i + 1] = value
+        return _node, False
+
+    _node = node.editable(edit)
+    _node.array[i] = _NODE
+    _node.array[i + 1] = _merge(
+        shift + _BITS, (_key, _value, _hash_key(_key)), (key, value, _hash), edit
+    )
+    return _node, True
+
+
+def _assoc_collision(
+    node: _CollisionNode, shift: int, _hash: int, key: Any, value: Any, edit: Optional[object]
+) -> Tuple[_Node, bool]:
+    if _hash != node.hash:
+        # Nest the collision node in a bitmap node, where the key goes into another slot
+        wrapper = _BitmapNode(1 << ((node.hash >> shift) & _MASK), [_NODE, node], edit)
+        return _assoc(wrapper, shift, _hash, key, value, edit)
+
+    array = node.array
+    for i in range(0, len(array), 2):
+        if array[i] is key or array[i] == key:
+            if array[i + 1] is value:
+                return node, False
+            _node = node.editable(edit)
+            _node.array[i + 1] = value
+            return _node, False
+
+    _node = node.editable(edit)
+    _node.array.extend((key, value))
+    return _node, True
+
+
+def _merge(
+    shift: int, entry1: Tuple[Any, Any, int], entry2: Tuple[Any, Any, int], edit: Optional[object]
+) -> _Node:
+    # Creates the node for two entries (key, value, hash) that share a slot at `shift` - _BITS
+    key1, value1, hash1 = entry1
+    key2, value2, hash2 = entry2
+    if hash1 == hash2:
+        return _CollisionNode(hash1, [key1, value1, key2, value2], edit)
+
+    index1, index2 = (hash1 >> shift) & _MASK, (hash2 >> shift) & _MASK
+    if index1 == index2:
+        return _BitmapNode(1 << index1, [_NODE, _merge(shift + _BITS, entry1, entry2, edit)], edit)
+    if index1 < index2:
+        return _BitmapNode((1 << index1) | (1 << index2), [key1, value1, key2, value2], edit)
+    return _BitmapNode((1 << index1) | (1 << index2), [key2, value2, key1, value1], edit)
+
+
+def _without(  # pylint: disable=R0911
+    node: _Node, shift: int, _hash: int, key: Any, edit: Optional[object]
+) -> Tuple[Optional[_Node], bool]:
+    if isinstance(node, _CollisionNode):
+        return _without_collision(node, key, edit)
+
+    bit = 1 << ((_hash >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node, False
+    i = 2 * _bit_count(node.bitmap & (bit - 1))
+    _key = node.array[i]
+
+    if _key is not _NODE:
+        if _key is key or _key == key:
+            return _remove_slot(node.editable(edit), bit, i)
+        return node, False
+
+    child, removed = _without(node.array[i + 1], shift + _BITS, _hash, key, edit)
+    if not removed:
+        return node, False
+    _node = node.editable(edit)
+    if child is None:
+        return _remove_slot(_node, bit, i)
+    if len(child.array) == 2 and child.array[0] is not _NODE:
+        # A child left with a single entry is pulled up into this node
+        _node.array[i], _node.array[i + 1] = child.array
+    else:
+        _node.array[i + 1] = child
+    return _node, True
+
+
+def _without_collision(
+    node: _CollisionNode, key: Any, edit: Optional[object]
+) -> Tuple[Optional[_Node], bool]:
+    array = node.array
+    for i in range(0, len(array), 2):
+        if array[i] is key or array[i] == key:
+            _node = node.editable(edit)
+            del _node.array[i : i + 2]
+            return _node, True
+    return node, False
+
+
+def _remove_slot(node: _BitmapNode, bit: int, i: int) -> Tuple[Optional[_Node], bool]:
+    node.bitmap ^= bit
+    del node.array[i : i + 2]
+    return (node if node.bitmap else None), True
+
+
+def _iterate(node: _Node) -> Iterator[Tuple[Any, Any]]:
+    array = node.array
+    for i in range(0, len(array), 2):
+        key = array[i]
+        if key is _NODE:
+            yield from _iterate(array[i + 1])
+        else:
+            yield key, array[i + 1]
+
+
+class PersistentMap(Mapping[_K, _V], Generic[_K, _V]):
+    """
+    An immutable map backed by a hash array mapped trie. `set` and `delete` return a new version
+    of the map in O(log32 n), which shares all but the changed path of the trie with this
+    one, so a snapshot of a PersistentMap is free and versions can be kept around cheaply.
+
+    Use `transient()` to make many changes at once: the PersistentMapBuilder it returns
+    modifies the nodes it created in place and is turned back into a PersistentMap with
+    `persistent()`.
+
+    Apart from the Mapping interface, the read methods of IterableMap are available. The
+    iterators returned by `items_iterator` and `cursor_iterator` do not allow setting values.
+    `with_item`, `without_item` and `with_items` are the FrozenMap names of `set`, `delete`
+    and `set_all`, so a PersistentMap can replace a FrozenMap that is derived from often.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(
+        self, __m: Union[Mapping[_K, _V], Iterable[Tuple[_K, _V]]] = (), **kwargs: _V
+    ) -> None:
+        builder: PersistentMapBuilder[_K, _V] = PersistentMapBuilder(_EMPTY, 0)
+        builder.update(__m, **kwargs)
+        self._root: _Node = builder._root  # pylint: disable=W0212
+        self._size: int = len(builder)
+
+    @classmethod
+    def _of(cls, root: _Node, size: int) -> PersistentMap[_K, _V]:
+        persistent_map: PersistentMap[_K, _V] = cls.__new__(cls)
+        persistent_map._root = root
+        persistent_map._size = size
+        return persistent_map
+
+    def set(self, key: _K, value: _V) -> PersistentMap[_K, _V]:
+        """
+        Args:
+            key: Key of the entry.
+            value: Value of the entry.
+
+        Returns:
+            A PersistentMap with the entry added, or replaced if the key is in this map
+        """
+        root, added = _assoc(self._root, 0, _hash_key(key), key, value, None)
+        if root is self._root:
+            return self
+        return self._of(root, self._size + added)
+
+    def delete(self, key: _K) -> PersistentMap[_K, _V]:
+        """
+        Args:
+            key: Key of the entry to be removed.
+
+        Returns:
+            A PersistentMap without the entry of the key, or this map if the key is not in it
+        """
+        root, removed = _without(self._root, 0, _hash_key(key), key, None)
+        if not removed:
+            return self
+        return self._of(root or _EMPTY, self._size - 1)
+
+    def set_all(
+        self, __m: Union[Mapping[_K, _V], Iterable[Tuple[_K, _V]]] = (), **kwargs: _V
+    ) -> PersistentMap[_K, _V]:
+        builder = self.transient()
+        builder.update(__m, **kwargs)
+        return builder.persistent()
+
+    with_item = set
+    without_item = delete
+    with_items = set_all
+
+    def transient(self) -> PersistentMapBuilder[_K, _V]:
+        return PersistentMapBuilder(self._root, self._size)
+
+    def __getitem__(self, key: _K) -> _V:
+        value = _find(self._root, _hash_key(key), key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return typing.cast(_V, value)
+
+    def __contains__(self, key: object) -> bool:
+        return _find(self._root, _hash_key(key), key) is not _MISSING
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[_K]:
+        return (key for key, _ in _iterate(self._root))
+
+    def size(self) -> int:
+        return self._size
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def contains_key(self, key: _K) -> bool:
+        return key in self
+
+    def contains_value(self, value: _V) -> bool:
+        for _, _value in _iterate(self._root):
+            if value == _value:
+                return True
+        return False
+
+    def keys_iterator(self) -> Iterator[_K]:
+        return iter(self)
+
+    def values_iterator(self) -> Iterator[_V]:
+        return (value for _, value in _iterate(self._root))
+
+    def items_tuple_iterator(self) -> Iterator[Tuple[_K, _V]]:
+        return _iterate(self._root)
+
+    def items_iterator(self) -> ItemsIterator[_K, _V]:
+        return UnmodifiableItemsIterator(typing.cast(Any, self), _iterate(self._root))
+
+    def cursor_iterator(self) -> MapCursor[_K, _V]:
+        return UnmodifiableMapCursor(typing.cast(Any, self), _iterate(self._root))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (dict(_iterate(self._root)),)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(_iterate(self._root))!r})"
+
+
+class PersistentMapBuilder(MutableMapping[_K, _V], Generic[_K, _V]):
+    """
+    A mutable view of a PersistentMap for batch updates, returned by
+    `PersistentMap.transient()`. The nodes copied by the builder are owned by it and modified in
+    place by the later changes, so a bulk load does not copy the path to the root on every
+    change. The PersistentMap the builder was created from is never modified.
+
+    `persistent()` returns the PersistentMap with the changes. The builder cannot be used
+    afterwards.
+    """
+
+    __slots__ = ("_root", "_size", "_edit")
+
+    def __init__(self, root: _Node, size: int):
+        self._root: _Node = root
+        self._size: int = size
+        self._edit: Optional[object] = object()
+
+    def persistent(self) -> PersistentMap[_K, _V]:
+        self._ensure_editable()
+        self._edit = None
+        return PersistentMap._of(self._root, self._size)  # pylint: disable=W0212
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        self._root, added = _assoc(
+            self._root, 0, _hash_key(key), key, value, self._ensure_editable()
+        )
+        self._size += added
+
+    def __delitem__(self, key: _K) -> None:
+        root, removed = _without(self._root, 0, _hash_key(key), key, self._ensure_editable())
+        if not removed:
+            raise KeyError(key)
+        self._root = root or _EMPTY
+        self._size -= 1
+
+    def __getitem__(self, key: _K) -> _V:
+        value = _find(self._root, _hash_key(key), key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return typing.cast(_V, value)
+
+    def __contains__(self, key: object) -> bool:
+        return _find(self._root, _hash_key(key), key) is not _MISSING
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[_K]:
+        return (key for key, _ in _iterate(self._root))
+
+    def _ensure_editable(self) -> object:
+        if self._edit is None:
+            raise TypeError(f"Cannot modify {self.__class__.__name__} after persistent()")
+        return self._edit
@@ -1,7 +1,8 @@
-from typing import Generic, TypeVar, Any
+from typing import Generic, TypeVar, Any, List, Tuple
 
 from pycommons.base.function import Predicate, BiPredicate
 
+from pycommons.collections.functions.predicate import _record, _record_many, test_many
 from pycommons.collections.maps.iterable import IterableMap
 from pycommons.collections.maps.ordered import OrderedMap
 
@@ -19,7 +20,7 @@ class PredicatedMap(IterableMap[_K, _V], Generic[_K, _V]):
     ):
         self._key_predicate = key_predicate
         self._value_predicate = value_predicate
-        super().__init__(*args, *kwargs)
+        super().__init__(*args, **kwargs)
 
     def __setitem__(self, key: _K, value: _V) -> None:
         self.validate_exceptionally(key, value)
@@ -36,10 +37,26 @@ class PredicatedMap(IterableMap[_K, _V], Generic[_K, _V]):
             raise ValueError("Predicate not passing for the value passed")
 
     def validate_key(self, key: _K) -> bool:
-        return self._key_predicate.test(key)
+        return _record(self, self._key_predicate.test(key))
 
     def validate_value(self, value: _V) -> bool:
-        return self._value_predicate.test(value)
+        return _record(self, self._value_predicate.test(value))
+
+    def _validate_chunk(self, chunk: List[Tuple[_K, _V]]) -> None:
+        # Predicates that support batch evaluation test the whole chunk in one call
+        keys = test_many(self._key_predicate, [key for key, _ in chunk])
+        if not all(_record_many(self, keys)):
+            raise ValueError("Predicate not passing for the key passed")
+
+        values = test_many(self._value_predicate, [value for _, value in chunk])
+        if not all(_record_many(self, values)):
+            raise ValueError("Predicate not passing for the value passed")
+
+    def _put_chunk(self, chunk: List[Tuple[_K, _V]]) -> None:
+        self._put_data(chunk)
+
+    def _restore(self, key: _K, value: Any) -> None:
+        self._restore_data(key, value)
 
 
 class PredicatedOrderedMap(PredicatedMap[_K, _V], OrderedMap[_K, _V], Generic[_K, _V]):
@@ -58,8 +75,18 @@ class CompositePredicatedMap(IterableMap[_K, _V], Generic[_K, _V]):
         super().__setitem__(key, value)
 
     def validate(self, key: _K, value: _V) -> bool:
-        return self._predicate.test(key, value)
+        return _record(self, self._predicate.test(key, value))
 
     def validate_exceptionally(self, key: _K, value: _V) -> None:
         if not self.validate(key, value):
             raise ValueError("Predicate not passing for the key passed")
+
+    def _validate_chunk(self, chunk: List[Tuple[_K, _V]]) -> None:
+        for key, value in chunk:
+            self.validate_exceptionally(key, value)
+
+    def _put_chunk(self, chunk: List[Tuple[_K, _V]]) -> None:
+        self._put_data(chunk)
+
+    def _restore(self, key: _K, value: Any) -> None:
+        self._restore_data(key, value)
@@ -1,5 +1,5 @@
 import abc
-from typing import TypeVar, Generic, Any
+from typing import TypeVar, Generic, Any, List, Tuple
 
 from pycommons.collections.maps.iterable import IterableMap
 
@@ -35,6 +35,25 @@ class FixedSizeMap(BoundedMap[_K, _V], Generic[_K, _V]):
             )
         super().__setitem__(key, value)
 
+    def _validate_chunk(self, chunk: List[Tuple[_K, _V]]) -> None:
+        # Like __setitem__, which rejects any pair once the map is full, even for a key in it
+        size = len(self.data)
+        new_keys = set()
+        for key, _ in chunk:
+            if size == self._max_size:
+                raise OverflowError(
+                    f"Size breached for {self.__class__.__name__}(max_size={self.max_size()})"
+                )
+            if key not in self.data and key not in new_keys:
+                new_keys.add(key)
+                size += 1
+
+    def _put_chunk(self, chunk: List[Tuple[_K, _V]]) -> None:
+        self._put_data(chunk)
+
+    def _restore(self, key: _K, value: Any) -> None:
+        self._restore_data(key, value)
+
 
 class SingletonMap(FixedSizeMap[_K, _V], Generic[_K, _V]):
     def __init__(self, *args: Any, **kwargs: Any):
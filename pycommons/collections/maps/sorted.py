@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Generic,
+    ItemsView,
+    Iterator,
+    KeysView,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    ValuesView,
+)
+
+from pycommons.collections.instrumented import SETS
+from pycommons.collections.maps.iterable import IterableMap, ItemsIterator, MapCursor
+from pycommons.collections.sets.sorted import _ceiling, _floor, _Range, _SortedList
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+class SortedMap(IterableMap[_K, _V], Generic[_K, _V]):
+    """
+    An IterableMap that iterates its entries in the order of their keys. Lookups are O(1),
+    inserting and removing a key is O(log n), and the keys can be looked up by their position
+    (`rank`, `select`) and by their neighbours (`floor_key`, `ceiling_key`, `lower_key`,
+    `higher_key`). `head_map`, `tail_map` and `sub_map` return views of a range of the map, which
+    follow the changes of the map.
+
+    The keys must be hashable and comparable with each other, and cannot be None.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._keys: _SortedList[_K] = _SortedList()
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        if key not in self.data:
+            self._keys.add(key)
+        self.data[key] = value
+
+        instrument = self._instrument
+        if instrument is not None:
+            instrument.increment(SETS, self)
+
+    def __delitem__(self, key: _K) -> None:
+        del self.data[key]
+        self._keys.remove(key)
+
+    def __reversed__(self) -> Iterator[_K]:
+        return reversed(self._keys)
+
+    def items_iterator(self) -> ItemsIterator[_K, _V]:
+        return ItemsIterator(self.data, self.items_tuple_iterator())
+
+    def cursor_iterator(self) -> MapCursor[_K, _V]:
+        return MapCursor(self.data, self.items_tuple_iterator())
+
+    def items_tuple_iterator(self) -> Iterator[Tuple[_K, _V]]:
+        data = self.data
+        return ((key, data[key]) for key in self._keys)
+
+    def items(self) -> ItemsView[_K, _V]:
+        return _SortedItemsView(self)  # type: ignore[arg-type]
+
+    def keys(self) -> KeysView[_K]:
+        return _SortedKeysView(self)  # type: ignore[arg-type]
+
+    def values(self) -> ValuesView[_V]:
+        return _SortedValuesView(self)
+
+    def keys_iterator(self) -> Iterator[_K]:
+        return iter(self._keys)
+
+    def popitem(self) -> Tuple[_K, _V]:
+        """
+        Remove and return the entry of the greatest key.
+        """
+        if not self.data:
+            raise KeyError(f"popitem(): {self.__class__.__name__} is empty")
+        key = self._keys[-1]
+        value = self.data[key]
+        del self[key]
+        return key, value
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._keys.clear()
+
+    def copy(self) -> SortedMap[_K, _V]:
+        copy: SortedMap[_K, _V] = self.__class__.__new__(self.__class__)
+        copy.__dict__.update(self.__dict__)
+        copy.data = dict(self.data)
+        copy._keys = self._keys.copy()  # pylint: disable=W0212
+        return copy
+
+    def __copy__(self) -> SortedMap[_K, _V]:
+        return self.copy()
+
+    def rank(self, key: _K) -> int:
+        """
+        Returns:
+            The number of keys lower than the key, i.e. its position if it is in the map
+        """
+        return self._keys.bisect_left(key)
+
+    def select(self, index: int) -> _K:
+        """
+        Returns:
+            The key at the position, negative positions counting from the greatest key
+
+        Raises:
+            IndexError: if the position is out of range
+        """
+        return self._keys[index]
+
+    def first_key(self) -> _K:
+        if not self.data:
+            raise KeyError(f"{self.__class__.__name__} is empty")
+        return self._keys[0]
+
+    def last_key(self) -> _K:
+        if not self.data:
+            raise KeyError(f"{self.__class__.__name__} is empty")
+        return self._keys[-1]
+
+    def floor_key(self, key: _K) -> Optional[_K]:
+        """
+        Returns:
+            The greatest key lower than or equal to the key, or None
+        """
+        return _floor(self._keys, key, True)
+
+    def lower_key(self, key: _K) -> Optional[_K]:
+        """
+        Returns:
+            The greatest key strictly lower than the key, or None
+        """
+        return _floor(self._keys, key, False)
+
+    def ceiling_key(self, key: _K) -> Optional[_K]:
+        """
+        Returns:
+            The lowest key greater than or equal to the key, or None
+        """
+        return _ceiling(self._keys, key, True)
+
+    def higher_key(self, key: _K) -> Optional[_K]:
+        """
+        Returns:
+            The lowest key strictly greater than the key, or None
+        """
+        return _ceiling(self._keys, key, False)
+
+    def head_map(self, to_key: _K, inclusive: bool = False) -> SortedMapView[_K, _V]:
+        return SortedMapView(self, _Range(upper=to_key, upper_inclusive=inclusive))
+
+    def tail_map(self, from_key: _K, inclusive: bool = True) -> SortedMapView[_K, _V]:
+        return SortedMapView(self, _Range(lower=from_key, lower_inclusive=inclusive))
+
+    def sub_map(
+        self, from_key: _K, to_key: _K, from_inclusive: bool = True, to_inclusive: bool = False
+    ) -> SortedMapView[_K, _V]:
+        return SortedMapView(self, _Range(from_key, from_inclusive, to_key, to_inclusive))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items_tuple_iterator())!r})"
+
+
+class _SortedKeysView(KeysView[_K], Generic[_K]):
+    _mapping: SortedMap[_K, Any]
+
+    def __iter__(self) -> Iterator[_K]:
+        return iter(self._mapping._keys)  # pylint: disable=W0212
+
+    def __reversed__(self) -> Iterator[_K]:
+        return reversed(self._mapping._keys)  # pylint: disable=W0212
+
+
+class _SortedItemsView(ItemsView[_K, _V], Generic[_K, _V]):
+    _mapping: SortedMap[_K, _V]
+
+    def __iter__(self) -> Iterator[Tuple[_K, _V]]:
+        return self._mapping.items_tuple_iterator()
+
+
+class _SortedValuesView(ValuesView[_V], Generic[_V]):
+    _mapping: SortedMap[Any, _V]
+
+    def __iter__(self) -> Iterator[_V]:
+        return (value for _, value in self._mapping.items_tuple_iterator())
+
+
+class SortedMapView(Mapping[_K, _V], Generic[_K, _V]):
+    """
+    The entries of a SortedMap whose keys are in a range, in the order of their keys. The view
+    reads the map, it is not a copy: its size and iteration are O(log n) to start.
+    """
+
+    __slots__ = ("_map", "_range")
+
+    def __init__(self, sorted_map: SortedMap[_K, _V], _range: _Range):
+        self._map = sorted_map
+        self._range = _range
+
+    def __getitem__(self, key: _K) -> _V:
+        if key not in self._range:
+            raise KeyError(key)
+        return self._map.data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._map.data and key in self._range
+
+    def __len__(self) -> int:
+        start, stop = self._range.positions(self._map._keys)  # pylint: disable=W0212
+        return stop - start
+
+    def __iter__(self) -> Iterator[_K]:
+        keys = self._map._keys  # pylint: disable=W0212
+        return keys.iterate(*self._range.positions(keys))
+
+    def __reversed__(self) -> Iterator[_K]:
+        keys = self._map._keys  # pylint: disable=W0212
+        return keys.iterate(*self._range.positions(keys), reverse=True)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
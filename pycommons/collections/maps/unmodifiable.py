@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TypeVar, Tuple, Generic, Any, Union
 
-from pycommons.collections.maps.iterable import ItemsIterator
+from pycommons.collections.maps.iterable import ItemsIterator, MapCursor
 from pycommons.collections.maps.sized import BoundedMap
 
 _K = TypeVar("_K")
@@ -10,6 +10,8 @@ _V = TypeVar("_V")
 
 
 class UnmodifiableItemsIterator(ItemsIterator[_K, _V], Generic[_K, _V]):
+    __slots__ = ()
+
     def set_value(self, val: _V) -> _V:
         raise TypeError(f"Cannot modify values in a {self.__class__.__name__}")
 
@@ -18,6 +20,13 @@ class UnmodifiableItemsIterator(ItemsIterator[_K, _V], Generic[_K, _V]):
         return UnmodifiableItemsIterator(self._data, self._items_iterator, _next[0], _next[1])
 
 
+class UnmodifiableMapCursor(MapCursor[_K, _V], Generic[_K, _V]):
+    __slots__ = ()
+
+    def set_value(self, val: _V) -> _V:
+        raise TypeError(f"Cannot modify values in a {self.__class__.__name__}")
+
+
 class UnmodifiableMap(BoundedMap[_K, _V], Generic[_K, _V]):
     __POP_DEFAULT_VALUE = object()
 
@@ -51,7 +60,7 @@ class UnmodifiableMap(BoundedMap[_K, _V], Generic[_K, _V]):
             return self.data.__delitem__(key)
         raise TypeError(f"Cannot modify {self.__class__.__name__}")
 
-    def update(self, __m: Any, **kwargs: Any) -> None:  # type: ignore
+    def update(self, __m: Any = (), **kwargs: Any) -> None:
         if self.__init:
             return self.data.update(__m, **kwargs)
         raise TypeError(f"Cannot modify {self.__class__.__name__}")
@@ -71,6 +80,9 @@ class UnmodifiableMap(BoundedMap[_K, _V], Generic[_K, _V]):
     def items_iterator(self) -> ItemsIterator[_K, _V]:
         return UnmodifiableItemsIterator(self.data, iter(self.data.items()))
 
+    def cursor_iterator(self) -> MapCursor[_K, _V]:
+        return UnmodifiableMapCursor(self.data, iter(self.data.items()))
+
 
 class UnmodifiableLateInitMap(UnmodifiableMap[_K, _V], Generic[_K, _V]):
     def max_size(self) -> int:
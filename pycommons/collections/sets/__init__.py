@@ -1 +1,20 @@
-from .ordered import OrderedSet
+from typing import TYPE_CHECKING
+
+from pycommons.collections.lazy_exports import lazy_exports
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .bloom import BloomFilter, ScalableBloomFilter
+    from .ordered import OrderedSet
+    from .sorted import SortedSet, SortedSetView
+
+# The sets are imported from their module when they are first used
+_EXPORTS = {
+    "BloomFilter": ".bloom",
+    "OrderedSet": ".ordered",
+    "ScalableBloomFilter": ".bloom",
+    "SortedSet": ".sorted",
+    "SortedSetView": ".sorted",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
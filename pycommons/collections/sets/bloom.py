@@ -0,0 +1,487 @@
+# The filters read the state of the filters they are combined with, and a ScalableBloomFilter
+# adds its elements to its BloomFilters
+# pylint: disable=W0212
+from __future__ import annotations
+
+import hashlib
+import math
+import struct
+from typing import Any, Iterable, List, Tuple, Union
+
+Element = Union[str, bytes, bytearray, memoryview, int, float, None, Tuple[Any, ...]]
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Serialized filters, all integers little endian:
+#   BloomFilter:          header (magic, version, capacity, error rate, count, number of bits,
+#                         number of hashes), then the bits
+#   ScalableBloomFilter:  header (magic, version, initial capacity, error rate, growth,
+#                         tightening, number of filters), then the length and the bytes of
+#                         every BloomFilter
+_VERSION = 1
+_MAGIC = b"PB"
+_HEADER = struct.Struct("<2sBQdQQB")
+_SCALABLE_MAGIC = b"PS"
+_SCALABLE_HEADER = struct.Struct("<2sBQdQdQ")
+_LENGTH = struct.Struct("<Q")
+_DIGEST = struct.Struct("<QQ")
+_FLOAT = struct.Struct("<d")
+
+
+def _encode(element: Element) -> bytes:  # pylint: disable=R0911
+    # Equal elements have the same encoding, like they have the same hash(): an integral float
+    # is encoded as the int it is equal to. Tuples are the encodings of their elements, each
+    # prefixed with its length.
+    if isinstance(element, str):
+        return b"s" + element.encode("utf-8", "surrogatepass")
+    if isinstance(element, (bytes, bytearray, memoryview)):
+        return b"b" + bytes(element)
+    if isinstance(element, int):
+        return b"i" + element.to_bytes(element.bit_length() // 8 + 1, "little", signed=True)
+    if isinstance(element, float):
+        if element.is_integer():
+            return _encode(int(element))
+        return b"f" + _FLOAT.pack(element)
+    if element is None:
+        return b"n"
+    if isinstance(element, tuple):
+        encoded = [_encode(item) for item in element]
+        return b"t" + b"".join(_LENGTH.pack(len(item)) + item for item in encoded)
+    raise TypeError(
+        "Elements must be str, bytes, int, float, None or tuples of them, "
+        f"not {element.__class__.__name__}"
+    )
+
+
+def _hash(element: Element) -> Tuple[int, int]:
+    # A stable hash, unlike hash(), so the serialized filters can be shared between processes.
+    # The positions of an element are derived from two hashes (Kirsch and Mitzenmacher).
+    first, second = _DIGEST.unpack(hashlib.blake2b(_encode(element), digest_size=16).digest())
+    return first, second | 1
+
+
+def _check(capacity: int, error_rate: float) -> None:
+    if capacity <= 0:
+        raise ValueError("capacity must be positive")
+    if not 0 < error_rate < 1:
+        raise ValueError("error_rate must be between 0 and 1")
+
+
+def _sizes(capacity: int, error_rate: float) -> Tuple[int, int]:
+    # The number of bits and of hashes of a filter
+    bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    return bit_count, max(1, round(bit_count / capacity * math.log(2)))
+
+
+class BloomFilter:
+    """
+    An approximate set of str, bytes, int, float and None elements, and of tuples of them.
+    Membership tests never miss an element that was added, but may find an element that was not,
+    with a probability of about `error_rate` once `capacity` elements are added, and lower
+    before. Other elements cannot be added, and are never found. Elements cannot be removed or
+    iterated. The elements are stored as bits in a bytearray, about 1.2 bytes per element
+    for an error rate of 1%, whatever their size.
+
+    Filters of the same capacity and error rate can be combined with `union` and
+    `intersection`, and are serialized with `to_bytes`. `len` is the number of distinct
+    elements that were added, which is approximate, as an element may be found before it is
+    added.
+    """
+
+    __slots__ = ("_capacity", "_error_rate", "_count", "_bit_count", "_hash_count", "_bits")
+
+    def __init__(self, capacity: int = 1000, error_rate: float = 0.01):
+        _check(capacity, error_rate)
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._count = 0
+        self._bit_count, self._hash_count = _sizes(capacity, error_rate)
+        self._bits = bytearray((self._bit_count + 7) // 8)
+
+    def add(self, element: Element) -> None:
+        if self._add(_hash(element)):
+            self._count += 1
+
+    def update(self, elements: Iterable[Element]) -> None:
+        for element in elements:
+            self.add(element)
+
+    def __contains__(self, element: object) -> bool:
+        try:
+            hashes = _hash(element)  # type: ignore[arg-type]
+        except TypeError:
+            return False
+        return self._contains(hashes)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_capacity(self) -> int:
+        return self._capacity
+
+    def get_error_rate(self) -> float:
+        return self._error_rate
+
+    def is_full(self) -> bool:
+        return self._count >= self._capacity
+
+    def false_positive_rate(self) -> float:
+        """
+        Returns:
+            The estimated probability of finding an element that was not added
+        """
+        return (1 - math.exp(-self._hash_count * self._count / self._bit_count)) ** self._hash_count
+
+    def union(self, other: BloomFilter) -> BloomFilter:
+        """
+        Returns:
+            A filter of the elements of both filters, as if they had all been added to it
+        """
+        return self._combine(other, lambda bits, other_bits: bits | other_bits)
+
+    def intersection(self, other: BloomFilter) -> BloomFilter:
+        """
+        Returns:
+            A filter of the elements of both filters. Its false positive rate is the one of the
+            largest of the filters, higher than if only the common elements had been added.
+        """
+        return self._combine(other, lambda bits, other_bits: bits & other_bits)
+
+    def __or__(self, other: BloomFilter) -> BloomFilter:
+        return self.union(other)
+
+    def __and__(self, other: BloomFilter) -> BloomFilter:
+        return self.intersection(other)
+
+    def copy(self) -> BloomFilter:
+        copy = self.__class__(self._capacity, self._error_rate)
+        copy._count = self._count
+        copy._bits[:] = self._bits
+        return copy
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            self._capacity,
+            self._error_rate,
+            self._count,
+            self._bit_count,
+            self._hash_count,
+        )
+        return header + self._bits
+
+    @classmethod
+    def from_bytes(cls, data: Buffer) -> BloomFilter:
+        """
+        Raises:
+            ValueError: if the data is not a serialized BloomFilter
+        """
+        _filter, end = cls._read(data, 0)
+        if end != len(data):
+            raise ValueError("Unexpected data after the filter")
+        return _filter
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BloomFilter):
+            return NotImplemented
+        return (
+            self._capacity == other._capacity
+            and self._error_rate == other._error_rate
+            and self._count == other._count
+            and self._bits == other._bits
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__.from_bytes, (self.to_bytes(),)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(capacity={self._capacity}, "
+            f"error_rate={self._error_rate}, len={self._count})"
+        )
+
+    def _add(self, hashes: Tuple[int, int]) -> bool:
+        bits, bit_count = self._bits, self._bit_count
+        position, step = hashes[0] % bit_count, hashes[1] % bit_count
+        added = False
+        for _ in range(self._hash_count):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+            position += step
+            if position >= bit_count:
+                position -= bit_count
+        return added
+
+    def _contains(self, hashes: Tuple[int, int]) -> bool:
+        # Stops at the first bit that is not set, which is the first or the second one for most
+        # of the elements that were not added
+        bits, bit_count = self._bits, self._bit_count
+        position, step = hashes[0] % bit_count, hashes[1] % bit_count
+        for _ in range(self._hash_count):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position += step
+            if position >= bit_count:
+                position -= bit_count
+        return True
+
+    def _combine(self, other: BloomFilter, operator: Any) -> BloomFilter:
+        if self._bit_count != other._bit_count or self._hash_count != other._hash_count:
+            raise ValueError("Only filters of the same capacity and error rate can be combined")
+        combined = self.__class__(self._capacity, self._error_rate)
+        bits = operator(int.from_bytes(self._bits, "little"), int.from_bytes(other._bits, "little"))
+        combined._bits[:] = bits.to_bytes(len(self._bits), "little")
+        combined._count = combined._estimate_count(bin(bits).count("1"))
+        return combined
+
+    def _estimate_count(self, set_bits: int) -> int:
+        # Swamidass and Baldi: the number of elements that set this number of bits on average
+        if set_bits >= self._bit_count:
+            return self._capacity
+        return round(-self._bit_count / self._hash_count * math.log(1 - set_bits / self._bit_count))
+
+    @classmethod
+    def _read(cls, data: Buffer, offset: int) -> Tuple[BloomFilter, int]:
+        if len(data) - offset < _HEADER.size:
+            raise ValueError("Not a serialized BloomFilter")
+        magic, version, capacity, error_rate, count, bit_count, hash_count = _HEADER.unpack_from(
+            data, offset
+        )
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized BloomFilter")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported version {version}")
+
+        _check(capacity, error_rate)
+        if _sizes(capacity, error_rate) != (bit_count, hash_count):
+            raise ValueError("Inconsistent BloomFilter parameters")
+        # Checked before the bits are allocated, so that a header cannot allocate more bytes
+        # than the data holds
+        start = offset + _HEADER.size
+        end = start + (bit_count + 7) // 8
+        if len(data) < end:
+            raise ValueError("Truncated BloomFilter")
+        _filter = cls(capacity, error_rate)
+        _filter._bits[:] = data[start:end]
+        _filter._count = count
+        return _filter, end
+
+
+class ScalableBloomFilter:
+    """
+    A BloomFilter that grows with the number of elements, for when that number is not known in
+    advance (Almeida et al.). The elements are added to a filter of `initial_capacity` elements
+    until it is full, then to a new filter `growth` times larger, and so on. Every new filter
+    has a false positive rate `tightening` times lower than the previous one, so the false
+    positive rate of all the filters stays around `error_rate`. Membership tests and `add` are
+    O(log n).
+
+    Filters created with the same parameters can be combined with `union`, and are serialized
+    with `to_bytes`. Their intersection is not supported: an element can be in filters of
+    different sizes in each of them.
+    """
+
+    __slots__ = (
+        "_initial_capacity",
+        "_error_rate",
+        "_growth",
+        "_tightening",
+        "_filters",
+        "_next_index",
+    )
+
+    def __init__(
+        self,
+        initial_capacity: int = 1000,
+        error_rate: float = 0.01,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ):
+        _check(initial_capacity, error_rate)
+        if growth < 1:
+            raise ValueError("growth must be positive")
+        if not 0 < tightening < 1:
+            raise ValueError("tightening must be between 0 and 1")
+
+        self._initial_capacity = initial_capacity
+        self._error_rate = error_rate
+        self._growth = growth
+        self._tightening = tightening
+        self._filters: List[BloomFilter] = []
+        # Position in the growth sequence of the next filter. A union holds the filters of both
+        # operands, so it can have more filters than the sequence has steps.
+        self._next_index = 0
+
+    def add(self, element: Element) -> None:
+        hashes = _hash(element)
+        filters = self._filters
+        if self._contains(hashes):
+            return
+        if not filters or filters[-1].is_full():
+            filters.append(self._new_filter(self._next_index))
+            self._next_index += 1
+        filters[-1]._add(hashes)
+        filters[-1]._count += 1
+
+    def update(self, elements: Iterable[Element]) -> None:
+        for element in elements:
+            self.add(element)
+
+    def __contains__(self, element: object) -> bool:
+        try:
+            hashes = _hash(element)  # type: ignore[arg-type]
+        except TypeError:
+            return False
+        return self._contains(hashes)
+
+    def __len__(self) -> int:
+        return sum(len(_filter) for _filter in self._filters)
+
+    def get_error_rate(self) -> float:
+        return self._error_rate
+
+    def get_capacity(self) -> int:
+        """
+        Returns:
+            The number of elements the filter holds before it adds a new filter
+        """
+        return sum(_filter.get_capacity() for _filter in self._filters)
+
+    def false_positive_rate(self) -> float:
+        """
+        Returns:
+            The estimated probability of finding an element that was not added
+        """
+        return 1 - math.prod(1 - _filter.false_positive_rate() for _filter in self._filters)
+
+    def union(self, other: ScalableBloomFilter) -> ScalableBloomFilter:
+        """
+        Returns:
+            A filter of the elements of both filters, which keeps the filters of both, but only
+            one copy of the filters they share. Its false positive rate is about the sum of
+            theirs, at most twice `error_rate`. ORing the filters of the same size instead would
+            add the elements of both to every one of them, past their capacity. Its `len` is the
+            sum of theirs, which counts the elements added to both filters twice, unless they
+            are in a filter that both share.
+        """
+        if self._parameters() != other._parameters():
+            raise ValueError("Only filters created with the same parameters can be combined")
+        union = self._empty_copy()
+        filters: List[BloomFilter] = []
+        # The largest filter stays last, and the union does not depend on the order of operands
+        for _filter in sorted(
+            self._filters + other._filters,
+            key=lambda _filter: (_filter._capacity, _filter._bits),
+        ):
+            if not filters or filters[-1] != _filter:
+                filters.append(_filter.copy())
+        union._filters = filters
+        union._next_index = max(self._next_index, other._next_index)
+        return union
+
+    def __or__(self, other: ScalableBloomFilter) -> ScalableBloomFilter:
+        return self.union(other)
+
+    def copy(self) -> ScalableBloomFilter:
+        copy = self._empty_copy()
+        copy._filters = [_filter.copy() for _filter in self._filters]
+        copy._next_index = self._next_index
+        return copy
+
+    def to_bytes(self) -> bytes:
+        chunks = [
+            _SCALABLE_HEADER.pack(
+                _SCALABLE_MAGIC, _VERSION, *self._parameters(), len(self._filters)
+            )
+        ]
+        for _filter in self._filters:
+            data = _filter.to_bytes()
+            chunks.append(_LENGTH.pack(len(data)))
+            chunks.append(data)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: Buffer) -> ScalableBloomFilter:
+        """
+        Raises:
+            ValueError: if the data is not a serialized ScalableBloomFilter
+        """
+        if len(data) < _SCALABLE_HEADER.size:
+            raise ValueError("Not a serialized ScalableBloomFilter")
+        (
+            magic,
+            version,
+            initial_capacity,
+            error_rate,
+            growth,
+            tightening,
+            filter_count,
+        ) = _SCALABLE_HEADER.unpack_from(data)
+        if magic != _SCALABLE_MAGIC:
+            raise ValueError("Not a serialized ScalableBloomFilter")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported version {version}")
+
+        scalable_filter = cls(initial_capacity, error_rate, growth, tightening)
+        offset = _SCALABLE_HEADER.size
+        for _ in range(filter_count):
+            if len(data) - offset < _LENGTH.size:
+                raise ValueError("Truncated ScalableBloomFilter")
+            (length,) = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            _filter, end = BloomFilter._read(data, offset)
+            if end != offset + length:
+                raise ValueError("Inconsistent ScalableBloomFilter length")
+            scalable_filter._filters.append(_filter)
+            scalable_filter._next_index = max(
+                scalable_filter._next_index, scalable_filter._index(_filter) + 1
+            )
+            offset = end
+        if offset != len(data):
+            raise ValueError("Unexpected data after the filter")
+        return scalable_filter
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ScalableBloomFilter):
+            return NotImplemented
+        return self._parameters() == other._parameters() and self._filters == other._filters
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__.from_bytes, (self.to_bytes(),)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(initial_capacity={self._initial_capacity}, "
+            f"error_rate={self._error_rate}, len={len(self)})"
+        )
+
+    def _contains(self, hashes: Tuple[int, int]) -> bool:
+        # The last filter is the largest one, which holds most of the elements
+        for _filter in reversed(self._filters):
+            if _filter._contains(hashes):
+                return True
+        return False
+
+    def _parameters(self) -> Tuple[int, float, int, float]:
+        return self._initial_capacity, self._error_rate, self._growth, self._tightening
+
+    def _empty_copy(self) -> ScalableBloomFilter:
+        return self.__class__(*self._parameters())
+
+    def _index(self, _filter: BloomFilter) -> int:
+        # The position of a filter in the growth sequence, from its error rate, which gets
+        # lower at every step whatever the growth
+        first_error_rate = self._error_rate * (1 - self._tightening)
+        return max(0, round(math.log(_filter._error_rate / first_error_rate, self._tightening)))
+
+    def _new_filter(self, index: int) -> BloomFilter:
+        return BloomFilter(
+            self._initial_capacity * self._growth**index,
+            self._error_rate * (1 - self._tightening) * self._tightening**index,
+        )
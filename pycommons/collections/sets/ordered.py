@@ -1,35 +1,264 @@
 from __future__ import annotations
 
-from typing import TypeVar, List, Iterable, Union, Set, Iterator
+import typing
+from typing import (
+    TypeVar,
+    List,
+    Iterable,
+    Union,
+    Iterator,
+    Dict,
+    Optional,
+    MutableSet,
+    Set,
+    Tuple,
+    AbstractSet,
+    Any,
+    overload,
+)
 
 _T = TypeVar("_T")
 
 
-class OrderedSet(Set[_T]):
-    def __init__(self, iterable: Iterable[_T] = ()):
-        super().__init__(iterable)
-        self._order: List[_T] = []
+def _as_set(iterable: Iterable[_T]) -> AbstractSet[_T]:
+    return iterable if isinstance(iterable, AbstractSet) else set(iterable)
+
+
+class OrderedSet(MutableSet[_T]):
+    """
+    A set that remembers the order in which the elements were inserted. The elements are
+    stored once as the keys of an insertion-ordered dict, which gives O(1) `add`, `discard`
+    and membership tests.
+
+    A positional index (a plain list of the elements) is built lazily for `__getitem__` and
+    `popleft`. It is kept up to date on appends and removals from either end, and is rebuilt
+    on the next positional access after an element is removed from the middle.
+
+    The set operators and the named set methods (`union`, `intersection`, `difference`,
+    `issubset`...) keep the order of the set. OrderedSet is not a subclass of the builtin set,
+    `isinstance(ordered_set, collections.abc.Set)` is the check to use.
+    """
+
+    __slots__ = ("_data", "_index", "_head", "_removed", "_holes")
 
-        _copy_set = set()
-        for _set_item in iter(iterable):
-            if _set_item not in _copy_set:
-                self._order.append(_set_item)
-                _copy_set.add(_set_item)
+    _COMPACTION_THRESHOLD = 32
+
+    def __init__(self, iterable: Iterable[_T] = ()):
+        self._data: Dict[_T, None] = dict.fromkeys(iterable)
+        self._index: Optional[List[_T]] = None
+        self._head: int = 0
+        # Elements removed from the middle of the index, created with the first such removal
+        self._removed: Optional[Set[_T]] = None
+        self._holes: int = 0
 
     def add(self, element: _T) -> None:
-        if element not in self:
-            self._order.append(element)
+        if element in self._data:
+            return
 
-        super().add(element)
+        self._data[element] = None
+        if self._index is not None:
+            if self._removed and element in self._removed:
+                # A stale copy of the element is still in the index. Drop the index instead
+                # of searching for it, it will be rebuilt on the next positional access.
+                self._drop_index()
+            else:
+                self._index.append(element)
 
     def discard(self, element: _T) -> None:
-        if element in self:
-            self._order.remove(element)
+        if element not in self._data:
+            return
+
+        if self._index is not None:
+            if self._index[self._head] == element:
+                self._head += 1
+                self._skip_stale_head()
+            elif self._index[-1] == element:
+                self._index.pop()
+                self._skip_stale_tail()
+            else:
+                if self._removed is None:
+                    self._removed = set()
+                self._removed.add(element)
+
+        del self._data[element]
+        self._holes += 1
+        self._compact()
+
+    def pop(self) -> _T:
+        """
+        Remove and return the last element of the set.
+
+        Returns:
+            The most recently inserted element
+        """
+        if not self._data:
+            raise KeyError(f"pop from an empty {self.__class__.__name__}")
+
+        element, _ = self._data.popitem()
+        if self._index is not None:
+            self._index.pop()
+            self._skip_stale_tail()
+        return element
+
+    def popleft(self) -> _T:
+        """
+        Remove and return the first element of the set.
+
+        Returns:
+            The least recently inserted element
+        """
+        if not self._data:
+            raise KeyError(f"pop from an empty {self.__class__.__name__}")
+
+        index = self._ensure_index()
+        element = index[self._head]
+        self._head += 1
+        self._skip_stale_head()
+
+        del self._data[element]
+        self._holes += 1
+        self._compact()
+        return element
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._drop_index()
+        self._holes = 0
+
+    def update(self, *iterables: Iterable[_T]) -> None:
+        for iterable in iterables:
+            for element in iterable:
+                self.add(element)
+
+    def union(self, *iterables: Iterable[_T]) -> OrderedSet[_T]:
+        _copy = self.copy()
+        _copy.update(*iterables)
+        return _copy
+
+    def intersection(self, *iterables: Iterable[_T]) -> OrderedSet[_T]:
+        """
+        Returns:
+            The elements of the set that are in all the iterables, in the order of the set
+        """
+        _copy = self.copy()
+        _copy.intersection_update(*iterables)
+        return _copy
+
+    def difference(self, *iterables: Iterable[_T]) -> OrderedSet[_T]:
+        """
+        Returns:
+            The elements of the set that are in none of the iterables, in the order of the set
+        """
+        _copy = self.copy()
+        _copy.difference_update(*iterables)
+        return _copy
+
+    def symmetric_difference(self, iterable: Iterable[_T]) -> OrderedSet[_T]:
+        """
+        Returns:
+            The elements of the set that are not in the iterable, followed by the elements of
+            the iterable that are not in the set
+        """
+        _copy = self.copy()
+        _copy.symmetric_difference_update(iterable)
+        return _copy
+
+    def intersection_update(self, *iterables: Iterable[_T]) -> None:
+        for iterable in iterables:
+            other = _as_set(iterable)
+            for element in [element for element in self._data if element not in other]:
+                self.discard(element)
+
+    def difference_update(self, *iterables: Iterable[_T]) -> None:
+        for iterable in iterables:
+            for element in iterable:
+                self.discard(element)
+
+    def symmetric_difference_update(self, iterable: Iterable[_T]) -> None:
+        other = dict.fromkeys(iterable)
+        common = [element for element in other if element in self._data]
+        self.update(element for element in other if element not in self._data)
+        for element in common:
+            self.discard(element)
+
+    def issubset(self, iterable: Iterable[_T]) -> bool:
+        return self <= _as_set(iterable)
+
+    def issuperset(self, iterable: Iterable[_T]) -> bool:
+        return all(element in self._data for element in iterable)
+
+    def copy(self) -> OrderedSet[_T]:
+        return self.__class__(self._data)
+
+    def __contains__(self, element: object) -> bool:
+        return element in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
 
     def __iter__(self) -> Iterator[_T]:
-        return iter(self._order)
+        return iter(self._data)
+
+    def __reversed__(self) -> Iterator[_T]:
+        return reversed(self._data.keys())
+
+    @overload
+    def __getitem__(self, item: int) -> _T:
+        ...
+
+    @overload
+    def __getitem__(self, item: slice) -> OrderedSet[_T]:
+        ...
 
     def __getitem__(self, item: Union[int, slice]) -> Union[OrderedSet[_T], _T]:
+        index = self._ensure_index(dense=True)
         if isinstance(item, slice):
-            return OrderedSet(self._order[item])
-        return self._order[item]
+            return self.__class__(index[self._head :][item])
+
+        size = len(self._data)
+        position = item + size if item < 0 else item
+        if not 0 <= position < size:
+            raise IndexError(f"{self.__class__.__name__} index out of range")
+        return index[self._head + position]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self._data)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (list(self._data),)
+
+    def _ensure_index(self, dense: bool = False) -> List[_T]:
+        if self._index is None or (dense and self._removed):
+            self._index = list(self._data)
+            self._head = 0
+            self._removed = None
+        elif self._head > self._COMPACTION_THRESHOLD and self._head * 2 > len(self._index):
+            del self._index[: self._head]
+            self._head = 0
+        return self._index
+
+    def _drop_index(self) -> None:
+        self._index = None
+        self._head = 0
+        self._removed = None
+
+    def _skip_stale_head(self) -> None:
+        index = typing.cast(List[_T], self._index)
+        removed = self._removed
+        while removed and self._head < len(index) and index[self._head] in removed:
+            removed.discard(index[self._head])
+            self._head += 1
+
+    def _skip_stale_tail(self) -> None:
+        index = typing.cast(List[_T], self._index)
+        removed = self._removed
+        while removed and len(index) > self._head and index[-1] in removed:
+            removed.discard(index.pop())
+
+    def _compact(self) -> None:
+        # Deleting from a dict leaves a dummy entry behind, which iteration has to skip.
+        # Re-creating the dict once the dummies outnumber the elements keeps iteration
+        # linear in the size of the set at an amortized O(1) cost per removal.
+        if self._holes > self._COMPACTION_THRESHOLD and self._holes > len(self._data):
+            self._data = dict.fromkeys(self._data)
+            self._holes = 0
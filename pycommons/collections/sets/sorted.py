@@ -0,0 +1,403 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+from typing import (
+    AbstractSet,
+    Any,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    MutableSet,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+_T = TypeVar("_T")
+
+
+class _SortedList(Generic[_T]):
+    """
+    The sorted, distinct elements of a SortedSet or the keys of a SortedMap. The elements are
+    split into sorted sublists of at most `2 * _LOAD` elements, with the maximum of every
+    sublist kept in `_maxes`, so an insertion or a removal only bisects `_maxes` and moves the
+    elements of one sublist. The offsets of the sublists, used to find an element by its
+    position, are computed on the first positional access after a change.
+
+    The elements must be comparable with each other, and the callers must not add an element
+    that is already in the list or remove one that is not.
+    """
+
+    __slots__ = ("_lists", "_maxes", "_offsets", "_size")
+
+    _LOAD = 1000
+
+    def __init__(self, iterable: Iterable[_T] = ()):
+        self._lists: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        self._offsets: List[int] = []
+        elements: List[Any] = sorted(iterable)
+        for start in range(0, len(elements), self._LOAD):
+            self._lists.append(elements[start : start + self._LOAD])
+            self._maxes.append(self._lists[-1][-1])
+        self._size = len(elements)
+
+    def add(self, element: _T) -> None:
+        maxes = self._maxes
+        if not maxes:
+            self._lists.append([element])
+            maxes.append(element)
+        else:
+            position = bisect.bisect_left(maxes, element)
+            if position == len(maxes):
+                position -= 1
+                self._lists[position].append(element)
+                maxes[position] = element
+            else:
+                bisect.insort(self._lists[position], element)
+            if len(self._lists[position]) > 2 * self._LOAD:
+                self._split(position)
+        self._size += 1
+        self._offsets.clear()
+
+    def remove(self, element: _T) -> None:
+        position = bisect.bisect_left(self._maxes, element)
+        _list = self._lists[position]
+        del _list[bisect.bisect_left(_list, element)]
+        self._size -= 1
+        self._offsets.clear()
+
+        if not _list:
+            del self._lists[position]
+            del self._maxes[position]
+        else:
+            self._maxes[position] = _list[-1]
+            if len(_list) < self._LOAD // 2 and len(self._lists) > 1:
+                self._merge(position)
+
+    def clear(self) -> None:
+        self._lists.clear()
+        self._maxes.clear()
+        self._offsets.clear()
+        self._size = 0
+
+    def bisect_left(self, element: Any) -> int:
+        """
+        Returns:
+            The number of elements lower than the element
+        """
+        position = bisect.bisect_left(self._maxes, element)
+        if position == len(self._maxes):
+            return self._size
+        return self._offset(position) + bisect.bisect_left(self._lists[position], element)
+
+    def bisect_right(self, element: Any) -> int:
+        """
+        Returns:
+            The number of elements lower than or equal to the element
+        """
+        position = bisect.bisect_right(self._maxes, element)
+        if position == len(self._maxes):
+            return self._size
+        return self._offset(position) + bisect.bisect_right(self._lists[position], element)
+
+    def __getitem__(self, index: int) -> _T:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("index out of range")
+
+        position, offset = self._locate(index)
+        element: _T = self._lists[position][offset]
+        return element
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[_T]:
+        return itertools.chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator[_T]:
+        return itertools.chain.from_iterable(reversed(_list) for _list in reversed(self._lists))
+
+    def iterate(self, start: int, stop: int, reverse: bool = False) -> Iterator[_T]:
+        """
+        Iterate the elements from position `start` (included) to `stop` (excluded).
+        """
+        if start >= stop:
+            return
+        position, offset = self._locate(start)
+        last_position, last_offset = self._locate(stop - 1)
+        if not reverse:
+            if position == last_position:
+                yield from self._lists[position][offset : last_offset + 1]
+                return
+            yield from self._lists[position][offset:]
+            for _list in self._lists[position + 1 : last_position]:
+                yield from _list
+            yield from self._lists[last_position][: last_offset + 1]
+        else:
+            if position == last_position:
+                yield from reversed(self._lists[position][offset : last_offset + 1])
+                return
+            yield from reversed(self._lists[last_position][: last_offset + 1])
+            for _list in reversed(self._lists[position + 1 : last_position]):
+                yield from reversed(_list)
+            yield from reversed(self._lists[position][offset:])
+
+    def copy(self) -> _SortedList[_T]:
+        copy: _SortedList[_T] = _SortedList()
+        copy._lists = [list(_list) for _list in self._lists]  # pylint: disable=W0212
+        copy._maxes = list(self._maxes)  # pylint: disable=W0212
+        copy._size = self._size  # pylint: disable=W0212
+        return copy
+
+    def _offset(self, position: int) -> int:
+        if not self._offsets:
+            self._offsets = list(
+                itertools.accumulate((len(_list) for _list in self._lists), initial=0)
+            )
+        return self._offsets[position]
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        self._offset(0)
+        position = bisect.bisect_right(self._offsets, index) - 1
+        return position, index - self._offsets[position]
+
+    def _split(self, position: int) -> None:
+        _list = self._lists[position]
+        half = _list[self._LOAD :]
+        del _list[self._LOAD :]
+        self._maxes[position] = _list[-1]
+        self._lists.insert(position + 1, half)
+        self._maxes.insert(position + 1, half[-1])
+
+    def _merge(self, position: int) -> None:
+        if position == len(self._lists) - 1:
+            position -= 1
+        self._lists[position].extend(self._lists.pop(position + 1))
+        del self._maxes[position]
+        self._maxes[position] = self._lists[position][-1]
+        if len(self._lists[position]) > 2 * self._LOAD:
+            self._split(position)
+
+
+class _Range:
+    """
+    Bounds of a range of sorted elements. A bound of None is unbounded.
+    """
+
+    __slots__ = ("lower", "lower_inclusive", "upper", "upper_inclusive")
+
+    def __init__(
+        self,
+        lower: Any = None,
+        lower_inclusive: bool = True,
+        upper: Any = None,
+        upper_inclusive: bool = False,
+    ):
+        self.lower = lower
+        self.lower_inclusive = lower_inclusive
+        self.upper = upper
+        self.upper_inclusive = upper_inclusive
+
+    def __contains__(self, element: Any) -> bool:
+        if self.lower is not None:
+            if element < self.lower or (not self.lower_inclusive and element == self.lower):
+                return False
+        if self.upper is not None:
+            if self.upper < element or (not self.upper_inclusive and element == self.upper):
+                return False
+        return True
+
+    def positions(self, elements: _SortedList[Any]) -> Tuple[int, int]:
+        """
+        Returns:
+            The position of the first element in the range and the position after the last
+        """
+        start = 0
+        if self.lower is not None:
+            start = (
+                elements.bisect_left(self.lower)
+                if self.lower_inclusive
+                else elements.bisect_right(self.lower)
+            )
+        stop = len(elements)
+        if self.upper is not None:
+            stop = (
+                elements.bisect_right(self.upper)
+                if self.upper_inclusive
+                else elements.bisect_left(self.upper)
+            )
+        return start, max(start, stop)
+
+
+def _floor(elements: _SortedList[_T], element: Any, inclusive: bool) -> Optional[_T]:
+    position = elements.bisect_right(element) if inclusive else elements.bisect_left(element)
+    return elements[position - 1] if position else None
+
+
+def _ceiling(elements: _SortedList[_T], element: Any, inclusive: bool) -> Optional[_T]:
+    position = elements.bisect_left(element) if inclusive else elements.bisect_right(element)
+    return elements[position] if position < len(elements) else None
+
+
+class SortedSet(MutableSet[_T]):
+    """
+    A set that keeps its elements sorted. Membership tests are O(1), `add` and `discard` are
+    O(log n), and the elements can be looked up by their position (`set[i]`, `rank`) and by
+    their neighbours (`floor`, `ceiling`, `lower`, `higher`). `head_set`, `tail_set` and
+    `sub_set` return views of a range of the set, which follow the changes of the set.
+
+    The elements must be hashable and comparable with each other, and cannot be None.
+    """
+
+    __slots__ = ("_members", "_elements")
+
+    def __init__(self, iterable: Iterable[_T] = ()):
+        self._members: Set[_T] = set(iterable)
+        self._elements: _SortedList[_T] = _SortedList(self._members)
+
+    def add(self, element: _T) -> None:
+        if element not in self._members:
+            self._elements.add(element)
+            self._members.add(element)
+
+    def discard(self, element: _T) -> None:
+        if element in self._members:
+            self._members.remove(element)
+            self._elements.remove(element)
+
+    def pop(self) -> _T:
+        """
+        Remove and return the greatest element.
+        """
+        if not self._members:
+            raise KeyError(f"pop from an empty {self.__class__.__name__}")
+        element = self._elements[-1]
+        self.discard(element)
+        return element
+
+    def clear(self) -> None:
+        self._members.clear()
+        self._elements.clear()
+
+    def copy(self) -> SortedSet[_T]:
+        copy: SortedSet[_T] = self.__class__()
+        copy._members = set(self._members)  # pylint: disable=W0212
+        copy._elements = self._elements.copy()  # pylint: disable=W0212
+        return copy
+
+    def __contains__(self, element: object) -> bool:
+        return element in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[_T]:
+        return iter(self._elements)
+
+    def __reversed__(self) -> Iterator[_T]:
+        return reversed(self._elements)
+
+    def __getitem__(self, index: int) -> _T:
+        return self._elements[index]
+
+    def rank(self, element: _T) -> int:
+        """
+        Returns:
+            The number of elements lower than the element, i.e. its position if it is in the set
+        """
+        return self._elements.bisect_left(element)
+
+    def first(self) -> _T:
+        if not self._members:
+            raise KeyError(f"{self.__class__.__name__} is empty")
+        return self._elements[0]
+
+    def last(self) -> _T:
+        if not self._members:
+            raise KeyError(f"{self.__class__.__name__} is empty")
+        return self._elements[-1]
+
+    def floor(self, element: _T) -> Optional[_T]:
+        """
+        Returns:
+            The greatest element lower than or equal to the element, or None
+        """
+        return _floor(self._elements, element, True)
+
+    def lower(self, element: _T) -> Optional[_T]:
+        """
+        Returns:
+            The greatest element strictly lower than the element, or None
+        """
+        return _floor(self._elements, element, False)
+
+    def ceiling(self, element: _T) -> Optional[_T]:
+        """
+        Returns:
+            The lowest element greater than or equal to the element, or None
+        """
+        return _ceiling(self._elements, element, True)
+
+    def higher(self, element: _T) -> Optional[_T]:
+        """
+        Returns:
+            The lowest element strictly greater than the element, or None
+        """
+        return _ceiling(self._elements, element, False)
+
+    def head_set(self, to_element: _T, inclusive: bool = False) -> SortedSetView[_T]:
+        return SortedSetView(self, _Range(upper=to_element, upper_inclusive=inclusive))
+
+    def tail_set(self, from_element: _T, inclusive: bool = True) -> SortedSetView[_T]:
+        return SortedSetView(self, _Range(lower=from_element, lower_inclusive=inclusive))
+
+    def sub_set(
+        self,
+        from_element: _T,
+        to_element: _T,
+        from_inclusive: bool = True,
+        to_inclusive: bool = False,
+    ) -> SortedSetView[_T]:
+        return SortedSetView(self, _Range(from_element, from_inclusive, to_element, to_inclusive))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self._elements)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (list(self._elements),)
+
+
+class SortedSetView(AbstractSet[_T]):
+    """
+    The elements of a SortedSet in a range, in order. The view reads the set, it is not a copy.
+    """
+
+    __slots__ = ("_set", "_range")
+
+    def __init__(self, sorted_set: SortedSet[_T], _range: _Range):
+        self._set = sorted_set
+        self._range = _range
+
+    def __contains__(self, element: object) -> bool:
+        return element in self._set and element in self._range
+
+    def __len__(self) -> int:
+        start, stop = self._range.positions(self._set._elements)  # pylint: disable=W0212
+        return stop - start
+
+    def __iter__(self) -> Iterator[_T]:
+        elements = self._set._elements  # pylint: disable=W0212
+        return elements.iterate(*self._range.positions(elements))
+
+    def __reversed__(self) -> Iterator[_T]:
+        elements = self._set._elements  # pylint: disable=W0212
+        return elements.iterate(*self._range.positions(elements), reverse=True)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
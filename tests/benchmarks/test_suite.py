@@ -0,0 +1,33 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmarks import suite
+
+
+class TestSuite(TestCase):
+    def test_smoke(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            with contextlib.redirect_stderr(io.StringIO()):
+                arguments = ["--sizes", "1,10", "--repeat", "2", "--output", output]
+                self.assertEqual(0, suite.main(arguments))
+
+            with open(output, encoding="utf-8") as file:
+                results = json.load(file)["results"]
+
+        keys = [
+            (result["group"], result["case"], result["operation"], result["size"])
+            for result in results
+        ]
+        self.assertEqual(len(keys), len(set(keys)))
+        operations = {(result["group"], result["case"], result["operation"]) for result in results}
+        for case in suite.MAP_CASES:
+            self.assertIn(("maps", case.name, "get"), operations)
+        self.assertIn(("maps", "IterableMap", "delete"), operations)
+        self.assertIn(("sets", "OrderedSet", "discard"), operations)
+        self.assertIn(("predicates", "AndPredicate", "test_many"), operations)
+        self.assertEqual([], suite.regressions(results, results, 0.25))
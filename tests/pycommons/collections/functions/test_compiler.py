@@ -0,0 +1,153 @@
+import random
+from unittest import TestCase
+
+from pycommons.base.function.predicate import PassingPredicate, Predicate, FailingPredicate
+
+from pycommons.collections.functions.compiler import compile_predicate
+from pycommons.collections.functions.predicate import (
+    AllPredicate,
+    AnyPredicate,
+    NeitherPredicate,
+    ExactCountPredicate,
+    NotPredicate,
+    EqualsPredicate,
+    NotEqualsPredicate,
+    InPredicate,
+    NotInPredicate,
+    NonePredicate,
+    NoneIsFalsePredicate,
+    AndPredicate,
+    OrPredicate,
+    IdentityPredicate,
+)
+
+_NAN = float("nan")
+# NaN is not equal to itself, and a frozenset also finds a value by identity
+_VALUES = [None, True, False, 0, 1, 1.0, 2, -1, "a", "b", b"a", (1, 2), _NAN, float("nan"), [1], {}]
+
+
+def _random_predicate(  # pylint: disable=R0911
+    generator: random.Random, depth: int
+) -> Predicate[object]:
+    kind = generator.randrange(12 if depth else 7)
+    if kind == 0:
+        return EqualsPredicate(generator.choice(_VALUES))
+    if kind == 1:
+        return NotEqualsPredicate(generator.choice(_VALUES))
+    if kind == 2:
+        return IdentityPredicate(generator.choice(_VALUES))
+    if kind == 3:
+        return InPredicate(generator.sample(_VALUES[:14], generator.randrange(4)))
+    if kind == 4:
+        return NotInPredicate(generator.sample(_VALUES[:14], generator.randrange(4)))
+    if kind == 5:
+        return PassingPredicate()
+    if kind == 6:
+        return FailingPredicate()
+
+    children = [_random_predicate(generator, depth - 1) for _ in range(generator.randrange(4))]
+    if kind == 7:
+        return AllPredicate(children)
+    if kind == 8:
+        return AnyPredicate(children)
+    if kind == 9:
+        return NeitherPredicate(children)
+    if kind == 10:
+        return ExactCountPredicate(children, generator.randrange(len(children) + 1))
+    return NotPredicate(_random_predicate(generator, depth - 1))
+
+
+class TestCompilePredicate(TestCase):
+    def assert_same_results(self, predicate, values):
+        compiled_predicate = compile_predicate(predicate)
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(predicate.test(value), compiled_predicate.test(value))
+        return compiled_predicate
+
+    def test_equals_and_in_groups_are_merged(self):
+        predicate: Predicate[int] = AnyPredicate(
+            (EqualsPredicate(1), EqualsPredicate(2), InPredicate([3, 4]), InPredicate((5,)))
+        )
+
+        compiled_predicate = self.assert_same_results(predicate, range(-1, 8))
+        self.assertIn("(value in _c0)", compiled_predicate.get_source())
+        self.assertIs(predicate, compiled_predicate.get_predicate())
+
+    def test_double_negation_and_constants_are_removed(self):
+        predicate: Predicate[int] = AllPredicate(
+            (
+                NotPredicate(NotPredicate(EqualsPredicate(1))),
+                PassingPredicate(),
+                AndPredicate(NoneIsFalsePredicate, PassingPredicate()),
+            )
+        )
+
+        compiled_predicate = self.assert_same_results(predicate, [None, 0, 1, 2])
+        self.assertNotIn("not (", compiled_predicate.get_source())
+        self.assertNotIn("True and", compiled_predicate.get_source())
+
+    def test_constant_folding(self):
+        predicate: Predicate[int] = AnyPredicate(
+            (
+                NotPredicate(PassingPredicate()),
+                AllPredicate((FailingPredicate(), EqualsPredicate(1))),
+            )
+        )
+
+        compiled_predicate = self.assert_same_results(predicate, [0, 1])
+        self.assertIn("if False", compiled_predicate.get_source())
+
+    def test_neither_and_exact_count(self):
+        is_even: Predicate[int] = Predicate.of(lambda i: i % 2 == 0)
+        predicates = (
+            NeitherPredicate((EqualsPredicate(1), NotEqualsPredicate(2), is_even)),
+            ExactCountPredicate((EqualsPredicate(1), is_even, InPredicate([1, 2, 3])), 2),
+            ExactCountPredicate((PassingPredicate(), is_even, NotInPredicate([4])), 1),
+            ExactCountPredicate((PassingPredicate(), FailingPredicate(), is_even), 0),
+            ExactCountPredicate((is_even, NonePredicate), 2),
+            OrPredicate(is_even, EqualsPredicate(4)),
+        )
+
+        for predicate in predicates:
+            self.assert_same_results(predicate, range(-2, 7))
+
+    def test_unhashable_values(self):
+        predicate: Predicate[object] = AnyPredicate(
+            (InPredicate([1, 2]), InPredicate([[3]]), EqualsPredicate([4]))
+        )
+
+        self.assert_same_results(predicate, [1, 3, [3], [4], (1,)])
+
+    def test_leaf_type_error_raised_once(self):
+        calls = []
+
+        def _test(value: object) -> bool:
+            calls.append(value)
+            raise TypeError(value)
+
+        predicate: Predicate[object] = AnyPredicate((InPredicate([1, 2]), Predicate.of(_test)))
+        compiled_predicate = compile_predicate(predicate)
+
+        with self.assertRaises(TypeError):
+            compiled_predicate.test(3)
+        self.assertListEqual([3], calls)
+
+    def test_randomized_trees(self):
+        generator = random.Random(8)
+        for _ in range(500):
+            predicate = _random_predicate(generator, 3)
+            compiled_predicate = compile_predicate(predicate)
+            for value in _VALUES:
+                self.assertEqual(
+                    predicate.test(value),
+                    compiled_predicate.test(value),
+                    f"{compiled_predicate.get_source()} with {value!r}",
+                )
+
+    def test_nan_is_not_merged(self):
+        predicate: Predicate[float] = AnyPredicate((EqualsPredicate(_NAN), EqualsPredicate(1.0)))
+
+        compiled_predicate = self.assert_same_results(predicate, [_NAN, 1.0, 1, 2.0])
+        self.assertFalse(compiled_predicate.test(_NAN))
+        self.assertIn("(value == _c0)", compiled_predicate.get_source())
@@ -0,0 +1,99 @@
+import threading
+from unittest import TestCase
+
+from pycommons.base.function import Predicate, Supplier
+
+from pycommons.collections.functions.memoized import MemoizedPredicate
+
+
+class TestMemoizedPredicate(TestCase):
+    def setUp(self):
+        self.tested = []
+
+        def _test(value):
+            self.tested.append(value)
+            return len(value) > 1
+
+        self.predicate = Predicate.of(_test)
+
+    def test_memoized_predicate(self):
+        predicate = MemoizedPredicate(self.predicate, max_size=2)
+
+        self.assertTrue(predicate.test("ab"))
+        self.assertTrue(predicate.test("ab"))
+        self.assertFalse(predicate.test("a"))
+        self.assertFalse(predicate.test("a"))
+        self.assertTrue(predicate.test("abc"))
+        self.assertTrue(predicate.test("ab"))
+
+        self.assertListEqual(["ab", "a", "abc", "ab"], self.tested)
+        self.assertEqual(2, predicate.cache_size())
+        self.assertTupleEqual((self.predicate,), predicate.get_predicates())
+
+        statistics = predicate.get_statistics()
+        self.assertEqual(2, statistics.hits)
+        self.assertEqual(4, statistics.misses)
+        self.assertEqual(2, statistics.evictions)
+
+        predicate.reset_statistics()
+        predicate.clear_cache()
+        self.assertEqual(0, predicate.get_statistics().requests())
+        self.assertEqual(0, predicate.cache_size())
+
+    def test_unhashable_values(self):
+        predicate = MemoizedPredicate(self.predicate)
+
+        self.assertTrue(predicate.test([1, 2]))
+        self.assertTrue(predicate.test([1, 2]))
+        self.assertEqual(2, len(self.tested))
+        self.assertEqual(0, predicate.cache_size())
+
+    def test_equal_values_of_other_types(self):
+        predicate = MemoizedPredicate(Predicate.of(lambda value: isinstance(value, bool)))
+
+        self.assertFalse(predicate.test(1))
+        self.assertTrue(predicate.test(True))
+        self.assertFalse(predicate.test(1.0))
+        self.assertTrue(predicate.test(True))
+        self.assertEqual(3, predicate.cache_size())
+        self.assertEqual(1, predicate.get_statistics().hits)
+
+    def test_by_identity(self):
+        predicate = MemoizedPredicate(self.predicate, by_identity=True)
+        value = [1, 2]
+
+        self.assertTrue(predicate.test(value))
+        self.assertTrue(predicate.test(value))
+        self.assertTrue(predicate.test([1, 2]))
+        self.assertEqual(2, len(self.tested))
+        self.assertEqual(1, predicate.get_statistics().hits)
+
+    def test_ttl(self):
+        now = [0.0]
+        predicate = MemoizedPredicate(self.predicate, ttl=10, clock=Supplier.of(lambda: now[0]))
+
+        predicate.test("ab")
+        now[0] = 5
+        predicate.test("ab")
+        now[0] = 20
+        predicate.test("ab")
+
+        self.assertListEqual(["ab", "ab"], self.tested)
+
+    def test_threads(self):
+        predicate = MemoizedPredicate(Predicate.of(lambda value: value % 2 == 0), max_size=8)
+        errors = []
+
+        def _run():
+            for value in range(100):
+                if predicate.test(value) != (value % 2 == 0):
+                    errors.append(value)
+
+        threads = [threading.Thread(target=_run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual([], errors)
+        self.assertEqual(800, predicate.get_statistics().requests())
@@ -1,5 +1,7 @@
-from unittest import TestCase
+import math
+from unittest import TestCase, skipIf
 
+from pycommons.base.function import Supplier
 from pycommons.base.function.predicate import PassingPredicate, Predicate, FailingPredicate
 
 from pycommons.collections.functions.predicate import (
@@ -9,8 +11,23 @@ from pycommons.collections.functions.predicate import (
     DecoratedPredicate,
     ExactCountPredicate,
     ExactOnePredicate,
+    EqualsPredicate,
+    InPredicate,
+    NotInPredicate,
+    NotEqualsPredicate,
+    NotPredicate,
+    AndPredicate,
+    OrPredicate,
+    AdaptiveAllPredicate,
+    AdaptiveAnyPredicate,
+    test_many as batch_test,
 )
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 class TestAllPredicate(TestCase):
     def test_passing_predicate(self):
@@ -271,3 +288,275 @@ class TestExactOnePredicate(TestCase):
         self.assertTupleEqual(
             (predicate1, predicate2, predicate3, predicate4), exact_count_predicate.get_predicates()
         )
+
+
+class TestTestMany(TestCase):
+    def setUp(self):
+        self.predicate = AnyPredicate(
+            (
+                AllPredicate((InPredicate([1, 2, 3, 4]), NotPredicate(EqualsPredicate(2)))),
+                ExactOnePredicate((EqualsPredicate(7), InPredicate(range(6, 9)))),
+                NeitherPredicate((NotInPredicate({5, 6, 9, 10}), EqualsPredicate(10))),
+            )
+        )
+        self.values = list(range(12))
+
+    def test_list(self):
+        expected = [self.predicate.test(value) for value in self.values]
+        self.assertListEqual(expected, self.predicate.test_many(self.values))
+        self.assertListEqual([False, True, True], batch_test(EqualsPredicate(2), [1, 2, 2]))
+
+    def test_or(self):
+        predicate = OrPredicate(EqualsPredicate(1), EqualsPredicate(2))
+        self.assertTrue(predicate.test(1))
+        self.assertTrue(predicate.test(2))
+        self.assertFalse(predicate.test(3))
+        self.assertListEqual([True, True, False], predicate.test_many([1, 2, 3]))
+
+    def test_non_bool_comparisons(self):
+        class _Loose:
+            def __eq__(self, other):
+                return "equal"
+
+            def __ne__(self, other):
+                return "not equal"
+
+            __hash__ = object.__hash__
+
+        for predicate in (EqualsPredicate(1), NotEqualsPredicate(1)):
+            mask = predicate.test_many([_Loose()])
+            self.assertListEqual([True], mask)
+            self.assertIs(True, mask[0])
+
+    def test_foreign_predicates(self):
+        self.assertListEqual([True, True], batch_test(PassingPredicate(), [1, 2]))
+        self.assertListEqual([False], batch_test(FailingPredicate(), iter([1])))
+        self.assertListEqual([True, False], batch_test(Predicate.of(lambda v: v < 2), [1, 2]))
+
+    def test_empty(self):
+        self.assertListEqual([], self.predicate.test_many([]))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_array(self):
+        values = numpy.arange(12)
+        expected = [self.predicate.test(value) for value in self.values]
+        mask = self.predicate.test_many(values)
+
+        self.assertIsInstance(mask, numpy.ndarray)
+        self.assertEqual(numpy.bool_, mask.dtype)
+        self.assertListEqual(expected, mask.tolist())
+        self.assertListEqual(
+            [True, False, True],
+            AndPredicate(EqualsPredicate(1), EqualsPredicate(1))
+            .test_many(numpy.array([1, 2, 1]))
+            .tolist(),
+        )
+        self.assertListEqual(
+            [True, True, False],
+            OrPredicate(EqualsPredicate(1), EqualsPredicate(2))
+            .test_many(numpy.array([1, 2, 3]))
+            .tolist(),
+        )
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_array_short_circuits(self):
+        tested = []
+
+        def _test(value):
+            tested.append(int(value))
+            return True
+
+        predicate = AllPredicate((EqualsPredicate(1), Predicate.of(_test)))
+        self.assertListEqual(
+            [True, False, True], predicate.test_many(numpy.array([1, 2, 1])).tolist()
+        )
+        self.assertListEqual([1, 1], tested)
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_array_of_other_types(self):
+        values = numpy.array([1, 2, 3])
+        self.assertListEqual([False] * 3, EqualsPredicate("1").test_many(values).tolist())
+        self.assertListEqual([True] * 3, NotEqualsPredicate("1").test_many(values).tolist())
+        self.assertListEqual([True, False, False], EqualsPredicate(1.0).test_many(values).tolist())
+
+        strings = numpy.array(["1", "a"])
+        self.assertListEqual([False, False], EqualsPredicate(1).test_many(strings).tolist())
+        self.assertListEqual([False, True], EqualsPredicate("a").test_many(strings).tolist())
+        self.assertListEqual([False, False], EqualsPredicate(b"a").test_many(strings).tolist())
+
+
+class TestInPredicate(TestCase):
+    def test_hashable_values(self):
+        predicate = InPredicate(value for value in [1, 2, 3, 3])
+
+        self.assertEqual(3, predicate.get_size())
+        self.assertTrue(predicate.test(1))
+        self.assertTrue(predicate.test(1))
+        self.assertFalse(predicate.test(4))
+        self.assertFalse(predicate.test([1]))
+
+        statistics = predicate.get_statistics()
+        self.assertEqual(4, statistics.tests)
+        self.assertEqual(2, statistics.hits)
+        self.assertEqual(0.5, statistics.hit_rate())
+
+        predicate.reset_statistics()
+        self.assertEqual(0.0, predicate.get_statistics().hit_rate())
+
+    def test_unhashable_values(self):
+        predicate = InPredicate([[3], [1, 2], [1]])
+
+        self.assertEqual(3, predicate.get_size())
+        self.assertTrue(predicate.test([1, 2]))
+        self.assertTrue(predicate.test([3]))
+        self.assertFalse(predicate.test([2]))
+        self.assertFalse(predicate.test(1))
+        self.assertListEqual([True, False], predicate.test_many([[1], [4]]))
+        self.assertEqual(3, predicate.get_statistics().hits)
+
+    def test_unorderable_values(self):
+        predicate = InPredicate([{"a": 1}, {"b": 2}])
+
+        self.assertTrue(predicate.test({"b": 2}))
+        self.assertFalse(predicate.test({"c": 3}))
+
+    def test_unhashable_value_equal_to_element(self):
+        self.assertTrue(InPredicate([frozenset((1,))]).test({1}))
+
+    def test_later_changes_not_seen(self):
+        values = {1: "a"}
+        data = bytearray(b"ab")
+        predicates = (InPredicate(values.keys()), InPredicate({1}), InPredicate(data))
+        values[2] = "b"
+        data[0:2] = b"cd"
+
+        self.assertListEqual([1, 1, 2], [predicate.get_size() for predicate in predicates])
+        self.assertFalse(predicates[0].test(2))
+        self.assertTrue(predicates[1].test(1))
+        self.assertTrue(predicates[2].test(b"ab"))
+        self.assertFalse(predicates[2].test(b"cd"))
+
+    def test_partially_ordered_values(self):
+        self.assertTrue(InPredicate([{2}, {1}]).test({1}))
+        self.assertTrue(InPredicate([{1, 2}, {3}, {1}]).test({1}))
+        self.assertFalse(InPredicate([{2}, {1}]).test({3}))
+
+        predicate = InPredicate([bytearray(b"b"), bytearray(b"a")])
+        self.assertTrue(predicate.test(b"a"))
+        self.assertFalse(predicate.test(b"c"))
+        self.assertFalse(predicate.test({1}))
+
+    def test_containers(self):
+        self.assertTrue(InPredicate("abc").test("ab"))
+        self.assertFalse(NotInPredicate("abc").test("bc"))
+        self.assertFalse(InPredicate("abc").test(1))
+        self.assertTrue(InPredicate(b"abc").test(b"bc"))
+
+        predicate = InPredicate(range(0, 10**12, 2))
+        self.assertTrue(predicate.test(10**10))
+        self.assertFalse(predicate.test(3))
+        self.assertListEqual([True, False], predicate.test_many([4, 5]))
+        self.assertListEqual(
+            [True, False, False, True, False],
+            predicate.test_many([4.0, 4.5, math.nan, 4 + 0j, "4"]),
+        )
+
+        values = frozenset("a")
+        self.assertIs(values, InPredicate(values)._values)  # pylint: disable=W0212
+        keys = InPredicate({"a": 1}.keys())._values  # pylint: disable=W0212
+        self.assertIsInstance(keys, frozenset)
+        self.assertIsInstance(InPredicate({1})._values, frozenset)  # pylint: disable=W0212
+
+    def test_not_in(self):
+        predicate = NotInPredicate(iter(range(5)))
+
+        self.assertFalse(predicate.test(4))
+        self.assertTrue(predicate.test(5))
+        self.assertListEqual([False, True], predicate.test_many([0, 9]))
+        self.assertEqual(2, predicate.get_statistics().hits)
+        self.assertEqual(4, predicate.get_statistics().tests)
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_array_of_other_types(self):
+        values = numpy.array([1, 2, 3])
+        predicate = InPredicate([1, "a"])
+        self.assertTrue(predicate.test(1))
+        self.assertListEqual([True, False, False], predicate.test_many(values).tolist())
+        self.assertListEqual(
+            [False, True, True], NotInPredicate([1, "a"]).test_many(values).tolist()
+        )
+        self.assertListEqual([True, True, False], InPredicate([1.0, 2]).test_many(values).tolist())
+        self.assertListEqual(
+            [False, True], InPredicate(["a", "b"]).test_many(numpy.array(["1", "a"])).tolist()
+        )
+        self.assertListEqual(
+            [True, False],
+            InPredicate([(1, 2)]).test_many(numpy.array([(1, 2), 3], dtype=object)).tolist(),
+        )
+        self.assertListEqual(
+            [True, False, False], InPredicate(range(1, 10**12, 3)).test_many(values).tolist()
+        )
+        self.assertListEqual(
+            [True, False], InPredicate("abc").test_many(numpy.array(["ab", "ac"])).tolist()
+        )
+
+
+class TestAdaptivePredicates(TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.clock = Supplier.of(lambda: self.now)
+
+    def _costly(self, cost, test):
+        def _test(value):
+            self.now += cost
+            return test(value)
+
+        return Predicate.of(_test)
+
+    def test_all_reorders_cheap_selective_predicates_first(self):
+        expensive = self._costly(100, lambda value: True)
+        cheap = self._costly(1, lambda value: value % 10 == 0)
+        predicate = AdaptiveAllPredicate((expensive, cheap), sample_interval=1, reorder_interval=8)
+
+        results = [predicate.test(value) for value in range(20)]
+
+        self.assertListEqual([value % 10 == 0 for value in range(20)], results)
+        self.assertTupleEqual((cheap, expensive), predicate.get_ordering())
+        self.assertTupleEqual((expensive, cheap), predicate.get_predicates())
+
+    def test_any_reorders_cheap_selective_predicates_first(self):
+        expensive = self._costly(100, lambda value: False)
+        cheap = self._costly(1, lambda value: value % 10 != 0)
+        predicate = AdaptiveAnyPredicate((expensive, cheap), sample_interval=2, reorder_interval=4)
+
+        results = [predicate.test(value) for value in range(20)]
+
+        self.assertListEqual([value % 10 != 0 for value in range(20)], results)
+        self.assertTupleEqual((cheap, expensive), predicate.get_ordering())
+
+    def test_pin_ordering(self):
+        expensive = self._costly(100, lambda value: True)
+        cheap = self._costly(1, lambda value: False)
+        predicate = AdaptiveAllPredicate((expensive, cheap), sample_interval=1, reorder_interval=1)
+
+        predicate.pin_ordering()
+        self.assertTrue(predicate.is_pinned())
+        for value in range(10):
+            self.assertFalse(predicate.test(value))
+        self.assertTupleEqual((expensive, cheap), predicate.get_ordering())
+
+        predicate.pin_ordering((cheap, expensive))
+        self.assertTupleEqual((cheap, expensive), predicate.get_ordering())
+        with self.assertRaises(ValueError):
+            predicate.pin_ordering((cheap, cheap))
+
+        predicate.unpin_ordering()
+        self.assertFalse(predicate.is_pinned())
+
+    def test_empty(self):
+        self.assertTrue(AdaptiveAllPredicate(()).test(1))
+        self.assertFalse(AdaptiveAnyPredicate(()).test(1))
+
+    def test_invalid_intervals(self):
+        with self.assertRaises(ValueError):
+            AdaptiveAllPredicate((), sample_interval=0)
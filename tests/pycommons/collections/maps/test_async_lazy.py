@@ -0,0 +1,149 @@
+import asyncio
+from typing import List, Dict
+from unittest import IsolatedAsyncioTestCase
+
+from pycommons.collections.maps import AsyncLazyMap
+
+
+class TestAsyncLazyMap(IsolatedAsyncioTestCase):
+    async def test_get(self):
+        calls: List[str] = []
+
+        async def _factory(key: str) -> str:
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key.upper()
+
+        lazy_map: AsyncLazyMap[str, str] = AsyncLazyMap(_factory)
+        results = await asyncio.gather(*(lazy_map.get("key1") for _ in range(5)))
+
+        self.assertListEqual(["KEY1"] * 5, results)
+        self.assertListEqual(["key1"], calls)
+        self.assertEqual("KEY1", lazy_map["key1"])
+        self.assertEqual("KEY1", await lazy_map.get("key1"))
+        with self.assertRaises(KeyError):
+            _ = lazy_map["key2"]
+
+    async def test_get_is_cancellation_safe(self):
+        async def _factory(key: str) -> str:
+            await asyncio.sleep(0.01)
+            return key.upper()
+
+        lazy_map: AsyncLazyMap[str, str] = AsyncLazyMap(_factory)
+        cancelled = asyncio.ensure_future(lazy_map.get("key1"))
+        waiting = asyncio.ensure_future(lazy_map.get("key1"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        self.assertEqual("KEY1", await waiting)
+        self.assertTrue(cancelled.cancelled())
+
+    async def test_get_exception(self):
+        async def _factory(key: str) -> str:
+            raise ValueError(key)
+
+        lazy_map: AsyncLazyMap[str, str] = AsyncLazyMap(_factory)
+        with self.assertRaises(ValueError):
+            await lazy_map.get("key1")
+        self.assertFalse("key1" in lazy_map)
+
+    async def test_get_many(self):
+        batches: List[List[str]] = []
+        calls: List[str] = []
+
+        async def _factory(key: str) -> str:
+            calls.append(key)
+            return key.upper()
+
+        async def _batch_factory(keys: List[str]) -> Dict[str, str]:
+            batches.append(keys)
+            return {key: key.upper() for key in keys if key != "key4"}
+
+        lazy_map: AsyncLazyMap[str, str] = AsyncLazyMap(_factory, batch_factory=_batch_factory)
+        lazy_map["key0"] = "VALUE0"
+        results = await asyncio.gather(
+            lazy_map.get_many(["key0", "key1", "key2"]),
+            lazy_map.get_many(["key2", "key3", "key4"]),
+        )
+
+        self.assertDictEqual({"key0": "VALUE0", "key1": "KEY1", "key2": "KEY2"}, results[0])
+        self.assertDictEqual({"key2": "KEY2", "key3": "KEY3", "key4": "KEY4"}, results[1])
+        self.assertListEqual([["key1", "key2", "key3", "key4"]], batches)
+        self.assertListEqual(["key4"], calls)
+        self.assertEqual(5, lazy_map.size())
+
+    async def test_get_many_exception(self):
+        async def _factory(key: str) -> str:
+            return key.upper()
+
+        async def _batch_factory(keys: List[str]) -> Dict[str, str]:
+            raise ValueError(keys)
+
+        lazy_map: AsyncLazyMap[str, str] = AsyncLazyMap(_factory, batch_factory=_batch_factory)
+        with self.assertRaises(ValueError):
+            await lazy_map.get_many(["key1", "key2"])
+        self.assertTrue(lazy_map.is_empty())
+
+    async def test_get_many_cancelled_during_fallback(self):
+        started = asyncio.Event()
+
+        async def _factory(key: str) -> str:
+            started.set()
+            await asyncio.Event().wait()
+            return key.upper()
+
+        async def _batch_factory(keys: List[str]) -> Dict[str, str]:
+            return {key: key.upper() for key in keys if key == "key1"}
+
+        lazy_map: AsyncLazyMap[str, str] = AsyncLazyMap(_factory, batch_factory=_batch_factory)
+        waiting = asyncio.ensure_future(lazy_map.get_many(["key1", "key2"]))
+        await started.wait()
+        for task in lazy_map._batch_tasks:  # pylint: disable=W0212
+            task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(waiting, 1)
+
+    async def test_get_many_without_batch_factory(self):
+        async def _factory(key: str) -> str:
+            return key.upper()
+
+        lazy_map: AsyncLazyMap[str, str] = AsyncLazyMap(_factory)
+        self.assertDictEqual({"key1": "KEY1"}, await lazy_map.get_many(["key1"]))
+
+    async def test_bounded_size_and_ttl(self):
+        async def _factory(key: str) -> str:
+            return key.upper()
+
+        lazy_map: AsyncLazyMap[str, str] = AsyncLazyMap(_factory, max_size=2)
+        await lazy_map.get_many(["key1", "key2"])
+        await lazy_map.get("key1")
+        await lazy_map.get("key3")
+        self.assertListEqual(["key1", "key3"], list(lazy_map.keys()))
+
+        lazy_map = AsyncLazyMap(_factory, ttl=0.01)
+        await lazy_map.get("key1")
+        self.assertTrue("key1" in lazy_map)
+        await asyncio.sleep(0.02)
+        self.assertFalse("key1" in lazy_map)
+
+        with self.assertRaises(ValueError):
+            AsyncLazyMap(_factory, max_size=0)
+        with self.assertRaises(ValueError):
+            AsyncLazyMap(_factory, ttl=0)
+
+    async def test_get_many_evicting_cached_keys(self):
+        async def _factory(key: int) -> int:
+            return key * 10
+
+        async def _batch_factory(keys: List[int]) -> Dict[int, int]:
+            return {key: key * 10 for key in keys}
+
+        lazy_map: AsyncLazyMap[int, int] = AsyncLazyMap(_factory, max_size=2)
+        await lazy_map.get(1)
+        self.assertDictEqual({1: 10, 2: 20, 3: 30}, await lazy_map.get_many([1, 2, 3]))
+        self.assertListEqual([2, 3], list(lazy_map.keys()))
+
+        lazy_map = AsyncLazyMap(_factory, batch_factory=_batch_factory, max_size=1)
+        await lazy_map.get(1)
+        self.assertDictEqual({2: 20, 1: 10}, await lazy_map.get_many([2, 1, 2]))
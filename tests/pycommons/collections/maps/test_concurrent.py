@@ -0,0 +1,146 @@
+import copy
+import collections
+import sys
+import threading
+from unittest import TestCase
+
+from pycommons.base.function import Function
+
+from pycommons.collections.maps import ConcurrentMap
+
+
+class TestConcurrentMap(TestCase):
+    def test_concurrent_map(self):
+        concurrent_map: ConcurrentMap[str, int] = ConcurrentMap({"testKey1": 1}, testKey2=2)
+        concurrent_map["testKey3"] = 3
+        del concurrent_map["testKey2"]
+
+        self.assertEqual(1, concurrent_map["testKey1"])
+        self.assertIsNone(concurrent_map.get("testKey2"))
+        self.assertEqual(2, concurrent_map.size())
+        self.assertTrue(concurrent_map.contains_key("testKey3"))
+        self.assertTrue(concurrent_map.contains_value(3))
+        self.assertFalse(concurrent_map.contains_value(2))
+        self.assertDictEqual({"testKey1": 1, "testKey3": 3}, dict(concurrent_map.items()))
+        self.assertSetEqual({1, 3}, set(concurrent_map.values()))
+        self.assertSetEqual(
+            {("testKey1", 1), ("testKey3", 3)},
+            {(item.key, item.value) for item in concurrent_map},
+        )
+        for cursor in concurrent_map.cursor_iterator():
+            cursor.set_value(cursor.value * 10)
+        self.assertDictEqual({"testKey1": 10, "testKey3": 30}, dict(concurrent_map.items()))
+        with self.assertRaises(KeyError):
+            _ = concurrent_map["testKey2"]
+
+        _copy = copy.copy(concurrent_map)
+        self.assertIsInstance(_copy, ConcurrentMap)
+        self.assertDictEqual(dict(concurrent_map.items()), dict(_copy.items()))
+
+        key, value = concurrent_map.popitem()
+        self.assertEqual(value, _copy[key])
+        concurrent_map.clear()
+        self.assertTrue(concurrent_map.is_empty())
+        with self.assertRaises(KeyError):
+            concurrent_map.popitem()
+
+    def test_atomic_operations(self):
+        concurrent_map: ConcurrentMap[str, int] = ConcurrentMap()
+
+        self.assertIsNone(concurrent_map.put_if_absent("testKey1", 1))
+        self.assertEqual(1, concurrent_map.put_if_absent("testKey1", 2))
+        self.assertEqual(1, concurrent_map.compute_if_absent("testKey1", Function.of(len)))
+        self.assertEqual(8, concurrent_map.compute_if_absent("testKey2", Function.of(len)))
+        self.assertEqual(9, concurrent_map.compute_if_present("testKey2", lambda k, v: v + 1))
+        self.assertIsNone(concurrent_map.compute_if_present("testKey3", lambda k, v: v + 1))
+        self.assertIsNone(concurrent_map.compute_if_present("testKey2", lambda k, v: None))
+        self.assertFalse("testKey2" in concurrent_map)
+        self.assertEqual(5, concurrent_map.merge("testKey3", 5, lambda a, b: a + b))
+        self.assertEqual(10, concurrent_map.merge("testKey3", 5, lambda a, b: a + b))
+        self.assertIsNone(concurrent_map.merge("testKey3", 5, lambda a, b: None))
+        self.assertDictEqual({"testKey1": 1}, dict(concurrent_map.items()))
+
+    def test_threads(self):
+        concurrent_map: ConcurrentMap[int, int] = ConcurrentMap(concurrency_level=4)
+        calls = []
+
+        def _load(key):
+            calls.append(key)
+            return key
+
+        def _run():
+            for key in range(200):
+                concurrent_map.merge(key % 50, 1, lambda a, b: a + b)
+                concurrent_map.compute_if_absent(1000 + key % 10, Function.of(_load))
+                list(concurrent_map.items_tuple_iterator())
+
+        threads = [threading.Thread(target=_run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertListEqual(list(range(1000, 1010)), sorted(calls))
+        self.assertDictEqual(
+            {key: 32 for key in range(50)}, {k: concurrent_map[k] for k in range(50)}
+        )
+
+    def test_pop_setdefault(self):
+        concurrent_map: ConcurrentMap[str, int] = ConcurrentMap({"testKey1": 1})
+
+        self.assertEqual(1, concurrent_map.setdefault("testKey1", 2))
+        self.assertEqual(2, concurrent_map.setdefault("testKey2", 2))
+        self.assertIsNone(concurrent_map.setdefault("testKey3"))
+        self.assertEqual(1, concurrent_map.pop("testKey1"))
+        self.assertEqual(3, concurrent_map.pop("testKey1", 3))
+        self.assertIsNone(concurrent_map.pop("testKey1", None))
+        with self.assertRaises(KeyError):
+            concurrent_map.pop("testKey1")
+        self.assertDictEqual({"testKey2": 2, "testKey3": None}, dict(concurrent_map.items()))
+
+    def test_pop_setdefault_threads(self):
+        concurrent_map: ConcurrentMap[int, int] = ConcurrentMap(concurrency_level=2)
+        popped = []
+        defaults = collections.defaultdict(set)
+        barrier = threading.Barrier(8)
+        interval = sys.getswitchinterval()
+
+        errors = []
+
+        def _run(thread):
+            try:
+                for key in range(2000):
+                    defaults[key].add(concurrent_map.setdefault(key, thread))
+                barrier.wait()
+                for key in range(2000):
+                    popped.append(concurrent_map.pop(key, None))
+            except KeyError as error:
+                errors.append(error)
+
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=_run, args=(thread,)) for thread in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertListEqual([], errors)
+        self.assertTrue(all(len(values) == 1 for values in defaults.values()))
+        self.assertEqual(2000, sum(value is not None for value in popped))
+        self.assertTrue(concurrent_map.is_empty())
+
+    def test_iteration_during_writes(self):
+        concurrent_map: ConcurrentMap[int, int] = ConcurrentMap({key: key for key in range(100)})
+
+        seen = []
+        for key, _ in concurrent_map.items_tuple_iterator():
+            seen.append(key)
+            concurrent_map[key + 1000] = key
+        self.assertTrue(set(range(100)).issubset(seen))
+
+    def test_invalid_concurrency_level(self):
+        with self.assertRaises(ValueError):
+            ConcurrentMap(concurrency_level=0)
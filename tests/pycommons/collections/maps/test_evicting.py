@@ -0,0 +1,183 @@
+import copy
+import typing
+from unittest import TestCase
+
+from pycommons.base.function import BiConsumer, Supplier
+
+from pycommons.collections.maps import FIFOMap, LFUMap, LRUMap, TTLMap
+
+
+class TestFIFOMap(TestCase):
+    def test_fifo_map(self):
+        evicted = []
+        fifo_map: FIFOMap[str, int] = FIFOMap(2, {"testKey1": 1, "testKey2": 2})
+        fifo_map.add_eviction_listener(BiConsumer.of(lambda k, v: evicted.append((k, v))))
+
+        self.assertTrue(fifo_map.is_full())
+        self.assertEqual(1, fifo_map["testKey1"])
+        fifo_map["testKey3"] = 3
+
+        self.assertListEqual([("testKey1", 1)], evicted)
+        self.assertListEqual(["testKey2", "testKey3"], list(fifo_map.keys()))
+        self.assertEqual(2, fifo_map.max_size())
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            FIFOMap(0)
+
+
+class TestLRUMap(TestCase):
+    def test_lru_map(self):
+        lru_map: LRUMap[str, int] = LRUMap(3)
+        lru_map["testKey1"] = 1
+        lru_map["testKey2"] = 2
+        lru_map["testKey3"] = 3
+
+        self.assertEqual(1, lru_map["testKey1"])
+        lru_map["testKey2"] = 20
+        lru_map["testKey4"] = 4
+
+        self.assertListEqual(["testKey1", "testKey2", "testKey4"], list(lru_map.keys()))
+        self.assertIsNone(lru_map.get("testKey3"))
+
+        statistics = lru_map.get_statistics()
+        self.assertEqual(1, statistics.hits)
+        self.assertEqual(1, statistics.misses)
+        self.assertEqual(1, statistics.evictions)
+        self.assertEqual(0.5, statistics.hit_rate())
+
+        lru_map.reset_statistics()
+        self.assertEqual(0, lru_map.get_statistics().requests())
+        self.assertEqual(0.0, lru_map.get_statistics().hit_rate())
+
+    def test_copy(self):
+        evicted = []
+        lru_map: LRUMap[str, int] = LRUMap(2, {"testKey1": 1, "testKey2": 2})
+        lru_map.add_eviction_listener(BiConsumer.of(lambda k, v: evicted.append(k)))
+        _ = lru_map["testKey1"]
+
+        lru_map_copy = lru_map.copy()
+        self.assertIsInstance(lru_map_copy, LRUMap)
+        self.assertEqual(2, lru_map_copy["testKey2"])
+        lru_map_copy["testKey3"] = 3
+        lru_map_copy.add_eviction_listener(BiConsumer.of(lambda k, v: None))
+
+        self.assertListEqual(["testKey2", "testKey3"], list(lru_map_copy.keys()))
+        self.assertListEqual(["testKey2", "testKey1"], list(lru_map.keys()))
+        self.assertEqual(1, lru_map.get_statistics().hits)
+        self.assertEqual(2, lru_map_copy.get_statistics().hits)
+        self.assertEqual(0, lru_map.get_statistics().evictions)
+        self.assertListEqual(["testKey1"], evicted)
+        self.assertEqual(1, len(lru_map._eviction_listeners))  # pylint: disable=W0212
+
+    def test_extend(self):
+        evicted = []
+        lru_map: LRUMap[typing.Any, int] = LRUMap(2, {"testKey1": 1})
+        lru_map.add_eviction_listener(BiConsumer.of(lambda key, value: evicted.append(key)))
+
+        with self.assertRaises(TypeError):
+            lru_map.extend([("testKey2", 2), ("testKey3", 3), (["unhashable"], 4)])
+
+        # The evicted entry cannot be restored, so the pairs added before the error are kept
+        self.assertListEqual(["testKey1"], evicted)
+        self.assertListEqual(["testKey2", "testKey3"], list(lru_map.keys()))
+        self.assertEqual(1, lru_map.get_statistics().evictions)
+
+
+class TestLFUMap(TestCase):
+    def test_lfu_map(self):
+        lfu_map: LFUMap[str, int] = LFUMap(3, {"testKey1": 1, "testKey2": 2, "testKey3": 3})
+
+        _ = lfu_map["testKey1"]
+        _ = lfu_map["testKey1"]
+        _ = lfu_map["testKey3"]
+        self.assertEqual(3, lfu_map.get_frequency("testKey1"))
+
+        lfu_map["testKey4"] = 4
+        self.assertFalse("testKey2" in lfu_map)
+
+        lfu_map["testKey5"] = 5
+        self.assertFalse("testKey4" in lfu_map)
+        self.assertListEqual(["testKey1", "testKey3", "testKey5"], list(lfu_map.keys()))
+
+        del lfu_map["testKey5"]
+        _ = lfu_map["testKey3"]
+        lfu_map["testKey6"] = 6
+        lfu_map["testKey7"] = 7
+        self.assertListEqual(["testKey1", "testKey3", "testKey7"], list(lfu_map.keys()))
+
+        lfu_map.clear()
+        self.assertTrue(lfu_map.is_empty())
+        self.assertEqual(0, lfu_map.get_frequency("testKey1"))
+
+    def test_copy(self):
+        lfu_map: LFUMap[str, int] = LFUMap(2, {"testKey1": 1, "testKey2": 2})
+        _ = lfu_map["testKey1"]
+
+        lfu_map_copy = copy.copy(lfu_map)
+        _ = lfu_map_copy["testKey2"]
+        _ = lfu_map_copy["testKey2"]
+        lfu_map_copy["testKey3"] = 3
+
+        self.assertEqual(2, lfu_map.get_frequency("testKey1"))
+        self.assertEqual(1, lfu_map.get_frequency("testKey2"))
+        self.assertEqual(3, lfu_map_copy.get_frequency("testKey2"))
+        self.assertListEqual(["testKey2", "testKey3"], list(lfu_map_copy.keys()))
+        self.assertListEqual(["testKey1", "testKey2"], list(lfu_map.keys()))
+        lfu_map["testKey4"] = 4
+        self.assertListEqual(["testKey1", "testKey4"], list(lfu_map.keys()))
+
+
+class TestTTLMap(TestCase):
+    def test_ttl_map(self):
+        now = [0.0]
+        evicted = []
+        ttl_map: TTLMap[str, int] = TTLMap(3, 10, clock=Supplier.of(lambda: now[0]))
+        ttl_map.add_eviction_listener(BiConsumer.of(lambda k, v: evicted.append(k)))
+
+        ttl_map["testKey1"] = 1
+        now[0] = 5
+        ttl_map["testKey2"] = 2
+        self.assertEqual(10, ttl_map.ttl())
+
+        now[0] = 10
+        self.assertFalse("testKey1" in ttl_map)
+        self.assertTrue("testKey2" in ttl_map)
+        self.assertListEqual(["testKey1"], evicted)
+
+        ttl_map["testKey3"] = 3
+        now[0] = 14
+        ttl_map["testKey2"] = 20
+        now[0] = 21
+        self.assertEqual(20, ttl_map["testKey2"])
+        with self.assertRaises(KeyError):
+            _ = ttl_map["testKey3"]
+        self.assertEqual(1, len(ttl_map))
+
+        now[0] = 30
+        self.assertEqual(0, ttl_map.size())
+        self.assertFalse(ttl_map.is_full())
+        self.assertListEqual(["testKey1", "testKey3", "testKey2"], evicted)
+
+    def test_ttl_map_eviction_when_full(self):
+        ttl_map: TTLMap[str, int] = TTLMap(2, 10, {"testKey1": 1, "testKey2": 2})
+        ttl_map["testKey3"] = 3
+
+        self.assertListEqual(["testKey2", "testKey3"], list(ttl_map.keys()))
+        self.assertEqual(1, ttl_map.get_statistics().evictions)
+
+        with self.assertRaises(ValueError):
+            TTLMap(2, 0)
+
+    def test_copy(self):
+        now = [0.0]
+        ttl_map: TTLMap[str, int] = TTLMap(2, 10, clock=Supplier.of(lambda: now[0]))
+        ttl_map["testKey1"] = 1
+
+        ttl_map_copy = ttl_map.copy()
+        now[0] = 5
+        ttl_map_copy["testKey1"] = 10
+        now[0] = 12
+
+        self.assertNotIn("testKey1", ttl_map)
+        self.assertEqual(10, ttl_map_copy["testKey1"])
@@ -0,0 +1,78 @@
+import copy
+import pickle
+from unittest import TestCase
+
+from pycommons.collections.maps import FrozenMap
+
+
+class TestFrozenMap(TestCase):
+    def test_frozen_map(self):
+        frozen_map: FrozenMap[str, int] = FrozenMap({"testKey1": 1}, testKey2=2)
+
+        self.assertEqual(1, frozen_map["testKey1"])
+        self.assertEqual(2, frozen_map.size())
+        self.assertFalse(frozen_map.is_empty())
+        self.assertTrue(frozen_map.contains_key("testKey2"))
+        self.assertTrue(frozen_map.contains_value(2))
+        self.assertFalse(frozen_map.contains_value(3))
+        self.assertEqual({"testKey1": 1, "testKey2": 2}, frozen_map)
+        self.assertIs(frozen_map, frozen_map.copy())
+        self.assertEqual("FrozenMap({'testKey1': 1, 'testKey2': 2})", repr(frozen_map))
+
+    def test_unmodifiable(self):
+        frozen_map: FrozenMap[str, int] = FrozenMap({"testKey1": 1})
+
+        for modify in (
+            lambda: frozen_map.__setitem__("testKey1", 2),
+            lambda: frozen_map.__delitem__("testKey1"),
+            lambda: frozen_map.update({"testKey2": 2}),
+            lambda: frozen_map.setdefault("testKey2", 2),
+            lambda: frozen_map.pop("testKey1"),
+            frozen_map.popitem,
+            frozen_map.clear,
+        ):
+            with self.assertRaises(TypeError):
+                modify()
+        self.assertEqual({"testKey1": 1}, frozen_map)
+
+        _hash = hash(frozen_map)
+        with self.assertRaises(TypeError):
+            frozen_map.__init__({"testKey2": 2})  # pylint: disable=C2801
+        self.assertEqual({"testKey1": 1}, frozen_map)
+        self.assertEqual(_hash, hash(frozen_map))
+
+    def test_hash(self):
+        frozen_map1 = FrozenMap({"testKey1": 1, "testKey2": 2})
+        frozen_map2 = FrozenMap({"testKey2": 2, "testKey1": 1})
+
+        self.assertEqual(hash(frozen_map1), hash(frozen_map2))
+        self.assertEqual("value", {frozen_map1: "value"}[frozen_map2])
+        with self.assertRaises(TypeError):
+            hash(FrozenMap({"testKey1": []}))
+
+    def test_derivations(self):
+        frozen_map = FrozenMap({"testKey1": 1})
+
+        with_item = frozen_map.with_item("testKey2", 2)
+        self.assertIsInstance(with_item, FrozenMap)
+        self.assertEqual({"testKey1": 1, "testKey2": 2}, with_item)
+        self.assertEqual({"testKey1": 1}, frozen_map)
+        self.assertIs(frozen_map, frozen_map.with_item("testKey1", 1))
+
+        self.assertEqual({}, with_item.without_item("testKey1").without_item("testKey2"))
+        self.assertIs(frozen_map, frozen_map.without_item("testKey3"))
+
+        self.assertEqual(
+            {"testKey1": 3, "testKey3": 3}, frozen_map.with_items(testKey1=3, testKey3=3)
+        )
+        self.assertEqual({"testKey1": 1, "testKey4": 4}, frozen_map | {"testKey4": 4})
+        self.assertIsInstance(frozen_map | {"testKey4": 4}, FrozenMap)
+        self.assertEqual({"a": 0, "b": 0}, FrozenMap.fromkeys("ab", 0))
+
+    def test_pickle_and_copy(self):
+        frozen_map = FrozenMap({"testKey1": 1})
+
+        for _copy in (pickle.loads(pickle.dumps(frozen_map)), copy.deepcopy(frozen_map)):
+            self.assertIsInstance(_copy, FrozenMap)
+            self.assertEqual(frozen_map, _copy)
+            self.assertEqual(hash(frozen_map), hash(_copy))
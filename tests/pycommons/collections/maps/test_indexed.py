@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+from pycommons.collections.maps import IndexedMap
+
+
+class TestIndexedMap(TestCase):
+    def test_indexed_map(self):
+        indexed_map: IndexedMap[str, str] = IndexedMap(
+            {"testKey1": "token1", "testKey2": "token2", "testKey3": "token1"}
+        )
+
+        self.assertTrue(indexed_map.contains_value("token1"))
+        self.assertFalse(indexed_map.contains_value("token3"))
+        self.assertTupleEqual(("testKey1", "testKey3"), indexed_map.keys_for_value("token1"))
+        self.assertTupleEqual((), indexed_map.keys_for_value("token3"))
+
+        indexed_map["testKey1"] = "token3"
+        self.assertTupleEqual(("testKey3",), indexed_map.keys_for_value("token1"))
+        self.assertTupleEqual(("testKey1",), indexed_map.keys_for_value("token3"))
+
+        del indexed_map["testKey3"]
+        self.assertFalse(indexed_map.contains_value("token1"))
+
+        self.assertEqual("token2", indexed_map.pop("testKey2"))
+        self.assertFalse(indexed_map.contains_value("token2"))
+
+        indexed_map.update({"testKey4": "token4"}, testKey5="token4")
+        self.assertTupleEqual(("testKey4", "testKey5"), indexed_map.keys_for_value("token4"))
+
+        self.assertTupleEqual(("testKey5", "token4"), indexed_map.popitem())
+        self.assertTupleEqual(("testKey4",), indexed_map.keys_for_value("token4"))
+
+        indexed_map.clear()
+        self.assertTrue(indexed_map.is_empty())
+        self.assertFalse(indexed_map.contains_value("token3"))
+
+    def test_unhashable_values(self):
+        indexed_map: IndexedMap[str, object] = IndexedMap(
+            {"testKey1": [1, 2], "testKey2": "token2", "testKey3": [1, 2]}
+        )
+
+        self.assertTrue(indexed_map.contains_value([1, 2]))
+        self.assertTrue(indexed_map.contains_value("token2"))
+        self.assertTupleEqual(("testKey1", "testKey3"), indexed_map.keys_for_value([1, 2]))
+
+        indexed_map["testKey1"] = "token2"
+        del indexed_map["testKey3"]
+        self.assertFalse(indexed_map.contains_value([1, 2]))
+        self.assertTupleEqual(("testKey2", "testKey1"), indexed_map.keys_for_value("token2"))
+
+    def test_iterator_set_value_and_copy(self):
+        indexed_map: IndexedMap[str, str] = IndexedMap({"testKey1": "token1"})
+        copied_map = indexed_map.copy()
+
+        for cursor in indexed_map.cursor_iterator():
+            cursor.set_value("token2")
+        next(indexed_map.items_iterator()).set_value("token3")
+
+        self.assertTupleEqual(("testKey1",), indexed_map.keys_for_value("token3"))
+        self.assertFalse(indexed_map.contains_value("token2"))
+        self.assertTupleEqual(("testKey1",), copied_map.keys_for_value("token1"))
+        self.assertFalse(copied_map.contains_value("token3"))
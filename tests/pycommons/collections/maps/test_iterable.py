@@ -0,0 +1,95 @@
+from unittest import TestCase
+
+from pycommons.collections.maps import IterableMap, IndexedMap, ItemsIterator, MapCursor
+
+
+class TestIterableMap(TestCase):
+    def test_items_iterator(self):
+        iterable_map: IterableMap[str, int] = IterableMap({"testKey1": 1, "testKey2": 2})
+
+        items = list(iterable_map)
+        self.assertEqual(2, len(items))
+        self.assertIsInstance(items[0], ItemsIterator)
+        self.assertEqual("testKey1", items[0].key)
+        self.assertEqual(2, items[1].get_value())
+
+        items[1].set_value(4)
+        self.assertEqual(4, iterable_map["testKey2"])
+
+    def test_cursor_iterator(self):
+        iterable_map: IterableMap[str, int] = IterableMap({"testKey1": 1, "testKey2": 2})
+
+        cursors = []
+        entries = []
+        for cursor in iterable_map.cursor_iterator():
+            cursors.append(cursor)
+            entries.append(cursor.get_item())
+            cursor.value = cursor.value * 10
+
+        self.assertIsInstance(cursors[0], MapCursor)
+        self.assertIs(cursors[0], cursors[1])
+        self.assertListEqual([("testKey1", 1), ("testKey2", 2)], entries)
+        self.assertDictEqual({"testKey1": 10, "testKey2": 20}, iterable_map.data)
+
+    def test_items_tuple_iterator(self):
+        iterable_map: IterableMap[str, int] = IterableMap({"testKey1": 1, "testKey2": 2})
+
+        self.assertListEqual(
+            [("testKey1", 1), ("testKey2", 2)], list(iterable_map.items_tuple_iterator())
+        )
+        self.assertListEqual([("testKey1", 1), ("testKey2", 2)], list(iterable_map.items()))
+
+    def test_mapping_methods(self):
+        iterable_map: IterableMap[str, int] = IterableMap({"testKey1": 1, "testKey2": 2})
+
+        copied_map = IterableMap(iterable_map)
+        self.assertEqual(iterable_map, copied_map)
+        self.assertEqual({"testKey1": 1, "testKey2": 2}, iterable_map.copy())
+        self.assertTrue(iterable_map.contains_value(2))
+        self.assertFalse(iterable_map.contains_value(3))
+
+        self.assertTupleEqual(("testKey2", 2), iterable_map.popitem())
+        self.assertTupleEqual(("testKey1", 1), iterable_map.popitem())
+        with self.assertRaises(KeyError):
+            iterable_map.popitem()
+
+        copied_map.clear()
+        self.assertTrue(copied_map.is_empty())
+
+    def test_extend_and_from_iterable(self):
+        iterable_map: IterableMap[str, int] = IterableMap.from_iterable(
+            ((f"testKey{i}", i) for i in range(10)), chunk_size=3
+        )
+        iterable_map.extend([("testKey0", 10)])
+
+        self.assertIsInstance(iterable_map, IterableMap)
+        self.assertEqual(10, iterable_map.size())
+        self.assertEqual(10, iterable_map["testKey0"])
+        with self.assertRaises(ValueError):
+            iterable_map.extend([], chunk_size=0)
+
+    def test_extend_is_atomic(self):
+        indexed_map: IndexedMap[str, int] = IndexedMap({"testKey1": 1})
+
+        def _pairs():
+            yield "testKey1", 10
+            yield "testKey2", 2
+            yield "testKey3", 3
+            raise RuntimeError("source failed")
+
+        with self.assertRaises(RuntimeError):
+            indexed_map.extend(_pairs(), chunk_size=2)
+
+        self.assertDictEqual({"testKey1": 1}, indexed_map.data)
+        self.assertTupleEqual(("testKey1",), indexed_map.keys_for_value(1))
+        self.assertTupleEqual((), indexed_map.keys_for_value(10))
+
+    def test_iter_chunks(self):
+        iterable_map: IterableMap[int, int] = IterableMap({i: i for i in range(5)})
+
+        self.assertListEqual(
+            [[(0, 0), (1, 1)], [(2, 2), (3, 3)], [(4, 4)]], list(iterable_map.iter_chunks(2))
+        )
+        self.assertListEqual([], list(IterableMap().iter_chunks(2)))
+        with self.assertRaises(ValueError):
+            list(iterable_map.iter_chunks(0))
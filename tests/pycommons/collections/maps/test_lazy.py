@@ -1,9 +1,12 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
 from unittest import TestCase
 
 from pycommons.base.container import IntegerContainer
 from pycommons.base.function import Function
 
-from pycommons.collections.maps import LazyMap, LazyOrderedMap
+from pycommons.collections.maps import LazyMap, LazyOrderedMap, ConcurrentLazyMap
 
 
 class TestLazyMap(TestCase):
@@ -16,6 +19,30 @@ class TestLazyMap(TestCase):
         self.assertEqual(6, lazy_map["key3"])
         self.assertEqual(6, lazy_map["key3"])
 
+    def test_get_many(self):
+        bulk_calls: List[List[str]] = []
+
+        def _bulk_factory(keys: List[str]) -> Dict[str, int]:
+            bulk_calls.append(keys)
+            return {key: len(key) for key in keys if key != "key22"}
+
+        lazy_map: LazyMap[str, int] = LazyMap(
+            Function.of(lambda k: -1), {"key1": 1}, bulk_factory=Function.of(_bulk_factory)
+        )
+
+        self.assertDictEqual(
+            {"key1": 1, "key22": -1, "key333": 6}, lazy_map.get_many(["key1", "key22", "key333"])
+        )
+        self.assertListEqual([["key22", "key333"]], bulk_calls)
+
+        lazy_map.prefetch(["key333", "key4444"])
+        self.assertListEqual([["key22", "key333"], ["key4444"]], bulk_calls)
+        self.assertEqual(7, lazy_map["key4444"])
+
+    def test_get_many_without_bulk_factory(self):
+        lazy_map: LazyMap[str, int] = LazyMap(Function.of(len))
+        self.assertDictEqual({"a": 1, "bb": 2}, lazy_map.get_many(["a", "bb", "a"]))
+
 
 class TestLazyOrderedMap(TestCase):
     def test_lazy_map(self):
@@ -31,3 +58,98 @@ class TestLazyOrderedMap(TestCase):
 
         self.assertListEqual(["key1", "key2", "key3", "key0"], list(lazy_ordered_map.keys()))
         self.assertListEqual([2, 4, 6, 8], list(lazy_ordered_map.values()))
+
+    def test_get_many(self):
+        lazy_ordered_map: LazyMap[str, int] = LazyOrderedMap(
+            Function.of(len), Function.of(lambda keys: {key: 0 for key in keys})
+        )
+
+        self.assertDictEqual({"b": 0, "a": 0}, lazy_ordered_map.get_many(["b", "a"]))
+        self.assertListEqual(["b", "a"], list(lazy_ordered_map.keys()))
+
+
+class TestConcurrentLazyMap(TestCase):
+    def test_single_flight(self):
+        calls = IntegerContainer()
+        started = threading.Event()
+        release = threading.Event()
+
+        def _factory(key: str) -> str:
+            calls.increment()
+            started.set()
+            release.wait(5)
+            return key.upper()
+
+        lazy_map: ConcurrentLazyMap[str, str] = ConcurrentLazyMap(Function.of(_factory))
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(lambda: lazy_map["key1"]) for _ in range(8)]
+            started.wait(5)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertListEqual(["KEY1"] * 8, results)
+        self.assertEqual(1, calls.get())
+        self.assertEqual("KEY1", lazy_map["key1"])
+        self.assertEqual(1, calls.get())
+
+    def test_exception_propagation(self):
+        calls = IntegerContainer()
+        started = threading.Event()
+        release = threading.Event()
+
+        def _factory(key: str) -> str:
+            calls.increment()
+            started.set()
+            release.wait(5)
+            raise RuntimeError(key)
+
+        lazy_map: ConcurrentLazyMap[str, str] = ConcurrentLazyMap(Function.of(_factory))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(lambda: lazy_map["key1"]) for _ in range(4)]
+            started.wait(5)
+            release.set()
+            for future in futures:
+                with self.assertRaises(RuntimeError):
+                    future.result()
+
+        self.assertEqual(1, calls.get())
+        self.assertFalse("key1" in lazy_map)
+
+    def test_negative_cache(self):
+        calls = IntegerContainer()
+
+        def _factory(key: str) -> str:
+            calls.increment()
+            raise KeyError(key)
+
+        lazy_map: ConcurrentLazyMap[str, str] = ConcurrentLazyMap(
+            Function.of(_factory), stripes=2, negative_ttl=60
+        )
+        for _ in range(3):
+            with self.assertRaises(KeyError):
+                _ = lazy_map["key1"]
+        self.assertEqual(1, calls.get())
+
+        lazy_map.invalidate_failures()
+        with self.assertRaises(KeyError):
+            _ = lazy_map["key1"]
+        self.assertEqual(2, calls.get())
+
+        lazy_map["key1"] = "value1"
+        self.assertEqual("value1", lazy_map["key1"])
+        del lazy_map["key1"]
+        with self.assertRaises(KeyError):
+            _ = lazy_map["key1"]
+        self.assertEqual(3, calls.get())
+
+        with self.assertRaises(ValueError):
+            ConcurrentLazyMap(Function.of(_factory), stripes=0)
+
+    def test_get_many(self):
+        lazy_map: ConcurrentLazyMap[str, int] = ConcurrentLazyMap(
+            Function.of(len),
+            {"key1": 1},
+            bulk_factory=Function.of(lambda keys: {key: 0 for key in keys}),
+        )
+
+        self.assertDictEqual({"key1": 1, "key2": 0}, lazy_map.get_many(["key1", "key2"]))
@@ -0,0 +1,93 @@
+import os
+import pickle
+import tempfile
+import tracemalloc
+from unittest import TestCase
+
+from pycommons.collections.maps import MemoryMappedMap
+
+
+class TestMemoryMappedMap(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.path = os.path.join(self.directory.name, "map.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_memory_mapped_map(self):
+        items = [(f"key{i}".encode(), f"value{i}".encode() * (i % 3)) for i in range(1000)]
+        items.append((b"key1", b"last"))
+
+        with MemoryMappedMap.build(self.path, items) as mapped_map:
+            self.assertEqual(1000, len(mapped_map))
+            self.assertEqual(1000, mapped_map.size())
+            value = mapped_map[b"key2"]
+            self.assertIsInstance(value, memoryview)
+            self.assertEqual(b"value2value2", value.tobytes())
+            self.assertEqual(b"last", bytes(mapped_map[b"key1"]))
+            self.assertEqual(b"", bytes(mapped_map[b"key0"]))
+            self.assertTrue(b"key999" in mapped_map)
+            self.assertTrue(mapped_map.contains_key(b"key999"))
+            self.assertFalse(b"key1000" in mapped_map)
+            self.assertFalse("key1" in mapped_map)
+            self.assertIsNone(mapped_map.get(b"key1000"))
+            with self.assertRaises(KeyError):
+                _ = mapped_map[b"key1000"]
+
+            expected = dict(items)
+            self.assertDictEqual(
+                expected, {k: bytes(v) for k, v in mapped_map.items_tuple_iterator()}
+            )
+            self.assertSetEqual(set(expected), set(mapped_map.keys()))
+            self.assertSetEqual(set(expected), {item.key for item in mapped_map.items_iterator()})
+            value.release()
+
+    def test_build_memory(self):
+        items = ((b"%d" % i, b"value") for i in range(20000))
+
+        tracemalloc.start()
+        try:
+            with MemoryMappedMap.build(self.path, items) as mapped_map:
+                _, peak = tracemalloc.get_traced_memory()
+                self.assertEqual(20000, len(mapped_map))
+                self.assertEqual(b"value", bytes(mapped_map[b"19999"]))
+        finally:
+            tracemalloc.stop()
+        # Neither the offsets of the records nor the 65536 slots of the index are kept in memory
+        self.assertLess(peak, 100_000)
+
+    def test_open_and_pickle(self):
+        MemoryMappedMap.build(self.path, {b"key1": b"value1"}).close()
+
+        with MemoryMappedMap(self.path) as mapped_map:
+            self.assertEqual(b"value1", bytes(mapped_map[b"key1"]))
+            with pickle.loads(pickle.dumps(mapped_map)) as unpickled_map:
+                self.assertEqual(b"value1", bytes(unpickled_map[b"key1"]))
+
+    def test_unmodifiable(self):
+        with MemoryMappedMap.build(self.path, {b"key1": b"value1"}) as mapped_map:
+            for modify in (
+                lambda: mapped_map.__setitem__(b"key1", b"value2"),
+                lambda: mapped_map.__delitem__(b"key1"),
+                lambda: mapped_map.update({b"key2": b"value2"}),
+                mapped_map.popitem,
+                mapped_map.clear,
+            ):
+                with self.assertRaises(TypeError):
+                    modify()
+            for cursor in mapped_map.cursor_iterator():
+                with self.assertRaises(TypeError):
+                    cursor.set_value(b"value2")
+
+    def test_empty_and_invalid_files(self):
+        with MemoryMappedMap.build(self.path, []) as mapped_map:
+            self.assertTrue(mapped_map.is_empty())
+            self.assertListEqual([], list(mapped_map.keys()))
+
+        with open(self.path, "wb") as file:
+            file.write(bytes(64))
+        with self.assertRaises(ValueError):
+            MemoryMappedMap(self.path)
+        with self.assertRaises(ValueError):
+            MemoryMappedMap.build(self.path, [], load_factor=1)
@@ -1,6 +1,11 @@
 from unittest import TestCase
 
-from pycommons.collections.maps import MultiValuedMap
+from pycommons.collections.maps import (
+    MultiValuedMap,
+    CompactMultiValuedMap,
+    ColumnarMultiValuedMap,
+)
+from pycommons.collections.sets.ordered import OrderedSet
 
 
 class TestMultiValuedMap(TestCase):
@@ -13,3 +18,92 @@ class TestMultiValuedMap(TestCase):
         self.assertEqual(2, len(multi_valued_map["testKey1"]))
         self.assertTrue("testValue11" in multi_valued_map["testKey1"])
         self.assertTrue("testValue12" in multi_valued_map["testKey1"])
+
+    def test_put_all_and_extend(self):
+        multi_valued_map = MultiValuedMap()
+        multi_valued_map.put_all("testKey1", [1, 2, 1])
+        multi_valued_map.put_all("testKey1", [3])
+        multi_valued_map.extend([("testKey1", 4), ("testKey2", 5), ("testKey2", 5)])
+
+        self.assertListEqual([1, 2, 3, 4], list(multi_valued_map["testKey1"]))
+        self.assertListEqual([5], list(multi_valued_map["testKey2"]))
+
+    def test_empty_and_unhashable_values(self):
+        for multi_valued_map in (MultiValuedMap(), CompactMultiValuedMap()):
+            with self.subTest(map=multi_valued_map.__class__.__name__):
+                multi_valued_map.put_all("testKey1", [])
+                multi_valued_map.put_all("testKey1", iter(()))
+                self.assertNotIn("testKey1", multi_valued_map)
+                self.assertEqual(0, len(multi_valued_map))
+
+                self.assertRaises(TypeError, multi_valued_map.__setitem__, "testKey1", [1])
+                self.assertRaises(TypeError, multi_valued_map.put_all, "testKey1", [[1]])
+                multi_valued_map["testKey1"] = 1
+                self.assertRaises(TypeError, multi_valued_map.__setitem__, "testKey1", [1])
+                self.assertListEqual([1], list(multi_valued_map["testKey1"]))
+
+
+class TestCompactMultiValuedMap(TestCase):
+    def test_compact_multi_valued_map(self):
+        multi_valued_map = CompactMultiValuedMap({"testKey1": 1})
+        multi_valued_map["testKey1"] = 2
+        multi_valued_map["testKey1"] = 1
+
+        self.assertTupleEqual((1, 2), multi_valued_map["testKey1"])
+        self.assertTrue(multi_valued_map.contains_value((1, 2)))
+
+    def test_promotion(self):
+        multi_valued_map = CompactMultiValuedMap()
+        threshold = CompactMultiValuedMap.PROMOTION_THRESHOLD
+        for value in range(threshold):
+            multi_valued_map["testKey1"] = value
+        self.assertIsInstance(multi_valued_map["testKey1"], tuple)
+
+        multi_valued_map["testKey1"] = threshold
+        multi_valued_map["testKey1"] = 0
+        self.assertIsInstance(multi_valued_map["testKey1"], OrderedSet)
+        self.assertListEqual(list(range(threshold + 1)), list(multi_valued_map["testKey1"]))
+
+    def test_put_all_and_extend(self):
+        multi_valued_map = CompactMultiValuedMap()
+        multi_valued_map.put_all("testKey1", [1, 2, 1])
+        multi_valued_map.put_all("testKey1", [2, 3])
+        multi_valued_map.put_all("testKey1", [])
+        multi_valued_map.extend([("testKey2", 1), ("testKey1", 4), ("testKey2", 1)])
+        multi_valued_map.put_all("testKey3", range(20))
+        multi_valued_map.put_all("testKey3", [20])
+
+        self.assertTupleEqual((1, 2, 3, 4), multi_valued_map["testKey1"])
+        self.assertTupleEqual((1,), multi_valued_map["testKey2"])
+        self.assertListEqual(list(range(21)), list(multi_valued_map["testKey3"]))
+
+
+class TestColumnarMultiValuedMap(TestCase):
+    def test_from_pairs(self):
+        columnar_map = ColumnarMultiValuedMap(
+            [("testKey1", 1), ("testKey2", 2), ("testKey1", 3), ("testKey1", 1)]
+        )
+
+        self.assertListEqual([1, 3], columnar_map["testKey1"])
+        self.assertListEqual([2], columnar_map["testKey2"])
+        self.assertEqual(2, columnar_map.count("testKey1"))
+        self.assertEqual(3, columnar_map.value_count())
+        self.assertEqual(2, len(columnar_map))
+        self.assertListEqual(["testKey1", "testKey2"], list(columnar_map))
+        self.assertFalse("testKey3" in columnar_map)
+        with self.assertRaises(KeyError):
+            _ = columnar_map["testKey3"]
+
+    def test_from_map(self):
+        multi_valued_map = MultiValuedMap()
+        multi_valued_map.put_all("testKey1", [1, 2])
+        multi_valued_map.put_all("testKey2", [3])
+
+        columnar_map = ColumnarMultiValuedMap(multi_valued_map, typecode="q")
+
+        self.assertListEqual([1, 2], columnar_map["testKey1"].tolist())
+        self.assertListEqual([3], columnar_map["testKey2"].tolist())
+        self.assertEqual(
+            "ColumnarMultiValuedMap({'testKey1': array('q', [1, 2]), 'testKey2': array('q', [3])})",
+            repr(columnar_map),
+        )
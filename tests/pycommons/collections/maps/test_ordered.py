@@ -1,3 +1,4 @@
+import time
 from unittest import TestCase
 
 from pycommons.collections.maps import OrderedMap
@@ -13,3 +14,78 @@ class TestOrderedMap(TestCase):
         self.assertListEqual(["testValue1", "testValue2"], list(ordered_map.values()))
 
         self.assertEqual("{'testKey1': 'testValue1', 'testKey2': 'testValue2'}", repr(ordered_map))
+
+    def test_move_to_end(self):
+        ordered_map = OrderedMap()
+        ordered_map.update({"a": 1, "b": 2, "c": 3})
+        ordered_map.move_to_end("a")
+        self.assertListEqual(["b", "c", "a"], list(ordered_map.keys()))
+        ordered_map.move_to_end("c", last=False)
+        self.assertListEqual(["c", "b", "a"], list(ordered_map.keys()))
+        self.assertRaises(KeyError, ordered_map.move_to_end, "d")
+
+        self.assertEqual(("a", 1), ordered_map.popitem())
+        self.assertEqual(("c", 3), ordered_map.popitem(last=False))
+        self.assertEqual(("b", 2), ordered_map.popitem(last=False))
+        self.assertRaises(KeyError, ordered_map.popitem, last=False)
+
+    def test_drain_from_front(self):
+        ordered_map = OrderedMap()
+        ordered_map.update((i, -i) for i in range(100000))
+        self.assertRaises(KeyError, ordered_map.move_to_end, -1, last=False)
+
+        start = time.perf_counter()
+        for i in range(50000):
+            self.assertEqual((i, -i), ordered_map.popitem(last=False))
+        ordered_map["last"] = 0
+        ordered_map.move_to_end(99999, last=False)
+        ordered_map.move_to_end(50000)
+        drained = [ordered_map.popitem(last=False) for _ in range(len(ordered_map))]
+        # Quadratic when every removal from the front skips the slots of the previous ones
+        self.assertLess(time.perf_counter() - start, 2)
+
+        self.assertEqual((99999, -99999), drained[0])
+        self.assertEqual(("last", 0), drained[-2])
+        self.assertEqual((50000, -50000), drained[-1])
+        self.assertEqual(50001, len(drained))
+        self.assertEqual({}, ordered_map)
+
+        ordered_map.update({"b": 2, "a": 1})
+        ordered_map.move_to_end("a", last=False)
+        self.assertEqual({"b": 2, "a": 1}, ordered_map)
+        self.assertEqual("{'a': 1, 'b': 2}", repr(ordered_map))
+        self.assertEqual("{'a': 1, 'b': 2}", repr(ordered_map.copy()))
+
+    def test_equality_and_copy(self):
+        ordered_map = OrderedMap()
+        ordered_map.update({"a": 1, "b": 2})
+        other_map = OrderedMap()
+        other_map.update({"b": 2, "a": 1})
+
+        self.assertEqual(ordered_map, other_map)
+        self.assertEqual(ordered_map, {"a": 1, "b": 2})
+        self.assertNotEqual(ordered_map, {"a": 1})
+        self.assertNotEqual(ordered_map, [("a", 1), ("b", 2)])
+
+        copy = ordered_map.copy()
+        copy["c"] = 3
+        self.assertIsInstance(copy, OrderedMap)
+        self.assertListEqual(["a", "b", "c"], list(copy.keys()))
+        self.assertListEqual(["a", "b"], list(ordered_map.keys()))
+
+    def test_repr_limit(self):
+        ordered_map = OrderedMap(repr_limit=2)
+        ordered_map.update({"a": 1, "b": 2})
+        self.assertEqual("{'a': 1, 'b': 2}", repr(ordered_map))
+        ordered_map.update({"c": 3, "d": 4})
+        self.assertEqual("{'a': 1, 'b': 2, ... (2 more)}", repr(ordered_map))
+        self.assertEqual("{'a': 1, 'b': 2, ... (2 more)}", str(ordered_map))
+
+        ordered_map.set_repr_limit(0)
+        self.assertEqual(0, ordered_map.get_repr_limit())
+        self.assertEqual("{... (4 more)}", repr(ordered_map))
+        ordered_map.set_repr_limit(None)
+        self.assertEqual("{'a': 1, 'b': 2, 'c': 3, 'd': 4}", repr(ordered_map))
+
+        self.assertRaises(ValueError, OrderedMap, -1)
+        self.assertRaises(ValueError, ordered_map.set_repr_limit, -1)
@@ -0,0 +1,126 @@
+import pickle
+import random
+from unittest import TestCase
+
+from pycommons.collections.maps import PersistentMap
+
+
+class _CollidingKey:
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return self.value % 3
+
+    def __eq__(self, other):
+        return isinstance(other, _CollidingKey) and self.value == other.value
+
+    def __repr__(self):
+        return f"_CollidingKey({self.value})"
+
+
+class TestPersistentMap(TestCase):
+    def test_persistent_map(self):
+        persistent_map1 = PersistentMap({"testKey1": 1}, testKey2=2)
+        persistent_map2 = persistent_map1.set("testKey3", 3)
+        persistent_map3 = persistent_map2.delete("testKey1")
+
+        self.assertDictEqual({"testKey1": 1, "testKey2": 2}, dict(persistent_map1))
+        self.assertDictEqual({"testKey1": 1, "testKey2": 2, "testKey3": 3}, dict(persistent_map2))
+        self.assertDictEqual({"testKey2": 2, "testKey3": 3}, dict(persistent_map3))
+        self.assertIs(persistent_map3, persistent_map3.delete("testKey1"))
+        self.assertIs(persistent_map3, persistent_map3.set("testKey2", 2))
+        self.assertEqual(2, persistent_map3["testKey2"])
+        with self.assertRaises(KeyError):
+            _ = persistent_map3["testKey1"]
+
+    def test_frozen_map_methods(self):
+        persistent_map = PersistentMap({"testKey1": 1})
+
+        self.assertDictEqual(
+            {"testKey1": 1, "testKey2": 2}, dict(persistent_map.with_item("testKey2", 2))
+        )
+        self.assertIs(persistent_map, persistent_map.with_item("testKey1", 1))
+        self.assertDictEqual({}, dict(persistent_map.without_item("testKey1")))
+        self.assertIs(persistent_map, persistent_map.without_item("testKey2"))
+        self.assertDictEqual({"testKey1": 3}, dict(persistent_map.with_items(testKey1=3)))
+        self.assertDictEqual({"testKey1": 1}, dict(persistent_map))
+
+    def test_iterable_map_methods(self):
+        persistent_map = PersistentMap({"testKey1": 1, "testKey2": 2})
+
+        self.assertEqual(2, persistent_map.size())
+        self.assertFalse(persistent_map.is_empty())
+        self.assertTrue(PersistentMap().is_empty())
+        self.assertTrue(persistent_map.contains_key("testKey1"))
+        self.assertTrue(persistent_map.contains_value(2))
+        self.assertFalse(persistent_map.contains_value(3))
+        self.assertSetEqual({"testKey1", "testKey2"}, set(persistent_map.keys_iterator()))
+        self.assertSetEqual({1, 2}, set(persistent_map.values_iterator()))
+        self.assertSetEqual(
+            {("testKey1", 1), ("testKey2", 2)}, set(persistent_map.items_tuple_iterator())
+        )
+        self.assertSetEqual(
+            {("testKey1", 1), ("testKey2", 2)},
+            {(item.key, item.value) for item in persistent_map.items_iterator()},
+        )
+        for cursor in persistent_map.cursor_iterator():
+            with self.assertRaises(TypeError):
+                cursor.set_value(0)
+
+    def test_random_operations(self):
+        rng = random.Random(7)
+        expected = {}
+        persistent_map = PersistentMap()
+        versions = []
+
+        for _ in range(3000):
+            key = rng.choice((rng.randrange(500), _CollidingKey(rng.randrange(20))))
+            if rng.random() < 0.3:
+                expected.pop(key, None)
+                persistent_map = persistent_map.delete(key)
+            else:
+                value = rng.randrange(100)
+                expected[key] = value
+                persistent_map = persistent_map.set(key, value)
+            if rng.random() < 0.01:
+                versions.append((dict(expected), persistent_map))
+
+        self.assertDictEqual(expected, dict(persistent_map))
+        self.assertEqual(len(expected), len(persistent_map))
+        for key in list(expected)[:50]:
+            self.assertIn(key, persistent_map)
+            persistent_map = persistent_map.delete(key)
+            self.assertNotIn(key, persistent_map)
+
+        for snapshot, version in versions:
+            self.assertDictEqual(snapshot, dict(version))
+
+    def test_transient(self):
+        persistent_map = PersistentMap({"testKey1": 1})
+        builder = persistent_map.transient()
+        for value in range(1000):
+            builder[value] = value
+        del builder["testKey1"]
+        for value in range(0, 1000, 2):
+            del builder[value]
+        with self.assertRaises(KeyError):
+            del builder[0]
+
+        built_map = builder.persistent()
+
+        self.assertDictEqual({"testKey1": 1}, dict(persistent_map))
+        self.assertDictEqual({value: value for value in range(1, 1000, 2)}, dict(built_map))
+        with self.assertRaises(TypeError):
+            builder["testKey2"] = 2
+
+        self.assertDictEqual(
+            {"testKey1": 1, "testKey2": 2, "testKey3": 3},
+            dict(persistent_map.set_all([("testKey2", 2)], testKey3=3)),
+        )
+
+    def test_pickle_and_repr(self):
+        persistent_map = PersistentMap({"testKey1": 1})
+
+        self.assertEqual(persistent_map, pickle.loads(pickle.dumps(persistent_map)))
+        self.assertEqual("PersistentMap({'testKey1': 1})", repr(persistent_map))
@@ -3,6 +3,7 @@ from unittest import TestCase
 
 from pycommons.base.function import Predicate, BiPredicate
 
+from pycommons.collections.functions.predicate import InPredicate
 from pycommons.collections.maps import ItemsIterator
 from pycommons.collections.maps.predicated import (
     PredicatedMap,
@@ -72,3 +73,33 @@ class TestCompositePredicatedMap(TestCase):
         self.assertFalse(predicated_map.validate("testKey3", 7))
         with self.assertRaises(ValueError):
             predicated_map["testKey3"] = 7
+
+
+class TestPredicatedMapBulkLoad(TestCase):
+    def test_extend(self):
+        tested = []
+        value_predicate = InPredicate([2, 4])
+        key_predicate = Predicate.of(lambda key: tested.append(key) or key.startswith("testKey"))
+        predicated_map: PredicatedMap[str, int] = PredicatedMap.from_iterable(
+            [("testKey1", 2), ("testKey2", 2)], key_predicate, value_predicate
+        )
+
+        with self.assertRaises(ValueError):
+            predicated_map.extend([("testKey1", 0)])
+        with self.assertRaises(ValueError):
+            predicated_map.extend([("testKey3", 2), ("unknown", 2)], chunk_size=1)
+        with self.assertRaises(ValueError):
+            predicated_map.extend([("testKey2", 4), ("testKey4", 3)], chunk_size=1)
+
+        self.assertDictEqual({"testKey1": 2, "testKey2": 2}, predicated_map.data)
+        self.assertIn("testKey3", tested)
+
+    def test_composite_extend(self):
+        predicate: BiPredicate[str, int] = BiPredicate.of(lambda key, value: len(key) == value)
+        composite_map: CompositePredicatedMap[str, int] = CompositePredicatedMap(predicate)
+
+        composite_map.extend([("a", 1), ("bb", 2)])
+        with self.assertRaises(ValueError):
+            composite_map.extend([("a", 9), ("ccc", 3), ("dd", 3)], chunk_size=2)
+
+        self.assertDictEqual({"a": 1, "bb": 2}, composite_map.data)
@@ -31,3 +31,33 @@ class SingletonMapTest(TestCase):
         self.assertEqual(1, len(fixed_size_map))
         with self.assertRaises(OverflowError):
             fixed_size_map["testKey2"] = "testValue2"
+
+
+class FixedSizeMapBulkLoadTest(TestCase):
+    def test_extend(self):
+        fixed_size_map: FixedSizeMap[str, int] = FixedSizeMap.from_iterable(
+            [("testKey1", 1), ("testKey2", 2)], 3
+        )
+        fixed_size_map.extend([("testKey1", 10), ("testKey3", 3)])
+
+        with self.assertRaises(OverflowError):
+            fixed_size_map.extend([("testKey1", 0), ("testKey4", 4)])
+
+        self.assertDictEqual({"testKey1": 10, "testKey2": 2, "testKey3": 3}, fixed_size_map.data)
+        self.assertTrue(fixed_size_map.is_full())
+
+    def test_extend_like_setitem(self):
+        fixed_size_map: FixedSizeMap[str, int] = FixedSizeMap(2, {"testKey1": 1})
+        fixed_size_map.extend([("testKey1", 10), ("testKey2", 2)])
+
+        # A full map rejects the pairs of keys that are already in it, like __setitem__
+        with self.assertRaises(OverflowError):
+            fixed_size_map["testKey1"] = 0
+        with self.assertRaises(OverflowError):
+            fixed_size_map.extend([("testKey1", 0)])
+        self.assertDictEqual({"testKey1": 10, "testKey2": 2}, fixed_size_map.data)
+
+        fixed_size_map = FixedSizeMap(2)
+        with self.assertRaises(OverflowError):
+            fixed_size_map.extend([("testKey1", 1), ("testKey2", 2), ("testKey2", 20)])
+        self.assertTrue(fixed_size_map.is_empty())
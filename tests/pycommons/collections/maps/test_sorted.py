@@ -0,0 +1,128 @@
+import copy
+import pickle
+import random
+from unittest import TestCase, mock
+
+from pycommons.collections.maps import SortedMap
+from pycommons.collections.sets.sorted import _SortedList
+
+
+class TestSortedMap(TestCase):
+    def test_sorted_map(self):
+        sorted_map = SortedMap({3: "c", 1: "a"})
+        sorted_map[2] = "b"
+        sorted_map[0] = "z"
+        del sorted_map[0]
+
+        self.assertEqual([1, 2, 3], list(sorted_map.keys()))
+        self.assertEqual(["a", "b", "c"], list(sorted_map.values()))
+        self.assertEqual([(1, "a"), (2, "b"), (3, "c")], list(sorted_map.items()))
+        self.assertEqual([1, 2, 3], [item.key for item in sorted_map])
+        self.assertEqual([1, 2, 3], list(sorted_map.keys_iterator()))
+        self.assertEqual([3, 2, 1], list(reversed(sorted_map)))
+        self.assertEqual([3, 2, 1], list(reversed(sorted_map.keys())))
+        self.assertEqual("SortedMap({1: 'a', 2: 'b', 3: 'c'})", repr(sorted_map))
+        self.assertEqual({1: "a", 2: "b", 3: "c"}, sorted_map)
+
+        for cursor in sorted_map.cursor_iterator():
+            cursor.value = cursor.value.upper()
+        self.assertEqual(["A", "B", "C"], list(sorted_map.values()))
+
+        self.assertEqual((3, "C"), sorted_map.popitem())
+        sorted_map.clear()
+        self.assertRaises(KeyError, sorted_map.popitem)
+        self.assertRaises(KeyError, sorted_map.first_key)
+        self.assertRaises(KeyError, sorted_map.last_key)
+
+    def test_navigation(self):
+        sorted_map = SortedMap((key, str(key)) for key in range(0, 100, 10))
+        self.assertEqual(0, sorted_map.first_key())
+        self.assertEqual(90, sorted_map.last_key())
+        self.assertEqual(20, sorted_map.floor_key(25))
+        self.assertEqual(20, sorted_map.floor_key(20))
+        self.assertIsNone(sorted_map.floor_key(-1))
+        self.assertEqual(10, sorted_map.lower_key(20))
+        self.assertEqual(30, sorted_map.ceiling_key(25))
+        self.assertEqual(30, sorted_map.ceiling_key(30))
+        self.assertIsNone(sorted_map.ceiling_key(91))
+        self.assertEqual(40, sorted_map.higher_key(30))
+        self.assertIsNone(sorted_map.higher_key(90))
+
+        self.assertEqual(3, sorted_map.rank(30))
+        self.assertEqual(4, sorted_map.rank(35))
+        self.assertEqual(10, sorted_map.rank(100))
+        self.assertEqual(30, sorted_map.select(3))
+        self.assertEqual(90, sorted_map.select(-1))
+        self.assertRaises(IndexError, sorted_map.select, 10)
+
+    def test_range_views(self):
+        sorted_map = SortedMap((key, str(key)) for key in range(10))
+        head = sorted_map.head_map(3)
+        tail = sorted_map.tail_map(7)
+        sub = sorted_map.sub_map(2, 5, to_inclusive=True)
+
+        self.assertEqual([0, 1, 2], list(head))
+        self.assertEqual([0, 1, 2, 3], list(sorted_map.head_map(3, inclusive=True)))
+        self.assertEqual([7, 8, 9], list(tail))
+        self.assertEqual([8, 9], list(sorted_map.tail_map(7, inclusive=False)))
+        self.assertEqual([2, 3, 4, 5], list(sub))
+        self.assertEqual([5, 4, 3, 2], list(reversed(sub)))
+        self.assertEqual([], list(sorted_map.sub_map(5, 2)))
+        self.assertEqual(4, len(sub))
+        self.assertEqual("3", sub[3])
+        self.assertRaises(KeyError, sub.__getitem__, 6)
+        self.assertIn(5, sub)
+        self.assertNotIn(6, sub)
+        self.assertEqual("SortedMapView({7: '7', 8: '8', 9: '9'})", repr(tail))
+
+        sorted_map[2.5] = "2.5"
+        del sorted_map[0]
+        self.assertEqual([1, 2, 2.5], list(head))
+        self.assertEqual([2, 2.5, 3, 4, 5], list(sub))
+
+    def test_copy(self):
+        sorted_map = SortedMap({2: "b", 1: "a"})
+        for _copy in (
+            sorted_map.copy(),
+            copy.copy(sorted_map),
+            copy.deepcopy(sorted_map),
+            pickle.loads(pickle.dumps(sorted_map)),
+        ):
+            _copy[0] = "z"
+            self.assertEqual([0, 1, 2], list(_copy.keys()))
+            self.assertEqual([1, 2], list(sorted_map.keys()))
+
+    def test_against_sorted(self):
+        generator = random.Random(7)
+        with mock.patch.object(_SortedList, "_LOAD", 4):
+            sorted_map = SortedMap()
+            expected = {}
+            for _ in range(2000):
+                key = generator.randrange(200)
+                if generator.random() < 0.4 and key in expected:
+                    del sorted_map[key]
+                    del expected[key]
+                else:
+                    sorted_map[key] = key
+                    expected[key] = key
+
+                keys = sorted(expected)
+                self.assertEqual(keys, list(sorted_map.keys()))
+                probe = generator.randrange(-5, 205)
+                self.assertEqual(sum(1 for key in keys if key < probe), sorted_map.rank(probe))
+                if keys:
+                    index = generator.randrange(len(keys))
+                    self.assertEqual(keys[index], sorted_map.select(index))
+                    upper = generator.randrange(200)
+                    self.assertEqual(
+                        [key for key in keys if probe <= key < upper],
+                        list(sorted_map.sub_map(probe, upper)),
+                    )
+                    self.assertEqual(
+                        [key for key in reversed(keys) if probe <= key < upper],
+                        list(reversed(sorted_map.sub_map(probe, upper))),
+                    )
+
+    def test_extend(self):
+        sorted_map = SortedMap.from_iterable(((key, key) for key in (5, 1, 3)), chunk_size=2)
+        self.assertEqual([1, 3, 5], list(sorted_map.keys()))
@@ -0,0 +1,25 @@
+from unittest import TestCase
+
+from pycommons.collections.maps import UnmodifiableMap
+
+
+class TestUnmodifiableMap(TestCase):
+    def test_unmodifiable_map(self):
+        unmodifiable_map: UnmodifiableMap[str, int] = UnmodifiableMap({"testKey1": 1})
+
+        self.assertEqual(1, unmodifiable_map["testKey1"])
+        self.assertTrue(unmodifiable_map.is_full())
+        with self.assertRaises(TypeError):
+            unmodifiable_map["testKey2"] = 2
+
+    def test_unmodifiable_iterators(self):
+        unmodifiable_map: UnmodifiableMap[str, int] = UnmodifiableMap({"testKey1": 1})
+
+        item = next(unmodifiable_map.items_iterator())
+        with self.assertRaises(TypeError):
+            item.set_value(2)
+
+        cursor = next(unmodifiable_map.cursor_iterator())
+        self.assertEqual(1, cursor.value)
+        with self.assertRaises(TypeError):
+            cursor.value = 2
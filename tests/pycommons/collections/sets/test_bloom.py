@@ -0,0 +1,238 @@
+import pickle
+from unittest import TestCase
+
+from pycommons.collections.sets import BloomFilter, ScalableBloomFilter
+from pycommons.collections.sets.bloom import _HEADER, _sizes
+
+
+class TestBloomFilter(TestCase):
+    def test_bloom_filter(self):
+        bloom_filter = BloomFilter(1000, 0.01)
+        bloom_filter.add("a")
+        bloom_filter.add("a")
+        bloom_filter.update([b"b", 3, -3, True])
+
+        self.assertIn("a", bloom_filter)
+        self.assertIn(b"b", bloom_filter)
+        self.assertIn(bytearray(b"b"), bloom_filter)
+        self.assertIn(3, bloom_filter)
+        self.assertIn(-3, bloom_filter)
+        self.assertIn(1, bloom_filter)
+        self.assertNotIn("b", bloom_filter)
+        self.assertNotIn(b"a", bloom_filter)
+        self.assertEqual(5, len(bloom_filter))
+        self.assertEqual(1000, bloom_filter.get_capacity())
+        self.assertEqual(0.01, bloom_filter.get_error_rate())
+        self.assertFalse(bloom_filter.is_full())
+        self.assertEqual("BloomFilter(capacity=1000, error_rate=0.01, len=5)", repr(bloom_filter))
+
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.0)
+
+    def test_elements(self):
+        bloom_filter = BloomFilter(1000, 0.01)
+        for element in (None, 1.5, ("a", 3), object(), [1]):
+            self.assertNotIn(element, bloom_filter)
+
+        bloom_filter.update([None, 1.5, float("inf"), ("a", (b"b", 3)), 2.0, -0.0])
+        self.assertIn(None, bloom_filter)
+        self.assertIn(1.5, bloom_filter)
+        self.assertIn(float("inf"), bloom_filter)
+        self.assertIn(("a", (bytearray(b"b"), 3.0)), bloom_filter)
+        self.assertIn(2, bloom_filter)
+        self.assertIn(0, bloom_filter)
+        self.assertNotIn(("a", b"b", 3), bloom_filter)
+        self.assertNotIn(("a",), bloom_filter)
+        self.assertNotIn(2.5, bloom_filter)
+        self.assertEqual(6, len(bloom_filter))
+
+        with self.assertRaises(TypeError):
+            bloom_filter.add(object())
+        with self.assertRaises(TypeError):
+            bloom_filter.add(("a", [1]))
+        self.assertEqual(6, len(bloom_filter))
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(2000, 0.01)
+        self.assertEqual(0.0, bloom_filter.false_positive_rate())
+        bloom_filter.update(f"in-{i}" for i in range(2000))
+
+        self.assertTrue(all(f"in-{i}" in bloom_filter for i in range(2000)))
+        false_positives = sum(f"out-{i}" in bloom_filter for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.02)
+        self.assertAlmostEqual(0.01, bloom_filter.false_positive_rate(), delta=0.002)
+        # Elements found before they are added are not counted
+        self.assertGreater(len(bloom_filter), 1980)
+        bloom_filter.update(f"more-{i}" for i in range(20))
+        self.assertTrue(bloom_filter.is_full())
+
+    def test_union_intersection(self):
+        first = BloomFilter(100)
+        first.update(range(0, 60))
+        second = BloomFilter(100)
+        second.update(range(40, 100))
+
+        union = first | second
+        self.assertEqual(union, first.union(second))
+        self.assertTrue(all(i in union for i in range(100)))
+        self.assertAlmostEqual(100, len(union), delta=10)
+
+        intersection = first & second
+        self.assertEqual(intersection, first.intersection(second))
+        self.assertTrue(all(i in intersection for i in range(40, 60)))
+        self.assertLess(sum(i in intersection for i in range(100)), 40)
+
+        with self.assertRaises(ValueError):
+            first.union(BloomFilter(200))
+        with self.assertRaises(ValueError):
+            first.intersection(BloomFilter(100, 0.1))
+
+    def test_copy(self):
+        bloom_filter = BloomFilter(100)
+        bloom_filter.add("a")
+        copy = bloom_filter.copy()
+        copy.add("b")
+
+        self.assertNotIn("b", bloom_filter)
+        self.assertIn("b", copy)
+        self.assertEqual(1, len(bloom_filter))
+        self.assertNotEqual(bloom_filter, copy)
+        self.assertNotEqual(bloom_filter, {"a"})
+
+    def test_serialization(self):
+        bloom_filter = BloomFilter(100, 0.05)
+        bloom_filter.update(["a", "b", 1])
+        data = bloom_filter.to_bytes()
+
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(bloom_filter, BloomFilter.from_bytes(data))
+        self.assertEqual(bloom_filter, BloomFilter.from_bytes(memoryview(data)))
+        self.assertIn("a", BloomFilter.from_bytes(data))
+        self.assertEqual(bloom_filter, pickle.loads(pickle.dumps(bloom_filter)))
+
+        for invalid in (b"", b"XX" + data[2:], data[:2] + b"\x02" + data[3:], data[:-1]):
+            with self.assertRaises(ValueError):
+                BloomFilter.from_bytes(invalid)
+        with self.assertRaises(ValueError):
+            BloomFilter.from_bytes(data + b"\x00")
+
+        # A header with a huge capacity is rejected before its bits are allocated
+        huge = _HEADER.pack(b"PB", 1, 2**60, 0.01, 0, *_sizes(2**60, 0.01))
+        with self.assertRaises(ValueError):
+            BloomFilter.from_bytes(huge + b"\x00" * 8)
+
+
+class TestScalableBloomFilter(TestCase):
+    def test_scalable_bloom_filter(self):
+        bloom_filter = ScalableBloomFilter(100, 0.01)
+        self.assertEqual(0, len(bloom_filter))
+        self.assertEqual(0, bloom_filter.get_capacity())
+        self.assertNotIn("a", bloom_filter)
+
+        bloom_filter.update(f"in-{i}" for i in range(1000))
+        bloom_filter.update(f"in-{i}" for i in range(1000))
+
+        self.assertTrue(all(f"in-{i}" in bloom_filter for i in range(1000)))
+        self.assertAlmostEqual(1000, len(bloom_filter), delta=20)
+        # 100 + 200 + 400 + 800
+        self.assertEqual(1500, bloom_filter.get_capacity())
+        self.assertEqual(0.01, bloom_filter.get_error_rate())
+        false_positives = sum(f"out-{i}" in bloom_filter for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.015)
+        self.assertLess(bloom_filter.false_positive_rate(), 0.01)
+        self.assertTrue(repr(bloom_filter).startswith("ScalableBloomFilter(initial_capacity=100"))
+
+        self.assertNotIn(None, bloom_filter)
+        self.assertNotIn(("in-1",), bloom_filter)
+        with self.assertRaises(TypeError):
+            bloom_filter.add(object())
+        with self.assertRaises(ValueError):
+            ScalableBloomFilter(100, growth=0)
+        with self.assertRaises(ValueError):
+            ScalableBloomFilter(100, tightening=1)
+
+    def test_union(self):
+        first = ScalableBloomFilter(10)
+        first.update(range(0, 50))
+        second = ScalableBloomFilter(10)
+        second.update(range(25, 30))
+
+        union = first | second
+        self.assertEqual(union, second.union(first))
+        self.assertTrue(all(i in union for i in range(50)))
+        self.assertFalse(union.union(ScalableBloomFilter(10)) != union)
+
+        with self.assertRaises(ValueError):
+            first.union(ScalableBloomFilter(20))
+
+    def test_union_false_positive_rate(self):
+        first = ScalableBloomFilter(100, 0.01)
+        first.update(f"first-{i}" for i in range(2000))
+        second = ScalableBloomFilter(100, 0.01)
+        second.update(f"second-{i}" for i in range(2000))
+
+        union = first | second
+        self.assertTrue(all(f"first-{i}" in union for i in range(2000)))
+        self.assertTrue(all(f"second-{i}" in union for i in range(2000)))
+        false_positives = sum(f"out-{i}" in union for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.025)
+        self.assertLess(union.false_positive_rate(), 0.02)
+        self.assertAlmostEqual(4000, len(union), delta=100)
+
+        union.update(f"third-{i}" for i in range(2000))
+        self.assertTrue(all(f"third-{i}" in union for i in range(2000)))
+        self.assertLess(sum(f"out-{i}" in union for i in range(10000)) / 10000, 0.025)
+
+    def test_union_filters(self):
+        bloom_filter = ScalableBloomFilter(100)
+        bloom_filter.update(range(3000))
+        # 100 + 200 + 400 + 800 + 1600
+        self.assertEqual(3100, bloom_filter.get_capacity())
+
+        union = bloom_filter | bloom_filter.copy()
+        self.assertEqual(bloom_filter, union)
+        self.assertEqual(len(bloom_filter), len(union))
+
+        other = ScalableBloomFilter(100)
+        other.update(range(3000, 6000))
+        union = bloom_filter | other
+        self.assertEqual(6200, union.get_capacity())
+        # The next filter is the sixth of the growth sequence, not the eleventh
+        union.update(range(6000, 6000 + 1600))
+        self.assertEqual(6200 + 3200, union.get_capacity())
+        copy = ScalableBloomFilter.from_bytes(union.to_bytes())
+        copy.update(range(10000, 10000 + 4000))
+        self.assertEqual(6200 + 3200 + 6400, copy.get_capacity())
+
+    def test_copy(self):
+        bloom_filter = ScalableBloomFilter(10)
+        bloom_filter.update(range(20))
+        copy = bloom_filter.copy()
+        copy.update(range(20, 40))
+
+        self.assertEqual(20, len(bloom_filter))
+        self.assertNotIn(30, bloom_filter)
+        self.assertIn(30, copy)
+        self.assertNotEqual(bloom_filter, copy)
+        self.assertNotEqual(bloom_filter, BloomFilter(10))
+
+    def test_serialization(self):
+        bloom_filter = ScalableBloomFilter(10, 0.05, growth=3, tightening=0.8)
+        bloom_filter.update(range(100))
+        data = bloom_filter.to_bytes()
+
+        copy = ScalableBloomFilter.from_bytes(data)
+        self.assertEqual(bloom_filter, copy)
+        self.assertTrue(all(i in copy for i in range(100)))
+        self.assertEqual(bloom_filter, pickle.loads(pickle.dumps(bloom_filter)))
+        self.assertEqual(
+            ScalableBloomFilter(), ScalableBloomFilter.from_bytes(ScalableBloomFilter().to_bytes())
+        )
+
+        for invalid in (b"", b"XX" + data[2:], data[:2] + b"\x02" + data[3:], data[:-1], data[:60]):
+            with self.assertRaises(ValueError):
+                ScalableBloomFilter.from_bytes(invalid)
+        with self.assertRaises(ValueError):
+            ScalableBloomFilter.from_bytes(data + b"\x00")
@@ -0,0 +1,115 @@
+import pickle
+from unittest import TestCase
+
+from pycommons.collections.sets import OrderedSet
+
+
+class TestOrderedSet(TestCase):
+    def test_ordered_set(self):
+        ordered_set: OrderedSet[int] = OrderedSet([3, 1, 3, 2, 1])
+        self.assertListEqual([3, 1, 2], list(ordered_set))
+        self.assertEqual(3, len(ordered_set))
+        self.assertTrue(1 in ordered_set)
+        self.assertFalse(4 in ordered_set)
+
+        ordered_set.add(4)
+        ordered_set.add(3)
+        self.assertListEqual([3, 1, 2, 4], list(ordered_set))
+        self.assertListEqual([4, 2, 1, 3], list(reversed(ordered_set)))
+        self.assertEqual(OrderedSet([1, 2, 3, 4]), ordered_set)
+        self.assertEqual("OrderedSet([3, 1, 2, 4])", repr(ordered_set))
+
+    def test_discard(self):
+        ordered_set: OrderedSet[int] = OrderedSet(range(10))
+        ordered_set.discard(5)
+        ordered_set.discard(5)
+        ordered_set.discard(0)
+        ordered_set.discard(9)
+
+        self.assertFalse(5 in ordered_set)
+        self.assertListEqual([1, 2, 3, 4, 6, 7, 8], list(ordered_set))
+        with self.assertRaises(KeyError):
+            ordered_set.remove(5)
+
+    def test_getitem(self):
+        ordered_set: OrderedSet[str] = OrderedSet(["a", "b", "c", "d", "e"])
+        self.assertEqual("a", ordered_set[0])
+        self.assertEqual("e", ordered_set[-1])
+        self.assertEqual(OrderedSet(["b", "c"]), ordered_set[1:3])
+
+        ordered_set.discard("c")
+        ordered_set.add("c")
+        self.assertEqual("d", ordered_set[2])
+        self.assertEqual("c", ordered_set[-1])
+        self.assertListEqual(["b", "d", "e"], list(ordered_set[1:4]))
+
+        with self.assertRaises(IndexError):
+            _ = ordered_set[5]
+
+    def test_pop_and_popleft(self):
+        ordered_set: OrderedSet[int] = OrderedSet(range(100))
+        self.assertEqual(0, ordered_set[0])
+        ordered_set.discard(50)
+
+        self.assertEqual(99, ordered_set.pop())
+        self.assertEqual(0, ordered_set.popleft())
+        self.assertEqual(1, ordered_set.popleft())
+        ordered_set.add(100)
+        self.assertEqual(100, ordered_set.pop())
+
+        drained = []
+        while ordered_set:
+            drained.append(ordered_set.popleft())
+        self.assertListEqual([i for i in range(2, 99) if i != 50], drained)
+
+        with self.assertRaises(KeyError):
+            ordered_set.pop()
+        with self.assertRaises(KeyError):
+            ordered_set.popleft()
+
+    def test_operations(self):
+        ordered_set: OrderedSet[int] = OrderedSet([1, 2, 3])
+        self.assertListEqual([1, 2, 3, 4, 5], list(ordered_set.union([4], [5, 1])))
+        self.assertListEqual([1, 2, 3], list(ordered_set))
+        self.assertListEqual([2, 3], list(ordered_set & {2, 3, 5}))
+
+        ordered_set.update([0])
+        self.assertListEqual([1, 2, 3, 0], list(ordered_set))
+        self.assertListEqual([1, 2, 3, 0], list(pickle.loads(pickle.dumps(ordered_set))))
+
+        ordered_set.clear()
+        self.assertEqual(0, len(ordered_set))
+
+    def test_named_operations(self):
+        ordered_set: OrderedSet[int] = OrderedSet([4, 1, 3, 2])
+        self.assertListEqual([1, 2], list(ordered_set.intersection([2, 1, 5], iter([1, 2]))))
+        self.assertListEqual([4, 3], list(ordered_set.difference([1], (2, 6))))
+        self.assertListEqual([4, 3, 6, 5], list(ordered_set.symmetric_difference([6, 1, 2, 5])))
+        self.assertListEqual([4, 1, 3, 2], list(ordered_set))
+        self.assertIsInstance(ordered_set.intersection([1]), OrderedSet)
+
+        self.assertTrue(ordered_set.issubset(range(5)))
+        self.assertFalse(ordered_set.issubset([1, 2, 3]))
+        self.assertTrue(ordered_set.issuperset(iter([1, 4])))
+        self.assertFalse(ordered_set.issuperset([1, 5]))
+        self.assertTrue(ordered_set.isdisjoint([0, 5]))
+
+        ordered_set.intersection_update([1, 2, 3, 4, 5], [2, 3, 4])
+        self.assertListEqual([4, 3, 2], list(ordered_set))
+        ordered_set.difference_update([3])
+        self.assertListEqual([4, 2], list(ordered_set))
+        ordered_set.symmetric_difference_update([2, 7])
+        self.assertListEqual([4, 7], list(ordered_set))
+
+    def test_removed_is_created_lazily(self):
+        ordered_set: OrderedSet[int] = OrderedSet(range(5))
+        self.assertIsNone(ordered_set._removed)  # pylint: disable=W0212
+        self.assertEqual(0, ordered_set[0])
+        ordered_set.discard(0)
+        ordered_set.discard(4)
+        self.assertIsNone(ordered_set._removed)  # pylint: disable=W0212
+        ordered_set.discard(2)
+        self.assertEqual({2}, ordered_set._removed)  # pylint: disable=W0212
+        self.assertEqual(3, ordered_set[1])
+        self.assertIsNone(ordered_set._removed)  # pylint: disable=W0212
+        self.assertListEqual([1, 3], list(ordered_set))
@@ -0,0 +1,83 @@
+import pickle
+import random
+from unittest import TestCase, mock
+
+from pycommons.collections.sets import SortedSet
+from pycommons.collections.sets.sorted import _SortedList
+
+
+class TestSortedSet(TestCase):
+    def test_sorted_set(self):
+        sorted_set = SortedSet([5, 1, 3, 1])
+        sorted_set.add(2)
+        sorted_set.add(2)
+        sorted_set.discard(5)
+        sorted_set.discard(5)
+
+        self.assertEqual([1, 2, 3], list(sorted_set))
+        self.assertEqual([3, 2, 1], list(reversed(sorted_set)))
+        self.assertEqual(3, len(sorted_set))
+        self.assertIn(2, sorted_set)
+        self.assertNotIn(5, sorted_set)
+        self.assertEqual(2, sorted_set[1])
+        self.assertEqual(3, sorted_set[-1])
+        self.assertEqual(1, sorted_set.rank(2))
+        self.assertEqual("SortedSet([1, 2, 3])", repr(sorted_set))
+        self.assertEqual({1, 2, 3}, sorted_set)
+
+        self.assertEqual(1, sorted_set.first())
+        self.assertEqual(3, sorted_set.last())
+        self.assertEqual(2, sorted_set.floor(2))
+        self.assertEqual(1, sorted_set.lower(2))
+        self.assertEqual(2, sorted_set.ceiling(2))
+        self.assertEqual(3, sorted_set.higher(2))
+        self.assertIsNone(sorted_set.higher(3))
+        self.assertIsNone(sorted_set.lower(1))
+
+        copy = sorted_set.copy()
+        copy.add(0)
+        self.assertEqual([1, 2, 3], list(sorted_set))
+        self.assertEqual([0, 1, 2, 3], list(copy))
+        self.assertEqual(sorted_set, pickle.loads(pickle.dumps(sorted_set)))
+
+        self.assertEqual(3, sorted_set.pop())
+        sorted_set.clear()
+        self.assertRaises(KeyError, sorted_set.pop)
+        self.assertRaises(KeyError, sorted_set.first)
+        self.assertRaises(KeyError, sorted_set.last)
+
+    def test_range_views(self):
+        sorted_set = SortedSet(range(10))
+        head = sorted_set.head_set(3)
+        self.assertEqual([0, 1, 2], list(head))
+        self.assertEqual([7, 8, 9], list(sorted_set.tail_set(7)))
+        self.assertEqual([3, 4], list(sorted_set.sub_set(2, 5, False, False)))
+        self.assertEqual([4, 3], list(reversed(sorted_set.sub_set(2, 5, False, False))))
+        self.assertEqual(3, len(head))
+        self.assertIn(2, head)
+        self.assertNotIn(3, head)
+        self.assertEqual("SortedSetView([0, 1, 2])", repr(head))
+
+        sorted_set.discard(1)
+        self.assertEqual([0, 2], list(head))
+
+    def test_against_sorted(self):
+        generator = random.Random(11)
+        with mock.patch.object(_SortedList, "_LOAD", 4):
+            sorted_set = SortedSet()
+            expected = set()
+            for _ in range(2000):
+                element = generator.randrange(300)
+                if generator.random() < 0.4:
+                    sorted_set.discard(element)
+                    expected.discard(element)
+                else:
+                    sorted_set.add(element)
+                    expected.add(element)
+
+                elements = sorted(expected)
+                self.assertEqual(elements, list(sorted_set))
+                self.assertEqual(elements[::-1], list(reversed(sorted_set)))
+                if elements:
+                    index = generator.randrange(len(elements))
+                    self.assertEqual(elements[index], sorted_set[index])
@@ -0,0 +1,232 @@
+import array
+import collections
+import io
+import pickle
+from unittest import TestCase
+
+from pycommons.base.function import Supplier
+
+from pycommons.collections.codec import StreamDecoder, StreamEncoder, decode, encode
+from pycommons.collections.maps import (
+    CompactMultiValuedMap,
+    ConcurrentMap,
+    DefaultedMap,
+    FIFOMap,
+    FixedSizeMap,
+    FrozenMap,
+    IndexedMap,
+    IterableMap,
+    LFUMap,
+    LRUMap,
+    MultiValuedMap,
+    OrderedMap,
+    PersistentMap,
+    SingletonMap,
+    SortedMap,
+    TTLMap,
+    UnmodifiableMap,
+)
+from pycommons.collections.sets import OrderedSet, SortedSet
+
+
+class TestCodec(TestCase):
+    def test_round_trip(self):
+        values = [
+            None,
+            True,
+            False,
+            0,
+            -1,
+            127,
+            -(2**70),
+            2**100,
+            1.5,
+            float("inf"),
+            "",
+            "héllo",
+            b"\x00\xff",
+            [1, "a", [2.0, None]],
+            (1, (2,)),
+            {1, 2},
+            frozenset({"a"}),
+            {"a": {"b": [1, 2]}},
+            collections.OrderedDict([("b", 1), ("a", 2)]),
+            FrozenMap({"a": 1}),
+            PersistentMap({"a": 1, 2: "b"}),
+            OrderedSet([3, 1, 2]),
+            SortedSet([3, 1, 2]),
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                decoded = decode(encode(value))
+                self.assertEqual(value, decoded)
+                self.assertIs(type(value), type(decoded))
+
+    def test_maps(self):
+        iterable_map = IterableMap({"b": 1, "a": 2})
+        ordered_map = OrderedMap()
+        ordered_map.update({"b": 1, "a": 2})
+        multi_valued_map = MultiValuedMap()
+        multi_valued_map.put_all("a", [3, 1, 2])
+        compact_map = CompactMultiValuedMap()
+        compact_map.put_all("a", [1, 2])
+        compact_map.put_all("b", range(20))
+
+        sorted_map = SortedMap({"b": 1, "a": 2})
+        indexed_map = IndexedMap({"b": 1, "a": 2, "c": 1})
+        fixed_size_map = FixedSizeMap(3, {"b": 1, "a": 2})
+        defaulted_map = DefaultedMap([0], {"b": 1, "a": 2})
+        concurrent_map = ConcurrentMap({"b": 1, "a": 2}, concurrency_level=4)
+
+        for value in (
+            iterable_map,
+            ordered_map,
+            multi_valued_map,
+            compact_map,
+            sorted_map,
+            indexed_map,
+            fixed_size_map,
+            SingletonMap({"a": 1}),
+            UnmodifiableMap({"b": 1, "a": 2}),
+            defaulted_map,
+            concurrent_map,
+        ):
+            with self.subTest(value=value):
+                decoded = decode(encode(value))
+                self.assertIs(type(value), type(decoded))
+                self.assertEqual(list(value.items()), list(decoded.items()))
+
+        self.assertIsInstance(decode(encode(compact_map))["a"], tuple)
+        self.assertIsInstance(decode(encode(compact_map))["b"], OrderedSet)
+        self.assertEqual(("b", "c"), decode(encode(indexed_map)).keys_for_value(1))
+        self.assertEqual(3, decode(encode(fixed_size_map)).max_size())
+        self.assertEqual([0], decode(encode(defaulted_map))["c"])
+        self.assertEqual(4, len(decode(encode(concurrent_map)).data.segments))
+        # The size, after the header and the tag, is smaller than the number of entries
+        data = encode(FixedSizeMap(2, {"a": 1, "b": 2}))
+        self.assertRaises(ValueError, decode, data[:5] + b"\x01" + data[6:])
+
+    def test_evicting_maps(self):
+        for cls in (FIFOMap, LRUMap, LFUMap):
+            with self.subTest(cls=cls):
+                value = cls(3, {"a": 1, "b": 2, "c": 3})
+                _ = value["a"], value["a"], value["b"]
+                decoded = decode(encode(value))
+                self.assertIs(cls, type(decoded))
+                self.assertEqual(3, decoded.max_size())
+                self.assertEqual(list(value.items()), list(decoded.items()))
+
+                value["d"] = 4
+                decoded["d"] = 4
+                self.assertEqual(list(value.items()), list(decoded.items()))
+
+        value = LFUMap(20, {i: i for i in range(10)})
+        for i in range(10):
+            for _ in range(i):
+                _ = value[i]
+        decoded = decode(encode(value))
+        self.assertEqual([i + 1 for i in range(10)], list(map(decoded.get_frequency, range(10))))
+
+        now = [100.0]
+        clock = Supplier.of(lambda: now[0])
+        value = TTLMap(10, 5.0, clock=clock)
+        value["a"] = 1
+        now[0] += 3
+        value["b"] = 2
+        decoded = decode(encode(value))
+        self.assertIs(TTLMap, type(decoded))
+        self.assertEqual(5.0, decoded.ttl())
+        self.assertEqual({"a": 1, "b": 2}, dict(decoded.items()))
+        # The entries keep the time they had left, on the clock of the decoding process
+        self.assertEqual(2, len(decoded))
+
+    def test_columns(self):
+        values = [
+            list(range(10)),
+            [-(2**7), 2**7 - 1] * 5,
+            [-(2**15), 2**15 - 1] * 5,
+            [-(2**31), 2**31 - 1] * 5,
+            [-(2**63), 2**63 - 1] * 5,
+            [-(2**63) - 1, 2**64] * 5,
+            [True, False] * 5,
+            [i / 7 for i in range(10)] + [float("inf")],
+            [f"s{i % 3}" for i in range(10)] + ["héllo"],
+            [""] * 10,
+            [b"a" * i for i in range(10)],
+            [[i] * i for i in range(10)],
+            [(i, str(i)) for i in range(10)],
+            [1, 1.5, "a", None, b"b", [1], {"a": 1}, 2, 3, 4],
+            [{"id": i, "name": f"name-{i % 3}", "tags": ["a", "b"]} for i in range(10)],
+            [{"id": i} if i % 2 else {"key": i} for i in range(10)],
+            [{} for _ in range(10)],
+            [[] for _ in range(10)],
+        ]
+        for value in values:
+            for intern_strings in (True, False):
+                with self.subTest(value=value, intern_strings=intern_strings):
+                    decoded = decode(encode(value, intern_strings=intern_strings))
+                    self.assertEqual(value, decoded)
+                    self.assertEqual(list(map(type, value)), list(map(type, decoded)))
+
+        # Strings are interned across the columns of the records
+        value = [[f"name-{i % 3}" for i in range(10)] for _ in range(10)]
+        self.assertEqual(value, decode(encode(value)))
+        self.assertLess(len(encode(value)), len(encode(value, intern_strings=False)) / 3)
+        self.assertLess(len(encode(list(range(1000)))), 2100)
+
+        data = bytearray(encode([b"payload"] * 10))
+        self.assertIsInstance(decode(data, zero_copy=True)[0], memoryview)
+        self.assertEqual([b"payload"] * 10, decode(data, zero_copy=True))
+
+    def test_interning(self):
+        value = [{"name": i, "kind": "item"} for i in range(100)]
+        interned = encode(value)
+        self.assertEqual(value, decode(interned))
+        self.assertLess(len(interned), len(encode(value, intern_strings=False)))
+        self.assertEqual(value, decode(encode(value, intern_strings=False)))
+        self.assertLess(len(interned), len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+
+    def test_zero_copy(self):
+        data = bytearray(encode({"a": b"payload"}))
+        decoded = decode(data, zero_copy=True)
+        self.assertIsInstance(decoded["a"], memoryview)
+        self.assertEqual(b"payload", decoded["a"])
+        self.assertIsInstance(decode(data)["a"], bytes)
+
+    def test_errors(self):
+        self.assertRaises(TypeError, encode, object())
+        self.assertRaises(TypeError, encode, [1, object()])
+        self.assertRaises(ValueError, decode, b"XX\x01\x00\x00")
+        self.assertRaises(ValueError, decode, b"PC\x02\x00\x00")
+        self.assertRaises(ValueError, decode, encode("abc")[:-1])
+        self.assertRaises(ValueError, decode, encode(1) + b"\x00")
+        self.assertRaises(ValueError, decode, b"PC\x01\x00\xff")
+        self.assertRaises(ValueError, decode, encode(list(range(8)))[:-1])
+
+        data = encode([1.5, -(2**70), "a", b"b", list(range(8)), ["c"] * 8, TTLMap(2, 1.0)])
+        for end in range(len(data)):
+            with self.subTest(end=end):
+                self.assertRaises(ValueError, decode, data[:end])
+
+    def test_memoryview(self):
+        values = array.array("i", [1, 2])
+        self.assertEqual(values.tobytes(), decode(encode(memoryview(values))))
+        self.assertEqual(b"ace", decode(encode(memoryview(b"abcdef")[::2])))
+
+    def test_stream(self):
+        stream = io.BytesIO()
+        encoder = StreamEncoder(stream)
+        ordered_map = OrderedMap()
+        ordered_map["key"] = b"x"
+        values = [{"key": 1}, {"key": 2}, "key", ordered_map]
+        for value in values:
+            encoder.write(value)
+
+        stream.seek(0)
+        decoder = StreamDecoder(stream)
+        self.assertEqual(values[0], decoder.read())
+        self.assertEqual(values[1:], list(decoder))
+        self.assertRaises(EOFError, decoder.read)
+
+        stream = io.BytesIO(stream.getvalue()[:-1])
+        self.assertRaises(ValueError, list, StreamDecoder(stream))
@@ -0,0 +1,90 @@
+import json
+import subprocess
+import sys
+from unittest import TestCase
+
+import pycommons.collections
+from pycommons.collections import maps, sets
+
+
+def _loaded_modules(statement: str, *modules: str) -> dict:
+    code = "\n".join(
+        [
+            "import json, sys",
+            statement,
+            f"print(json.dumps({{m: m in sys.modules for m in {list(modules)!r}}}))",
+        ]
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+class TestImports(TestCase):
+    def test_import_package(self):
+        loaded = _loaded_modules(
+            "import pycommons.collections",
+            "importlib_metadata",
+            "pycommons.collections.maps",
+            "pycommons.collections.sets",
+        )
+        self.assertEqual(
+            {
+                "importlib_metadata": False,
+                "pycommons.collections.maps": False,
+                "pycommons.collections.sets": False,
+            },
+            loaded,
+        )
+
+    def test_import_set(self):
+        loaded = _loaded_modules(
+            "from pycommons.collections.sets import OrderedSet",
+            "importlib_metadata",
+            "pycommons.base",
+            "pycommons.collections.maps",
+            "pycommons.collections.sets.sorted",
+        )
+        self.assertFalse(any(loaded.values()), loaded)
+
+    def test_import_map(self):
+        loaded = _loaded_modules(
+            "from pycommons.collections.maps import OrderedMap",
+            "bisect",
+            "contextvars",
+            "logging",
+            "threading",
+            "pycommons.collections.instrumentation",
+            "pycommons.base.function",
+            "pycommons.collections.maps.lazy",
+            "pycommons.collections.maps.persistent",
+        )
+        self.assertFalse(any(loaded.values()), loaded)
+
+    def test_import_predicates(self):
+        loaded = _loaded_modules(
+            "from pycommons.collections.maps.predicated import PredicatedMap\n"
+            "from pycommons.collections.functions.predicate import InPredicate",
+            "numpy",
+        )
+        self.assertDictEqual({"numpy": False}, loaded)
+
+    def test_exports(self):
+        self.assertIn("maps", dir(pycommons.collections))
+        self.assertIn("__version__", dir(pycommons.collections))
+        self.assertIn("OrderedMap", dir(maps))
+        self.assertIn("SortedSet", dir(sets))
+        self.assertEqual(sorted(maps.__all__), sorted(set(maps.__all__)))
+        for name in maps.__all__:
+            self.assertEqual(name, getattr(maps, name).__name__)
+        for name in sets.__all__:
+            self.assertEqual(name, getattr(sets, name).__name__)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            getattr(pycommons.collections, "unknown")
+        with self.assertRaises(AttributeError):
+            getattr(maps, "UnknownMap")
+        with self.assertRaises(AttributeError):
+            getattr(sets, "UnknownSet")
@@ -0,0 +1,301 @@
+import contextvars
+import logging
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from pycommons.base.function import BiPredicate, Function, Predicate
+
+from pycommons.collections import instrumentation
+from pycommons.collections.instrumentation import (
+    BULK_FACTORY_SECONDS,
+    FACTORY_SECONDS,
+    GETS,
+    ITERATIONS,
+    MISSES,
+    PREDICATE_EVALUATIONS,
+    REJECTIONS,
+    SETS,
+    Histogram,
+    InMemorySink,
+    LoggingSink,
+    PrometheusFileSink,
+    profile,
+)
+from pycommons.collections.functions.compiler import compile_predicate
+from pycommons.collections.functions.memoized import MemoizedPredicate
+from pycommons.collections.functions.predicate import (
+    AllPredicate,
+    EqualsPredicate,
+    InPredicate,
+    NotPredicate,
+)
+from pycommons.collections.maps import (
+    CompactMultiValuedMap,
+    ConcurrentLazyMap,
+    ConcurrentMap,
+    DefaultedMap,
+    FixedSizeMap,
+    IndexedMap,
+    IterableMap,
+    LazyMap,
+    LRUMap,
+    MultiValuedMap,
+    OrderedMap,
+    SortedMap,
+    TTLMap,
+)
+from pycommons.collections.maps.predicated import CompositePredicatedMap, PredicatedMap
+
+
+class TestInstrumentation(TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_disabled(self):
+        sink = InMemorySink()
+        lazy_map = LazyMap(Function.of(len))
+        self.assertEqual(3, lazy_map["abc"])
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual({}, sink.counters())
+
+    def test_lazy_map(self):
+        with profile() as sink:
+            lazy_map = LazyMap(Function.of(len), bulk_factory=Function.of(lambda keys: {"a": 1}))
+            lazy_map["abc"] = 3
+            self.assertEqual(3, lazy_map["abc"])
+            self.assertEqual(2, lazy_map["de"])
+            self.assertEqual({"a": 1, "bc": 2}, lazy_map.get_many(["a", "bc"]))
+
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertEqual(5, sink.counter(GETS, "LazyMap"))
+        self.assertEqual(3, sink.counter(MISSES))
+        self.assertEqual(2, sink.histogram(FACTORY_SECONDS).count)
+        self.assertEqual(1, sink.histogram(BULK_FACTORY_SECONDS, "LazyMap").count)
+
+        _ = lazy_map["xyz"]
+        self.assertEqual(3, sink.counter(MISSES))
+
+    def test_concurrent_lazy_map(self):
+        with profile() as sink:
+            lazy_map = ConcurrentLazyMap(Function.of(len))
+            _ = lazy_map["abc"]
+            _ = lazy_map["abc"]
+
+        self.assertEqual(2, sink.counter(GETS, "ConcurrentLazyMap"))
+        self.assertEqual(1, sink.counter(MISSES, "ConcurrentLazyMap"))
+
+    def test_predicated_map(self):
+        is_positive = Predicate.of(lambda value: value > 0)
+        predicated_map = PredicatedMap(is_positive, is_positive)
+        composite_map = CompositePredicatedMap(BiPredicate.of(lambda key, value: key == value))
+        with profile() as sink:
+            predicated_map[1] = 1
+            self.assertRaises(ValueError, predicated_map.__setitem__, 1, -1)
+            self.assertRaises(ValueError, predicated_map.extend, [(2, 2), (-1, 1), (-2, 1)])
+            predicated_map.extend([(2, 2), (3, 3)])
+            composite_map[1] = 1
+            self.assertRaises(ValueError, composite_map.__setitem__, 1, 2)
+            composite_map.extend([(2, 2)])
+
+        self.assertEqual(3, sink.counter(SETS, "PredicatedMap"))
+        self.assertEqual(11, sink.counter(PREDICATE_EVALUATIONS, "PredicatedMap"))
+        self.assertEqual(3, sink.counter(REJECTIONS, "PredicatedMap"))
+        self.assertEqual(2, sink.counter(SETS, "CompositePredicatedMap"))
+        self.assertEqual(3, sink.counter(PREDICATE_EVALUATIONS, "CompositePredicatedMap"))
+        self.assertEqual(1, sink.counter(REJECTIONS, "CompositePredicatedMap"))
+
+    def test_instrument(self):
+        sink = InMemorySink()
+        iterable_map = IterableMap({"a": 1})
+        other_map = IterableMap({"a": 1})
+        instrumentation.instrument(iterable_map, sink, "mine")
+        list(iterable_map)
+        list(other_map)
+        self.assertEqual({(ITERATIONS, "mine"): 1}, sink.counters())
+
+        global_sink = InMemorySink()
+        instrumentation.enable(global_sink)
+        list(iterable_map)
+        list(other_map)
+        self.assertEqual(2, sink.counter(ITERATIONS))
+        self.assertEqual(1, global_sink.counter(ITERATIONS, "IterableMap"))
+
+        instrumentation.uninstrument(iterable_map)
+        list(iterable_map)
+        self.assertEqual(2, sink.counter(ITERATIONS))
+        self.assertEqual(2, global_sink.counter(ITERATIONS))
+
+        with profile() as profile_sink:
+            list(other_map)
+        self.assertEqual(1, profile_sink.counter(ITERATIONS))
+        self.assertTrue(instrumentation.is_enabled())
+
+        global_sink.reset()
+        self.assertEqual(0, global_sink.counter(ITERATIONS))
+
+    def test_maps(self):
+        maps = [
+            IterableMap(),
+            OrderedMap(),
+            SortedMap(),
+            IndexedMap(),
+            ConcurrentMap(),
+            LRUMap(10),
+            TTLMap(10, 60.0),
+            MultiValuedMap(),
+            DefaultedMap(0),
+            CompactMultiValuedMap(),
+            FixedSizeMap(10),
+        ]
+        for _map in maps:
+            with self.subTest(map=_map.__class__.__name__), profile() as sink:
+                _map["a"] = 1
+                _map["b"] = 2
+                _ = _map["a"]
+                _ = _map.get("c")
+                _map.extend([("c", 3), ("d", 4)])
+
+            name = _map.__class__.__name__
+            self.assertEqual(4, sink.counter(SETS, name))
+            self.assertEqual(2, sink.counter(GETS, name))
+            self.assertEqual(1, sink.counter(MISSES, name))
+
+    def test_put_all(self):
+        for _map in (MultiValuedMap(), CompactMultiValuedMap()):
+            with self.subTest(map=_map.__class__.__name__), profile() as sink:
+                _map.put_all("a", [1, 2])
+                _map.put_all("a", (value for value in (2, 3)))
+                _map.extend([("b", 1)])
+
+            self.assertEqual(5, sink.counter(SETS, _map.__class__.__name__))
+            self.assertEqual([1, 2, 3], list(_map["a"]))
+
+    def test_predicates(self):
+        equals = EqualsPredicate(1)
+        predicate = AllPredicate([NotPredicate(EqualsPredicate(0)), InPredicate([1, 2])])
+        memoized = MemoizedPredicate(equals)
+        compiled = compile_predicate(predicate)
+        with profile() as sink:
+            self.assertEqual([True, False, False], [equals.test(value) for value in (1, 2, 3)])
+            self.assertEqual([True, False, False], list(equals.test_many([1, 2, 3])))
+            self.assertEqual([False, True, False], list(predicate.test_many([0, 2, 3])))
+            self.assertTrue(memoized.test(1))
+            self.assertTrue(memoized.test(1))
+            self.assertFalse(compiled.test(3))
+
+        # 7 tests of `equals` and 3 of the EqualsPredicate of the NotPredicate
+        self.assertEqual(10, sink.counter(PREDICATE_EVALUATIONS, "EqualsPredicate"))
+        self.assertEqual(6, sink.counter(REJECTIONS, "EqualsPredicate"))
+        self.assertEqual(3, sink.counter(PREDICATE_EVALUATIONS, "AllPredicate"))
+        self.assertEqual(2, sink.counter(REJECTIONS, "AllPredicate"))
+        # 0 is rejected by the NotPredicate before the InPredicate is tested
+        self.assertEqual(2, sink.counter(PREDICATE_EVALUATIONS, "InPredicate"))
+        self.assertEqual(2, sink.counter(PREDICATE_EVALUATIONS, "MemoizedPredicate"))
+        self.assertEqual(1, sink.counter(REJECTIONS, "CompiledPredicate"))
+
+    def test_profile_threads(self):
+        barrier = threading.Barrier(2)
+        sinks = {}
+        errors = []
+
+        def _run(name, count):
+            try:
+                _map = IterableMap()
+                with profile() as sink:
+                    barrier.wait()
+                    for i in range(count):
+                        _map[i] = i
+                    barrier.wait()
+                sinks[name] = sink
+            except BaseException as exc:  # pylint: disable=W0718
+                errors.append(exc)
+
+        threads = [
+            threading.Thread(target=_run, args=(name, count))
+            for name, count in [("a", 10), ("b", 20)]
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(10, sinks["a"].counter(SETS))
+        self.assertEqual(20, sinks["b"].counter(SETS))
+        self.assertFalse(instrumentation.is_enabled())
+
+    def test_profile_context(self):
+        global_sink = InMemorySink()
+        instrumentation.enable(global_sink)
+        _map = IterableMap()
+        with profile() as outer:
+            _map["a"] = 1
+            with profile() as inner:
+                _map["b"] = 2
+            # Threads only record to the sink of the block when they run in a copy of its context
+            thread = threading.Thread(target=_map.__setitem__, args=("c", 3))
+            thread.start()
+            thread.join()
+            context = contextvars.copy_context()
+            thread = threading.Thread(target=context.run, args=(_map.__setitem__, "d", 4))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(2, outer.counter(SETS))
+        self.assertEqual(1, inner.counter(SETS))
+        self.assertEqual(1, global_sink.counter(SETS))
+        self.assertTrue(instrumentation.is_enabled())
+
+    def test_histogram(self):
+        histogram = Histogram((1.0, 2.0))
+        for seconds in (0.5, 1.0, 1.5, 3.0):
+            histogram.observe(seconds)
+        self.assertEqual([2, 1, 1], histogram.counts)
+        self.assertEqual([2, 3, 4], histogram.cumulative_counts())
+        self.assertEqual(1.5, histogram.mean())
+        self.assertEqual(0.0, Histogram().mean())
+
+    def test_logging_sink(self):
+        records = []
+        logger = logging.getLogger("test_instrumentation")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger.addHandler(handler)
+        try:
+            with profile(LoggingSink(logger)):
+                LazyMap(Function.of(len))["abc"] = 1
+                _ = LazyMap(Function.of(len))["abc"]
+            with profile(LoggingSink(logger, logging.NOTSET)):
+                _ = LazyMap(Function.of(len))["abc"]
+        finally:
+            logger.removeHandler(handler)
+
+        self.assertEqual(4, len(records))
+        self.assertEqual("LazyMap sets +1", records[0].getMessage())
+        self.assertEqual("LazyMap gets +1", records[1].getMessage())
+        self.assertTrue(records[3].getMessage().startswith("LazyMap factory_seconds "))
+
+    def test_prometheus_file_sink(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.prom")
+            sink = PrometheusFileSink(path, bounds=(1.0,))
+            with profile(sink):
+                lazy_map = LazyMap(Function.of(len))
+                instrumentation.instrument(lazy_map, sink, 'my "map"')
+                _ = lazy_map["abc"]
+
+            with open(path, encoding="utf-8") as file:
+                lines = file.read().splitlines()
+
+        self.assertIn("# TYPE pycommons_collections_gets_total counter", lines)
+        self.assertIn('pycommons_collections_gets_total{source="my \\"map\\""} 1', lines)
+        self.assertIn("# TYPE pycommons_collections_factory_seconds histogram", lines)
+        self.assertIn(
+            'pycommons_collections_factory_seconds_bucket{source="my \\"map\\"",le="+Inf"} 1',
+            lines,
+        )
+        self.assertIn('pycommons_collections_factory_seconds_count{source="my \\"map\\""} 1', lines)